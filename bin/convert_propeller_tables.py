@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""Convert the PER3 propeller performance files to a memory-mapped binary table."""
+
+from symbench_athens_client.propeller_tables import convert_propeller_tables
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="The PER3 propeller tables converter")
+    parser.add_argument(
+        "propellers_dir",
+        metavar="PROPELLERS_DIR",
+        help="The directory of the PER3_*.dat files",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="propellers.npy",
+        type=str,
+        help="The .npy file to save the tables to (the index is saved next to it)",
+    )
+    args = parser.parse_args()
+
+    print(convert_propeller_tables(args.propellers_dir, args.output))
@@ -0,0 +1,294 @@
+import os
+import re
+import threading
+import weakref
+import zipfile
+from pathlib import Path
+from shutil import rmtree
+
+from symbench_athens_client.utils import get_logger
+
+__all__ = ["ArtifactArchive"]
+
+SHARD_PATTERN = re.compile(r"artifacts-(\d+)\.zip$")
+INCOMPLETE_SUFFIX = ".incomplete"
+
+
+class _ShardWriter:
+    """The shard being written, with the runs added to it.
+
+    This is shared by an ArtifactArchive and its finalizer, which completes the shard
+    if the archive isn't closed. The runs are indexed, and their directories removed,
+    only once the shard is complete.
+    """
+
+    def __init__(self, archive_dir, index_file, compression):
+        self.archive_dir = archive_dir
+        self.index_file = index_file
+        self.compression = compression
+        self.lock = threading.RLock()
+        self.zip_file = None
+        self.shard = None
+        self.pending = []
+        self.run_dirs = []
+
+    def open(self, shard):
+        # A complete shard is never appended to, a crash would lose its central directory
+        self.zip_file = zipfile.ZipFile(
+            self.archive_dir / shard, mode="x", compression=self.compression
+        )
+        self.shard = shard
+
+    def close(self):
+        with self.lock:
+            if self.zip_file is None:
+                return
+
+            # Closing a zip file writes its central directory, only then the runs are indexed
+            self.zip_file.close()
+            self.zip_file = None
+            with (self.archive_dir / self.index_file).open("a") as index_file:
+                index_file.writelines(f"{guid} {self.shard}\n" for guid in self.pending)
+
+            for run_dir in self.run_dirs:
+                rmtree(run_dir, ignore_errors=True)
+            self.pending, self.run_dirs, self.shard = [], [], None
+
+
+class ArtifactArchive:
+    """Rolling zip archives for the artifacts of experiment runs, indexed by GUID.
+
+    Rather than a directory per run, the files of every run are appended to the current
+    zip shard (under a `<guid>/` prefix). The index file maps every GUID to its shard, so
+    the artifacts of a single run are read back without scanning the shards.
+
+    A shard is completed (its zip central directory written) every flush_every runs, once
+    it exceeds shard_size bytes, on `flush` and on `close` (or when the archive is garbage
+    collected or at the interpreter exit). The next runs go to a new shard. Only then the
+    runs are indexed and their directories removed, hence a crash leaves the directories
+    of the runs in the unfinished shard in place. Reading a run which isn't flushed yet
+    flushes the archive first. On opening an archive, the runs of the shards missing from
+    the index are indexed from the shards' contents.
+
+    Parameters
+    ----------
+    archive_dir: str, pathlib.Path
+        The directory of the shards and the index (created if missing)
+    shard_size: int, default=536870912
+        The size in bytes beyond which the shard is completed
+    flush_every: int, default=64
+        The maximum number of runs in a shard
+    compression: int, default=zipfile.ZIP_DEFLATED
+        The compression method of the shards (see zipfile)
+    """
+
+    INDEX_FILE = "index.txt"
+
+    def __init__(
+        self,
+        archive_dir,
+        shard_size=1 << 29,
+        flush_every=64,
+        compression=zipfile.ZIP_DEFLATED,
+    ):
+        self.archive_dir = Path(archive_dir).resolve()
+        self.shard_size = shard_size
+        self.flush_every = flush_every
+        self.compression = compression
+        self.logger = get_logger(self.__class__.__name__)
+        self._index = {}
+        self._readers = {}
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self._load_index()
+
+        self._writer = _ShardWriter(self.archive_dir, self.INDEX_FILE, compression)
+        self._lock = self._writer.lock
+        # The current shard is completed when this archive is garbage collected or at the exit
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    def add_run(self, guid, run_dir, remove=True):
+        """Add the files of a run to the archive.
+
+        Parameters
+        ----------
+        guid: str
+            The GUID of the run
+        run_dir: str, pathlib.Path
+            The artifacts directory of the run, its files are archived recursively
+        remove: bool, default=True
+            If true, remove run_dir once its shard is complete
+
+        Returns
+        -------
+        pathlib.Path
+            The shard the run is archived in
+        """
+        run_dir = Path(run_dir)
+        files = sorted(path for path in run_dir.rglob("*") if path.is_file())
+
+        with self._lock:
+            if guid in self._index:
+                raise ValueError(f"The run {guid} is already archived")
+
+            writer = self._get_writer()
+            for path in files:
+                writer.zip_file.write(
+                    path, arcname=f"{guid}/{path.relative_to(run_dir).as_posix()}"
+                )
+
+            self._index[guid] = writer.shard
+            writer.pending.append(guid)
+            if remove:
+                writer.run_dirs.append(run_dir)
+            shard = self.archive_dir / writer.shard
+
+            if (
+                writer.zip_file.fp.tell() >= self.shard_size
+                or len(writer.pending) >= self.flush_every
+            ):
+                writer.close()
+
+        return shard
+
+    def names(self, guid):
+        """The names of the archived files of a run"""
+        prefix = f"{guid}/"
+        with self._lock:
+            return [
+                info.filename[len(prefix) :]
+                for info in self._reader_for(guid).infolist()
+                if info.filename.startswith(prefix)
+            ]
+
+    def read(self, guid, name):
+        """Read an archived file of a run (e.g. FlightDyn_Path1.inp)"""
+        with self._lock:
+            return self._reader_for(guid).read(f"{guid}/{name}")
+
+    def get(self, guid):
+        """Get all the archived files of a run, as a dictionary from their names to their contents"""
+        with self._lock:
+            return {name: self.read(guid, name) for name in self.names(guid)}
+
+    def extract(self, guid, path):
+        """Extract the archived files of a run to path, returns the run's directory in path"""
+        with self._lock:
+            reader = self._reader_for(guid)
+            reader.extractall(
+                path, members=[f"{guid}/{name}" for name in self.names(guid)]
+            )
+        return Path(path) / guid
+
+    def shard_of(self, guid):
+        """The shard a run is archived in"""
+        try:
+            return self.archive_dir / self._index[guid]
+        except KeyError:
+            raise KeyError(f"The run {guid} is not archived in {self.archive_dir}")
+
+    def flush(self):
+        """Complete the current shard, index its runs and remove their directories"""
+        self._writer.close()
+
+    def close(self):
+        """Flush the archive and close the shards"""
+        with self._lock:
+            self._writer.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers = {}
+
+    def _get_writer(self):
+        if self._writer.zip_file is None:
+            self._writer.open(self._new_shard_name())
+        return self._writer
+
+    def _reader_for(self, guid):
+        with self._lock:
+            shard = self.shard_of(guid).name
+            if shard == self._writer.shard:
+                self.flush()
+
+            if shard not in self._readers:
+                self._readers[shard] = zipfile.ZipFile(self.archive_dir / shard)
+            return self._readers[shard]
+
+    def _new_shard_name(self):
+        # The numbers of the incomplete shards aren't reused either
+        names = (
+            (
+                name[: -len(INCOMPLETE_SUFFIX)]
+                if name.endswith(INCOMPLETE_SUFFIX)
+                else name
+            )
+            for name in os.listdir(self.archive_dir)
+        )
+        numbers = [
+            int(match.group(1)) for match in map(SHARD_PATTERN.match, names) if match
+        ]
+        return f"artifacts-{max(numbers, default=-1) + 1:05d}.zip"
+
+    def _load_index(self):
+        index_path = self.archive_dir / self.INDEX_FILE
+        last_shard = None
+        if index_path.exists():
+            with index_path.open() as index_file:
+                for line in index_file:
+                    # The last line is incomplete after a crash while indexing
+                    if line.endswith("\n"):
+                        guid, last_shard = line.split()
+                        self._index[guid] = last_shard
+
+        # The runs of a shard are indexed after it is complete, a crash in between (or
+        # while indexing, in the last indexed shard) leaves runs missing from the index
+        indexed_shards = set(self._index.values()) - {last_shard}
+        missing = {}
+        for shard in sorted(os.listdir(self.archive_dir)):
+            if not SHARD_PATTERN.match(shard) or shard in indexed_shards:
+                continue
+            try:
+                with zipfile.ZipFile(self.archive_dir / shard) as zip_file:
+                    names = zip_file.namelist()
+            except zipfile.BadZipFile:
+                # Kept aside for inspection, the directories of its runs weren't removed
+                self.logger.warning(f"The artifacts shard {shard} is incomplete")
+                os.replace(
+                    self.archive_dir / shard,
+                    self.archive_dir / f"{shard}{INCOMPLETE_SUFFIX}",
+                )
+                continue
+
+            for name in names:
+                guid = name.split("/", 1)[0]
+                if self._index.get(guid) != shard:
+                    missing[guid] = self._index[guid] = shard
+
+        if missing:
+            self.logger.info(f"Indexing {len(missing)} runs missing from {index_path}")
+            with index_path.open("a") as index_file:
+                if index_path.stat().st_size and not _ends_with_newline(index_path):
+                    index_file.write("\n")
+                index_file.writelines(
+                    f"{guid} {shard}\n" for guid, shard in missing.items()
+                )
+
+    def __contains__(self, guid):
+        return guid in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.archive_dir}, Runs: {len(self)}>"
+
+
+def _ends_with_newline(path):
+    with path.open("rb") as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b"\n"
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+__all__ = [
+    "file_hash",
+    "get_cache_dir",
+    "get_cache_file",
+    "read_cache_file",
+    "write_atomic",
+    "write_cache_file",
+]
+
+
+def get_cache_dir():
+    """Get the directory for the persistent caches (e.g. the mass properties formulae) of this package.
+
+    It is the SYMBENCH_ATHENS_CLIENT_CACHE_DIR environment variable if set, or
+    ~/.cache/symbench_athens_client otherwise. Set the variable to an empty string to
+    disable the persistent caches.
+
+    Returns
+    -------
+    pathlib.Path or None
+        The cache directory, None if disabled
+    """
+    cache_dir = os.environ.get(
+        "SYMBENCH_ATHENS_CLIENT_CACHE_DIR",
+        str(Path.home() / ".cache" / "symbench_athens_client"),
+    )
+    return Path(cache_dir).resolve() if cache_dir else None
+
+
+def get_cache_file(*parts):
+    """Get the path of a file in the cache directory (None if the caches are disabled)"""
+    cache_dir = get_cache_dir()
+    return cache_dir.joinpath(*parts) if cache_dir else None
+
+
+def read_cache_file(cache_file):
+    """Read a cache file, None if it is missing (or unreadable) or cache_file is None"""
+    if cache_file is None:
+        return None
+    try:
+        return cache_file.read_bytes()
+    except OSError:
+        return None
+
+
+def write_cache_file(cache_file, contents):
+    """Write the bytes of a cache file, if cache_file isn't None (errors are ignored)"""
+    if cache_file is None:
+        return
+    # A read-only or full cache directory should never fail the caller
+    try:
+        os.makedirs(cache_file.parent, exist_ok=True)
+        write_atomic(cache_file, contents)
+    except OSError:
+        pass
+
+
+def write_atomic(path, contents):
+    """Write a file through a temporary file, readers in other processes never see it partially written.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        The path of the file (replaced if it exists)
+    contents: bytes or callable
+        The contents of the file, or a function writing them to a binary file object
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open("wb") as tmp_file:
+            if callable(contents):
+                contents(tmp_file)
+            else:
+                tmp_file.write(contents)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def file_hash(path):
+    """The sha256 hex digest of the contents of a file, read in chunks"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as binary_file:
+        for chunk in iter(lambda: binary_file.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
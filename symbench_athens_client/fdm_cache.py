@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from symbench_athens_client.cache import file_hash, write_atomic
+from symbench_athens_client.models.fd_metrics import (
+    FDMFlightMetric,
+    FDMFlightPathMetric,
+    FDMFlightPathRecord,
+    FDMFlightRecord,
+    FDMInputMetric,
+    FDMInputRecord,
+)
+from symbench_athens_client.utils import get_logger
+
+__all__ = ["FDMResultsCache"]
+
+PROP_FNAME_PATTERN = re.compile(r"(%prop_fname\s*=\s*)'([^']*)'")
+
+
+class FDMResultsCache:
+    """A persistent, content addressed cache for the results of FDM runs.
+
+    The key of an FDM run is the hash of its input file, where the paths of the
+    propeller files are replaced by the hash of their contents, along with the hash
+    of the FDM executable. Hence, the same design evaluated from a different directory
+    hits the cache, while an updated propeller table or FDM build misses it.
+
+    Every entry stores the parsed metrics along with the FDM output and metrics.out
+    files, which are restored on a hit so that the callers can keep their artifacts.
+
+    Parameters
+    ----------
+    cache_dir: str, pathlib.Path
+        The directory to store the cache entries in
+    max_size: int, default=1073741824
+        The maximum size of the cache in bytes, the least recently used entries are
+        evicted beyond it
+
+    Attributes
+    ----------
+    hits: int
+        The number of lookups found in the cache (in this process)
+    misses: int
+        The number of lookups missing from the cache (in this process)
+
+    Notes
+    -----
+    Many processes can share a cache directory, but each of them keeps its own
+    recency order (initialized from the file modification times) and enforces the size
+    limit with it.
+    """
+
+    def __init__(self, cache_dir, max_size=1 << 30):
+        self.cache_dir = Path(cache_dir).resolve()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._file_hashes = {}
+        self._entries = OrderedDict()
+        self._size = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_entries()
+
+    @property
+    def size(self):
+        """The total size of the cache entries in bytes"""
+        return self._size
+
+    def key_for(self, input_file, fdm_path, run_dir=None):
+        """Get the cache key for running fdm_path on input_file.
+
+        Parameters
+        ----------
+        input_file: str, pathlib.Path
+            The input file for the flight dynamics software
+        fdm_path: str, pathlib.Path
+            The FDM executable (or its name, if its in your PATH)
+        run_dir: str, pathlib.Path, default=None
+            The working directory of the FDM process, which the propeller paths
+            are relative to. If None, the current working directory is used
+
+        Returns
+        -------
+        str
+            The hex digest identifying this run
+        """
+        with open(input_file) as fd_input_file:
+            return self.key_for_input(fd_input_file.read(), fdm_path, run_dir=run_dir)
+
+    def key_for_input(self, fd_input, fdm_path, run_dir=None):
+        """Get the cache key for running fdm_path on the contents of an input file.
+
+        Parameters
+        ----------
+        fd_input: str
+            The contents of the input file for the flight dynamics software
+        fdm_path: str, pathlib.Path
+            The FDM executable (or its name, if its in your PATH)
+        run_dir: str, pathlib.Path, default=None
+            The working directory of the FDM process, which the propeller paths
+            are relative to. If None, the current working directory is used
+
+        Returns
+        -------
+        str
+            The hex digest identifying this run
+        """
+        base_dir = Path(run_dir or os.getcwd())
+
+        def _prop_file_hash(match):
+            prop_file_hash = self._hash_file(base_dir / match.group(2))
+            return f"{match.group(1)}'{prop_file_hash}'"
+
+        fd_input = PROP_FNAME_PATTERN.sub(_prop_file_hash, fd_input)
+
+        fdm_executable = shutil.which(str(fdm_path)) or str(fdm_path)
+        key_hash = hashlib.sha256(fd_input.encode("utf-8"))
+        key_hash.update(self._hash_file(Path(fdm_executable)).encode("utf-8"))
+
+        return key_hash.hexdigest()
+
+    def get(self, key, validate=True):
+        """Get the cached entry for key, None if missing.
+
+        Parameters
+        ----------
+        key: str
+            The key from `key_for`
+        validate: bool, default=True
+            If False, the metrics are the (unvalidated) records instead of the models
+
+        Returns
+        -------
+        tuple or None
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric, output, metrics) tuple,
+            where output and metrics are the contents of the FDM output and metrics.out files
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with entry_path.open("r") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+                self._forget(key)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key not in self._entries:
+                self._entries[key] = entry_path.stat().st_size
+                self._size += self._entries[key]
+            self._entries.move_to_end(key)
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        if validate:
+            parsers = (
+                FDMInputMetric.parse_obj,
+                FDMFlightMetric.parse_obj,
+                FDMFlightPathMetric.parse_obj,
+            )
+        else:
+            parsers = (
+                FDMInputRecord.from_values,
+                FDMFlightRecord.from_values,
+                FDMFlightPathRecord.from_values,
+            )
+
+        return (
+            parsers[0](entry["input_metrics"]),
+            parsers[1](entry["flight_metrics"]),
+            parsers[2](entry["path_metrics"]),
+            entry["output"],
+            entry["metrics"],
+        )
+
+    def put(self, key, input_metrics, flight_metrics, path_metrics, output, metrics):
+        """Store the results of an FDM run under key.
+
+        Parameters
+        ----------
+        key: str
+            The key from `key_for`
+        input_metrics: FDMInputMetric
+            The input metrics for the run
+        flight_metrics: FDMFlightMetric
+            The flight metrics for the run
+        path_metrics: FDMFlightPathMetric
+            The flight path metrics for the run
+        output: str
+            The contents of the FDM output file
+        metrics: str
+            The contents of the metrics.out file
+        """
+        entry = {
+            "input_metrics": input_metrics.dict(by_alias=True),
+            "flight_metrics": flight_metrics.dict(by_alias=True),
+            "path_metrics": path_metrics.dict(by_alias=True),
+            "output": output,
+            "metrics": metrics,
+        }
+        entry_path = self._entry_path(key)
+        os.makedirs(entry_path.parent, exist_ok=True)
+
+        write_atomic(entry_path, json.dumps(entry).encode("utf-8"))
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = entry_path.stat().st_size
+            self._size += self._entries[key]
+            self._evict()
+
+    def clear(self):
+        """Remove all the entries in the cache"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_entries(self):
+        entries = []
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            stat = entry_path.stat()
+            entries.append((stat.st_mtime, entry_path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+
+        self._evict()
+
+    def _evict(self):
+        while self._size > self.max_size and self._entries:
+            key = next(iter(self._entries))
+            self.logger.debug(f"Evicting {key} from the FDM results cache")
+            self._remove(key)
+
+    def _remove(self, key):
+        self._forget(key)
+        try:
+            os.unlink(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, key):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _hash_file(self, path):
+        # Hashing a 100KB propeller table for every run adds up; hash once per file version
+        try:
+            stat = path.stat()
+        except OSError:
+            return f"missing:{path.name}"
+
+        file_id = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        if file_id not in self._file_hashes:
+            self._file_hashes[file_id] = file_hash(path)
+
+        return self._file_hashes[file_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} {self.cache_dir}, Entries: {len(self)}, "
+            f"Hits: {self.hits}, Misses: {self.misses}>"
+        )
@@ -1,35 +1,126 @@
+import asyncio
 import math
 import os
 import subprocess
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from csv import DictWriter
 from glob import glob
 from pathlib import Path
-from shutil import move
+from shutil import move, rmtree
 from uuid import uuid4
 
 from symbench_athens_client.exceptions import FDMFailedException
+from symbench_athens_client.fdm_cache import PROP_FNAME_PATTERN
 from symbench_athens_client.models.designs import QuadCopter
 from symbench_athens_client.models.fd_metrics import (
-    FDMFlightMetric,
     FDMFlightPathMetric,
     FDMInputMetric,
+    parse_fd_metrics,
 )
-from symbench_athens_client.utils import extract_from_zip, get_logger
+from symbench_athens_client.utils import (
+    extract_from_zip,
+    get_logger,
+    relative_path,
+)
+
+
+class _FDMExecutorBase:
+    """The parts of running an FDM process shared by the executors"""
 
+    def _resolve_fdm_path(self):
+        # A relative executable path would break once the cwd of the process changes
+        fdm_path = str(self.fdm_path)
+        if os.sep in fdm_path or (os.altsep and os.altsep in fdm_path):
+            fdm_path = str(Path(fdm_path).resolve())
+        return fdm_path
+
+    def _log_run(self, fdm_path, run_dir):
+        self.logger.info(
+            f"Opening the FDM execution process {fdm_path} in {run_dir or os.getcwd()}, "
+            f"PID: {os.getpid()}"
+        )
 
-class FDMExecutor:
-    def __init__(self, fdm_path=None):
+    def _from_cache(self, fd_input, fdm_path, run_dir):
+        """Get the cache key and the cached (results, output) of a run, if any"""
+        if self.cache is None:
+            return None, None
+
+        cache_key = self.cache.key_for_input(fd_input, fdm_path, run_dir=run_dir)
+        cached = self.cache.get(cache_key, validate=self.validate)
+        if cached is None:
+            return cache_key, None
+
+        self.logger.info(f"Using the cached FDM results for {cache_key}")
+        input_metrics, flight_metrics, path_metrics, output, metrics = cached
+        (Path(run_dir or ".") / "metrics.out").write_text(metrics)
+        return cache_key, (
+            (input_metrics, flight_metrics, path_metrics),
+            output.encode("utf-8"),
+        )
+
+    def _collect_results(
+        self, fd_input, run_dir, returncode, stdout, stderr, cache_key=None
+    ):
+        """Parse the metrics of a finished run (and cache them)"""
+        if returncode != 0:
+            raise FDMFailedException(
+                f"The FDM executable failed. The stderr is:\n"
+                f"{stderr.decode('utf-8', errors='replace')}"
+            )
+
+        metrics_file = Path(run_dir or ".") / "metrics.out"
+        results = (
+            FDMInputMetric.from_fd_input_text(fd_input, validate=self.validate),
+            *parse_fd_metrics(metrics_file, validate=self.validate),
+        )
+
+        if cache_key is not None:
+            self.cache.put(
+                cache_key,
+                *results,
+                stdout.decode("utf-8", errors="replace"),
+                metrics_file.read_text(),
+            )
+
+        return results, stdout
+
+
+class FDMExecutor(_FDMExecutorBase):
+    def __init__(
+        self, fdm_path=None, max_workers=None, timeout=300, cache=None, validate=True
+    ):
         """The executor for fdm process.
 
         Parameters
         ----------
         fdm_path: str, default=None
             The full path of the new_fdm.exe or new_fdm compiled on a linux system (can be none if its already in your path)
+        max_workers: int, default=None
+            The maximum number of FDM processes run at once by `submit` and `map` (If None, the number of CPUs is used)
+        timeout: float, default=300
+            The number of seconds to wait for a single FDM process to finish
+        cache: symbench_athens_client.fdm_cache.FDMResultsCache, default=None
+            If provided, the results of identical runs are looked up in this cache instead of running the FDM
+        validate: bool, default=True
+            If False, the metrics of a run are the lightweight, unvalidated records (FDMInputRecord,
+            FDMFlightRecord and FDMFlightPathRecord) instead of the pydantic models
         """
         self.fdm_path = fdm_path or "new_fdm"
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = cache
+        self.validate = validate
         self.logger = get_logger(self.__class__.__name__)
+        self._pool = None
+        self._io_pool = None
+        self._pending_saves = []
+        self._lock = threading.Lock()
 
-    def execute(self, input_file, output_file):
+    def execute(self, input_file, output_file, run_dir=None):
         """Execute the FDM process.
 
         Parameters
@@ -38,27 +129,552 @@ class FDMExecutor:
             The input file path for the flight dynamics software
         output_file: str
             The output file path for the flight dynamics software
+        run_dir: str, pathlib.Path, default=None
+            The working directory for the FDM process, metrics.out is read from here.
+            If None, the current working directory is used
         """
-        fdm_cmd = f"{self.fdm_path} < {input_file} > {output_file}"
-        self.logger.info(
-            f"Opening the FDM execution process as {fdm_cmd}, PID: {os.getpid()}"
+        with open(input_file) as fd_input_file:
+            fd_input = fd_input_file.read()
+
+        results, output = self._run(fd_input, run_dir)
+        Path(output_file).write_bytes(output)
+
+        return results
+
+    def execute_input(self, fd_input, run_dir=None, input_file=None, output_file=None):
+        """Execute the FDM process on the contents of an input file, piped to its stdin.
+
+        The input and the output of the FDM are never written to disk, unless input_file or
+        output_file are provided, in which case they are saved in the background (see `flush`).
+
+        Parameters
+        ----------
+        fd_input: str
+            The contents of the input file for the flight dynamics software (e.g. from
+            symbench_athens_client.fdm_input.render_fd_input)
+        run_dir: str, pathlib.Path, default=None
+            The working directory for the FDM process, metrics.out is read from here.
+            If None, the current working directory is used
+        input_file: str, pathlib.Path, default=None
+            If provided, the path to save the input file to
+        output_file: str, pathlib.Path, default=None
+            If provided, the path to save the output of the FDM to
+
+        Returns
+        -------
+        tuple
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triple
+        """
+        results, output = self._run(fd_input, run_dir)
+
+        if input_file is not None:
+            self._save(input_file, fd_input.encode("utf-8"))
+        if output_file is not None:
+            self._save(output_file, output)
+
+        return results
+
+    def flush(self, directory=None):
+        """Wait for the files of `execute_input` to be saved, raising the first error if any
+
+        Parameters
+        ----------
+        directory: str, pathlib.Path, default=None
+            If provided, only wait for the files in this directory (e.g. those of a single run,
+            while other runs share this executor)
+        """
+        directory = Path(directory).resolve() if directory is not None else None
+        with self._lock:
+            pending, self._pending_saves = self._pending_saves, []
+            if directory is not None:
+                self._pending_saves = [
+                    (path, future)
+                    for path, future in pending
+                    if directory not in path.parents
+                ]
+                pending = [
+                    (path, future)
+                    for path, future in pending
+                    if directory in path.parents
+                ]
+
+        for _, future in pending:
+            future.result()
+
+    def _run(self, fd_input, run_dir):
+        fdm_path = self.fdm_path if run_dir is None else self._resolve_fdm_path()
+        cache_key, cached = self._from_cache(fd_input, fdm_path, run_dir)
+        if cached is not None:
+            return cached
+
+        self._log_run(fdm_path, run_dir)
+        try:
+            fdm_process = subprocess.run(
+                [fdm_path],
+                input=fd_input.encode("utf-8"),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=run_dir,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise FDMFailedException("The FDM Process timed-out. Exiting.")
+        except OSError as e:
+            raise FDMFailedException(f"Couldn't run the FDM executable {fdm_path}: {e}")
+
+        return self._collect_results(
+            fd_input,
+            run_dir,
+            fdm_process.returncode,
+            fdm_process.stdout,
+            fdm_process.stderr,
+            cache_key,
         )
-        with subprocess.Popen(fdm_cmd, shell=True) as fdm_process:
-            try:
-                fdm_process.wait(300)
-                if fdm_process.returncode != 0:
-                    raise FDMFailedException(
-                        f"The FDM executable failed. The stderr is:\n{fdm_process.stderr}"
-                    )
-
-                return (
-                    FDMInputMetric.from_fd_input(input_file),
-                    FDMFlightMetric.from_fd_metrics("./metrics.out"),
-                    FDMFlightPathMetric.from_fd_metrics("./metrics.out"),
+
+    def _save(self, path, contents):
+        with self._lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="fdm-io"
                 )
+            path = Path(path).resolve()
+            self._pending_saves.append(
+                (path, self._io_pool.submit(path.write_bytes, contents))
+            )
+
+    def submit(self, input_file, output_file=None):
+        """Schedule an FDM run, up to `max_workers` runs execute at once.
+
+        Every run gets its own scratch directory, which is removed once the
+        metrics are parsed. Hence, the relative propellers data paths in the input
+        file are made absolute, resolved against the directory of the input file (or
+        the current working directory, if they only exist there).
+
+        Parameters
+        ----------
+        input_file: str, pathlib.Path
+            The input file path for the flight dynamics software
+        output_file: str, pathlib.Path, default=None
+            The output file path for the flight dynamics software (If None, the output is discarded)
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future for the (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triple
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="fdm"
+            )
+
+        # Resolve here, the worker thread might run after the caller changes directories
+        input_file = Path(input_file).resolve()
+        if output_file is not None:
+            output_file = Path(output_file).resolve()
+
+        return self._pool.submit(
+            self._execute_isolated, input_file, output_file, Path.cwd()
+        )
+
+    def map(self, input_files, output_files=None):
+        """Run the FDM process on many input files concurrently.
+
+        Parameters
+        ----------
+        input_files: iterable of str or pathlib.Path
+            The input file paths for the flight dynamics software
+        output_files: iterable of str or pathlib.Path, default=None
+            The output file paths, one per input file (If None, the outputs are discarded)
+
+        Returns
+        -------
+        generator
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triples, in the order of input_files
+        """
+        input_files = list(input_files)
+        if output_files is None:
+            output_files = [None] * len(input_files)
+
+        futures = [
+            self.submit(input_file, output_file)
+            for input_file, output_file in zip(input_files, output_files)
+        ]
+
+        return (future.result() for future in futures)
+
+    def shutdown(self, wait=True):
+        """Shutdown the pools used by `submit`, `map` and `execute_input`"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=wait)
+            self._io_pool = None
+
+    def _execute_isolated(self, input_file, output_file, cwd):
+        fd_input = absolute_propeller_paths(
+            input_file.read_text(), input_file.parent, cwd
+        )
+        with isolated_run_dir() as run_dir:
+            results, output = self._run(fd_input, run_dir)
+        if output_file is not None:
+            output_file.write_bytes(output)
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class AsyncFDMExecutor(_FDMExecutorBase):
+    def __init__(
+        self,
+        fdm_path=None,
+        max_concurrency=None,
+        timeout=300,
+        cache=None,
+        validate=True,
+    ):
+        """The asyncio executor for fdm processes.
+
+        Many runs can be awaited at once (e.g. with asyncio.gather), without a thread per run,
+        up to max_concurrency FDM processes execute at once and the rest wait for their turn.
+        Cancelling a run kills its FDM process.
+
+        Parameters
+        ----------
+        fdm_path: str, default=None
+            The full path of the new_fdm.exe or new_fdm compiled on a linux system (can be none if its already in your path)
+        max_concurrency: int, default=None
+            The maximum number of FDM processes run at once (If None, the number of CPUs is used)
+        timeout: float, default=300
+            The default number of seconds to wait for a single FDM process to finish
+        cache: symbench_athens_client.fdm_cache.FDMResultsCache, default=None
+            If provided, the results of identical runs are looked up in this cache instead of running the FDM
+        validate: bool, default=True
+            If False, the metrics of a run are the lightweight, unvalidated records (FDMInputRecord,
+            FDMFlightRecord and FDMFlightPathRecord) instead of the pydantic models
+        """
+        self.fdm_path = fdm_path or "new_fdm"
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = cache
+        self.validate = validate
+        self.logger = get_logger(self.__class__.__name__)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def execute(self, input_file, output_file=None, run_dir=None, timeout=None):
+        """Execute the FDM process on an input file.
+
+        Parameters
+        ----------
+        input_file: str, pathlib.Path
+            The input file path for the flight dynamics software
+        output_file: str, pathlib.Path, default=None
+            The output file path for the flight dynamics software (If None, the output is discarded)
+        run_dir: str, pathlib.Path, default=None
+            The working directory for the FDM process, metrics.out is read from here.
+            If None, the run gets its own scratch directory, which is removed once the metrics are parsed,
+            and the relative propellers data paths are resolved against the directory of the input file
+            (or the current working directory, if they only exist there)
+        timeout: float, default=None
+            The number of seconds to wait for the FDM process (If None, the executor's timeout is used)
+
+        Returns
+        -------
+        tuple
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triple
+        """
+        input_file = Path(input_file).resolve()
+        loop = asyncio.get_running_loop()
+        fd_input = await loop.run_in_executor(None, input_file.read_text)
+        if run_dir is None:
+            fd_input = absolute_propeller_paths(
+                fd_input, input_file.parent, os.getcwd()
+            )
+
+        return await self.execute_input(
+            fd_input, run_dir=run_dir, output_file=output_file, timeout=timeout
+        )
+
+    async def execute_input(
+        self, fd_input, run_dir=None, input_file=None, output_file=None, timeout=None
+    ):
+        """Execute the FDM process on the contents of an input file, piped to its stdin.
+
+        Parameters
+        ----------
+        fd_input: str
+            The contents of the input file for the flight dynamics software
+        run_dir: str, pathlib.Path, default=None
+            The working directory for the FDM process, metrics.out is read from here.
+            If None, the run gets its own scratch directory, which is removed once the metrics are parsed,
+            and the relative propellers data paths are resolved against the current working directory
+        input_file: str, pathlib.Path, default=None
+            If provided, the path to save the input file to
+        output_file: str, pathlib.Path, default=None
+            If provided, the path to save the output of the FDM to
+        timeout: float, default=None
+            The number of seconds to wait for the FDM process (If None, the executor's timeout is used)
+
+        Returns
+        -------
+        tuple
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triple
+        """
+        async with self._semaphore():
+            if run_dir is None:
+                fd_input = absolute_propeller_paths(fd_input, os.getcwd())
+                with isolated_run_dir() as run_dir:
+                    results, output = await self._run(fd_input, run_dir, timeout)
+            else:
+                results, output = await self._run(fd_input, run_dir, timeout)
+
+        loop = asyncio.get_running_loop()
+        if input_file is not None:
+            await loop.run_in_executor(
+                None, Path(input_file).write_bytes, fd_input.encode("utf-8")
+            )
+        if output_file is not None:
+            await loop.run_in_executor(None, Path(output_file).write_bytes, output)
+
+        return results
+
+    async def map(self, input_files, output_files=None):
+        """Run the FDM process on many input files concurrently.
+
+        Returns
+        -------
+        list
+            The (FDMInputMetric, FDMFlightMetric, FDMFlightPathMetric) triples, in the order of input_files
+        """
+        input_files = list(input_files)
+        if output_files is None:
+            output_files = [None] * len(input_files)
+
+        return await asyncio.gather(
+            *(
+                self.execute(input_file, output_file)
+                for input_file, output_file in zip(input_files, output_files)
+            )
+        )
+
+    async def _run(self, fd_input, run_dir, timeout):
+        fdm_path = self._resolve_fdm_path()
+        loop = asyncio.get_running_loop()
+        # Hashing the files of the cache key (and parsing the metrics) would block the loop
+        cache_key, cached = await loop.run_in_executor(
+            None, self._from_cache, fd_input, fdm_path, run_dir
+        )
+        if cached is not None:
+            return cached
+
+        self._log_run(fdm_path, run_dir)
+        try:
+            fdm_process = await asyncio.create_subprocess_exec(
+                fdm_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=run_dir,
+            )
+        except OSError as e:
+            raise FDMFailedException(f"Couldn't run the FDM executable {fdm_path}: {e}")
 
-            except subprocess.TimeoutExpired:
-                raise FDMFailedException("The FDM Process timed-out. Exiting.")
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                fdm_process.communicate(fd_input.encode("utf-8")),
+                timeout=timeout or self.timeout,
+            )
+        except asyncio.TimeoutError:
+            raise FDMFailedException("The FDM Process timed-out. Exiting.")
+        finally:
+            # On a timeout or a cancellation, don't leave the process behind
+            if fdm_process.returncode is None:
+                fdm_process.kill()
+                await fdm_process.wait()
+
+        return await loop.run_in_executor(
+            None,
+            self._collect_results,
+            fd_input,
+            run_dir,
+            fdm_process.returncode,
+            stdout,
+            stderr,
+            cache_key,
+        )
+
+    def _semaphore(self):
+        # asyncio primitives are bound to an event loop (before python 3.10)
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+
+def absolute_propeller_paths(fd_input, *base_dirs):
+    """Make the relative propellers data paths (prop_fname) of an input file absolute.
+
+    Parameters
+    ----------
+    fd_input: str
+        The contents of the input file for the flight dynamics software
+    base_dirs: str, pathlib.Path
+        The directories to resolve the relative paths against, a path is resolved
+        against the first directory it exists in (or the first directory, if none)
+
+    Returns
+    -------
+    str
+        The contents of the input file, with absolute propellers data paths
+    """
+
+    def _absolute_path(match):
+        prop_fname = Path(match.group(2))
+        if not prop_fname.is_absolute():
+            candidates = [Path(base_dir) / prop_fname for base_dir in base_dirs]
+            prop_fname = next(
+                (candidate for candidate in candidates if candidate.exists()),
+                candidates[0],
+            ).resolve()
+        return f"{match.group(1)}'{prop_fname}'"
+
+    return PROP_FNAME_PATTERN.sub(_absolute_path, fd_input)
+
+
+@contextmanager
+def isolated_run_dir(parent=None, prefix="fdm_run_"):
+    """Create a private working directory for an FDM process, removed on exit."""
+    run_dir = Path(tempfile.mkdtemp(prefix=prefix, dir=parent))
+    try:
+        yield run_dir
+    finally:
+        rmtree(run_dir, ignore_errors=True)
+
+
+def run_flight_paths(
+    run_path,
+    flight_paths=(1, 3, 4, 5),
+    run_dirs_parent=None,
+    concurrent=False,
+    early_exit=False,
+):
+    """Run the flight dynamics for every flight path and merge their metrics.
+
+    Parameters
+    ----------
+    run_path: callable
+        Called as run_path(flight_path, run_dir), returns the metrics dictionary for the path
+    flight_paths: iterable of int, default=(1, 3, 4, 5)
+        The flight paths to run
+    run_dirs_parent: str, pathlib.Path, default=None
+        If provided, every flight path runs in its own private directory under it.
+        Otherwise, run_dir is None, i.e. the current working directory is used
+    concurrent: bool, default=False
+        If true, run all the flight paths at once (requires run_dirs_parent)
+    early_exit: bool, default=False
+        If true, run the rise and hover path (4) first and skip the other paths if
+        its score is zero, since the total score is zero anyways in that case.
+        The metrics of the skipped paths are None and the SkippedPaths entry lists them.
+
+    Returns
+    -------
+    dict
+        The metrics of all flight paths, merged in the order of flight_paths
+    """
+    if concurrent and run_dirs_parent is None:
+        raise ValueError("Concurrent flight paths need private run directories")
+
+    def _run_path(flight_path):
+        if run_dirs_parent is None:
+            return run_path(flight_path, None)
+
+        with isolated_run_dir(
+            parent=run_dirs_parent, prefix=f"Path{flight_path}_"
+        ) as run_dir:
+            return run_path(flight_path, run_dir)
+
+    flight_paths = list(flight_paths)
+    all_path_metrics = {}
+    skipped_paths = []
+
+    if early_exit and 4 in flight_paths:
+        all_path_metrics[4] = _run_path(4)
+        if math.isclose(all_path_metrics[4]["Path_score_Path4"], 0.0):
+            skipped_paths = [
+                flight_path for flight_path in flight_paths if flight_path != 4
+            ]
+
+    remaining_paths = [
+        flight_path
+        for flight_path in flight_paths
+        if flight_path not in all_path_metrics and flight_path not in skipped_paths
+    ]
+
+    if concurrent and remaining_paths:
+        with ThreadPoolExecutor(max_workers=len(remaining_paths)) as pool:
+            all_path_metrics.update(
+                zip(remaining_paths, pool.map(_run_path, remaining_paths))
+            )
+    else:
+        for flight_path in remaining_paths:
+            all_path_metrics[flight_path] = _run_path(flight_path)
+
+    for flight_path in skipped_paths:
+        all_path_metrics[flight_path] = skipped_path_metrics(flight_path)
+
+    metrics = {}
+    for flight_path in flight_paths:
+        metrics.update(all_path_metrics[flight_path])
+
+    if early_exit:
+        metrics["SkippedPaths"] = ",".join(str(path) for path in skipped_paths)
+
+    return metrics
+
+
+def skipped_path_metrics(flight_path):
+    """The metrics of a flight path which wasn't simulated (all None)"""
+    metrics = dict.fromkeys(FDMInputMetric.path_csv_keys(flight_path))
+    metrics.update(dict.fromkeys(FDMFlightPathMetric.path_csv_keys(flight_path)))
+    return metrics
+
+
+def flight_path_speeds(
+    requested_vertical_speed, requested_lateral_speed, flight_paths=(1, 3, 4, 5)
+):
+    """Get the requested vertical and lateral speeds for every flight path.
+
+    Only the rise and hover path (4) uses the vertical speed, the others use the lateral speed.
+
+    Returns
+    -------
+    tuple of dict
+        The requested vertical speeds and the requested lateral speeds by flight path
+    """
+    vertical_speeds = {
+        flight_path: requested_vertical_speed if flight_path == 4 else 0
+        for flight_path in flight_paths
+    }
+    lateral_speeds = {
+        flight_path: 0 if flight_path == 4 else int(requested_lateral_speed)
+        for flight_path in flight_paths
+    }
+    return vertical_speeds, lateral_speeds
+
+
+def run_dirs_relative_path(path, run_dirs_parent=None):
+    """Get the relative path to path from the run directories of `run_flight_paths`.
+
+    The private run directories are all children of run_dirs_parent, so they share the
+    relative paths. If run_dirs_parent is None, the path is relative to the current working directory.
+    """
+    work_dir = Path(run_dirs_parent) / "run" if run_dirs_parent else os.getcwd()
+    return relative_path(work_dir, Path(path).resolve())
 
 
 def update_total_score(metrics):
@@ -81,13 +697,15 @@ def write_output_csv(output_dir, metrics):
     if output_csv.exists():
         should_write_header = False
 
+    # A list of metrics is written at once, in a single open/write
+    rows = [metrics] if isinstance(metrics, dict) else list(metrics)
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+
     with open(output_csv, "a") as csv_file:
-        csv_writer = DictWriter(
-            csv_file, fieldnames=list(metrics.keys()), lineterminator="\n"
-        )
+        csv_writer = DictWriter(csv_file, fieldnames=fieldnames, lineterminator="\n")
         if should_write_header:
             csv_writer.writeheader()
-        csv_writer.writerow(metrics)
+        csv_writer.writerows(rows)
 
 
 def cleanup_score_files():
@@ -106,6 +724,9 @@ def execute_fd_all_paths(
     propellers_data_location=f"../data/propellers",
     fdm_path=None,
     output_dir="results",
+    isolated=False,
+    concurrent_paths=False,
+    early_exit=False,
 ):
     """Execute flight dynamics on all paths for a design(only works for quadcopter).
 
@@ -125,6 +746,12 @@ def execute_fd_all_paths(
         The fdm executable path (If None, it is assumed that fdm is in your path)
     output_dir: str, patlib.Path, default="results"
         Where to save the output to
+    isolated: bool, default=False
+        If true, run every path in a private directory instead of the current working directory
+    concurrent_paths: bool, default=False
+        If true, run the four flight paths at once (implies isolated)
+    early_exit: bool, default=False
+        If true, run the rise and hover path first and skip the others if it scores zero
 
     Returns
     -------
@@ -135,6 +762,8 @@ def execute_fd_all_paths(
         design, QuadCopter
     ), "The function only works for quadcopter design"
 
+    isolated = isolated or concurrent_paths
+
     output_dir = Path(output_dir).resolve()
     if not output_dir.exists():
         os.makedirs(output_dir)
@@ -156,38 +785,44 @@ def execute_fd_all_paths(
 
     executor = FDMExecutor(fdm_path=fdm_path)
 
-    metrics = {"GUID": run_guid, "AnalysisError": None}
-    try:
-        for i in [1, 3, 4, 5]:
-            fd_input_path = f"FlightDyn_Path{i}.inp"
-            fd_output_path = f"FlightDynReport_Path{i}.out"
-
-            design.to_fd_input(
-                testbench_path_or_formulae=str(tb_data_location),
-                requested_vertical_speed=0 if i != 4 else requested_vertical_speed,
-                requested_lateral_speed=0 if i == 4 else int(requested_lateral_speed),
-                flight_path=i,
-                propellers_data_path=str(propellers_data_location),
-                filename=fd_input_path,
-            )
-
-            input_metrics, flight_metrics, path_metrics = executor.execute(
-                str(fd_input_path), str(fd_output_path)
-            )
-
-            # Input Metrics
-            metrics.update(input_metrics.to_csv_dict())
+    propellers_data_path = str(propellers_data_location)
+    if isolated:
+        propellers_data_path = (
+            run_dirs_relative_path(propellers_data_location, fd_files_base_path)
+            + os.sep
+        )
 
-            # Get the FlightPath metrics
-            metrics.update(flight_metrics.to_csv_dict())
-            metrics.update(path_metrics.to_csv_dict())
+    # The inputs of all the paths share the mass properties, estimate them once
+    vertical_speeds, lateral_speeds = flight_path_speeds(
+        requested_vertical_speed, requested_lateral_speed
+    )
+    fd_inputs = design.to_fd_inputs(
+        testbench_path_or_formulae=str(tb_data_location),
+        propellers_data_path=propellers_data_path,
+        requested_vertical_speed=vertical_speeds,
+        requested_lateral_speed=lateral_speeds,
+    )
 
-            # Move input and output files to necessary locations
-            move(fd_input_path, fd_files_base_path)
-            move(fd_output_path, fd_files_base_path)
+    def run_path(flight_path, run_dir):
+        return _execute_fd_path(
+            design,
+            executor,
+            flight_path,
+            fd_inputs[flight_path],
+            fd_files_base_path,
+            run_dir=run_dir,
+        )
 
-            # Remove metrics.out, score.out namemap.out
-            cleanup_score_files()
+    metrics = {"GUID": run_guid, "AnalysisError": None}
+    try:
+        metrics.update(
+            run_flight_paths(
+                run_path,
+                run_dirs_parent=fd_files_base_path if isolated else None,
+                concurrent=concurrent_paths,
+                early_exit=early_exit,
+            )
+        )
 
         # Update the total score
         update_total_score(metrics)
@@ -200,3 +835,41 @@ def execute_fd_all_paths(
     write_output_csv(output_dir=output_dir, metrics=metrics)
 
     return metrics
+
+
+def _execute_fd_path(
+    design,
+    executor,
+    flight_path,
+    fd_params,
+    fd_files_base_path,
+    run_dir=None,
+):
+    fd_input_path = f"FlightDyn_Path{flight_path}.inp"
+    fd_output_path = f"FlightDynReport_Path{flight_path}.out"
+    if run_dir is not None:
+        fd_input_path = str(Path(run_dir) / fd_input_path)
+        fd_output_path = str(Path(run_dir) / fd_output_path)
+
+    design.write_fd_input(fd_params, fd_input_path)
+
+    input_metrics, flight_metrics, path_metrics = executor.execute(
+        fd_input_path, fd_output_path, run_dir=run_dir
+    )
+
+    # Input Metrics
+    metrics = input_metrics.to_csv_dict()
+
+    # Get the FlightPath metrics
+    metrics.update(flight_metrics.to_csv_dict())
+    metrics.update(path_metrics.to_csv_dict())
+
+    # Move input and output files to necessary locations
+    move(fd_input_path, fd_files_base_path)
+    move(fd_output_path, fd_files_base_path)
+
+    # Remove metrics.out, score.out namemap.out (the private run directory is removed as whole)
+    if run_dir is None:
+        cleanup_score_files()
+
+    return metrics
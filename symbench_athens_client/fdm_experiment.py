@@ -1,20 +1,26 @@
 import json
 import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from shutil import move
 from uuid import uuid4
 
 from uav_analysis.mass_properties import quad_copter_batt_prop, quad_copter_fixed_bemp2
-from uav_analysis.testbench_data import TestbenchData
 
-from symbench_athens_client.exceptions import PropellerAssignmentError
+from symbench_athens_client.artifact_archive import ArtifactArchive
 from symbench_athens_client.fdm_executor import (
     FDMExecutor,
     cleanup_score_files,
+    flight_path_speeds,
+    run_dirs_relative_path,
+    run_flight_paths,
     update_total_score,
     write_output_csv,
 )
+from symbench_athens_client.fdm_input import render_fd_input
 from symbench_athens_client.models.components import (
     Batteries,
     Battery,
@@ -22,14 +28,22 @@ from symbench_athens_client.models.components import (
     Propellers,
 )
 from symbench_athens_client.models.designs import QuadCopter
+from symbench_athens_client.models.fd_metrics import metrics_csv_keys
+from symbench_athens_client.results_index import ResultsIndex
+from symbench_athens_client.results_store import (
+    RESULTS_FORMATS,
+    ColumnarResultsStore,
+    results_schema,
+)
 from symbench_athens_client.utils import (
     assign_propellers_quadcopter,
     estimate_mass_formulae,
     extract_from_zip,
     get_logger,
-    relative_path,
 )
 
+TESTBENCH_MAPS = {"componentMap.json", "connectionMap.json"}
+
 
 class FlightDynamicsExperiment:
     """The symbench athens client's experiment class.
@@ -59,6 +73,19 @@ class FlightDynamicsExperiment:
         The location of the fdm executable, if None, its assumed to be in PATH
     estimator: function, optional, default=None
         The estimator function from uav_analyisis library to use, If None, quadcopter_fixed_bemp2 is used.
+    cache: symbench_athens_client.fdm_cache.FDMResultsCache, optional, default=None
+        The cache to look up the FDM results in, before running the FDM
+    validate_metrics: bool, optional, default=True
+        If False, skip the validation of the metrics of every run (see `FDMExecutor`)
+    results_format: str, optional, default="csv"
+        The format of the session's results file, "csv" (output.csv) or, to buffer the
+        results and write them in row groups with a fixed schema, "parquet" (output.parquet)
+        or "arrow" (output.arrow). The latter two require pyarrow
+    results_index: str, pathlib.Path or symbench_athens_client.results_index.ResultsIndex, optional, default=None
+        If provided, the SQLite index (or its path) to add every run to, for queries across sessions
+    archive_artifacts: bool, optional, default=False
+        If true, pack the artifacts of every run into rolling zip shards in results/artifacts
+        and remove its directory (see symbench_athens_client.artifact_archive.ArtifactArchive)
 
     Attributes
     ----------
@@ -70,9 +97,11 @@ class FlightDynamicsExperiment:
     Notes
     -----
     Every run gets a guid (returned in the output dictionary). The results for each
-    run (the flight dynamics input and output files) are saved in results/artifacts.
+    run (the flight dynamics input and output files) are saved in results/artifacts
+    (in a directory per run, or in zip shards with archive_artifacts).
     The results/output.csv file is what you should look for if you ever want to revisit
-    the metrics.
+    the metrics. A Parquet or Arrow results file is complete once the session ends, with
+    `start_new_session` or `close` (or at the interpreter exit).
     """
 
     def __init__(
@@ -84,7 +113,15 @@ class FlightDynamicsExperiment:
         valid_requirements,
         fdm_path=None,
         estimator=None,
+        cache=None,
+        validate_metrics=True,
+        results_format="csv",
+        results_index=None,
+        archive_artifacts=False,
     ):
+        if results_format != "csv" and results_format not in RESULTS_FORMATS:
+            raise ValueError(f"Unknown results format {results_format}")
+
         self.testbenches, self.propellers_data = self._validate_files(
             testbenches, propellers_data
         )  # ToDo: More robust Validation here
@@ -93,7 +130,16 @@ class FlightDynamicsExperiment:
         self.valid_requirements = valid_requirements
         self.logger = get_logger(self.__class__.__name__)
         self.session_id = f"e-{datetime.now().isoformat()}".replace(":", "-")
-        self.executor = FDMExecutor(fdm_path=fdm_path)
+        self.results_format = results_format
+        self._results_store = None
+        if results_index is not None and not isinstance(results_index, ResultsIndex):
+            results_index = ResultsIndex(results_index)
+        self.results_index = results_index
+        self.archive_artifacts = archive_artifacts
+        self.artifact_archive = None
+        self.executor = FDMExecutor(
+            fdm_path=fdm_path, cache=cache, validate=validate_metrics
+        )
         self.results_dir = Path(
             f"results/{self.design.__class__.__name__}/{self.session_id}"
         ).resolve()
@@ -119,18 +165,18 @@ class FlightDynamicsExperiment:
         extract_from_zip(
             self.testbenches[0],
             self.results_dir,
-            {
-                "componentMap.json",
-                "connectionMap.json",
-            },
+            TESTBENCH_MAPS,
         )
 
         self._customize_components()
 
-    def _customize_components(self, out_dir=None):
+    def _customize_components(self, out_dir=None, design=None):
+        if design is None:
+            design = self.design
+
         with (self.results_dir / "componentMap.json").open("r") as components_file:
             components = json.load(components_file)
-            design_components = self.design.components(by_alias=True)
+            design_components = design.components(by_alias=True)
             for component in components:
                 if component["FROM_COMP"] in design_components:
                     component["LIB_COMPONENT"] = design_components[
@@ -143,10 +189,12 @@ class FlightDynamicsExperiment:
         with (out_dir / "componentMap.json").open("w") as components_file:
             json.dump(components, components_file)
 
-        self.design.swap_list = {}
+        design.swap_list = {}
 
     def start(self):
         self._create_results_dir()
+        if self.archive_artifacts:
+            self.artifact_archive = ArtifactArchive(self.results_dir / "artifacts")
 
     def run_for(
         self,
@@ -154,29 +202,242 @@ class FlightDynamicsExperiment:
         requirements=None,
         change_dir=False,
         write_to_output_csv=False,
+        isolated=False,
+        concurrent_paths=False,
+        early_exit=False,
     ):
-        """Run the flight dynamics for the given parameters and requirements"""
+        """Run the flight dynamics for the given parameters and requirements
+
+        Parameters
+        ----------
+        parameters: dict, default=None
+            The design variables to set before running the flight dynamics
+        requirements: dict, default=None
+            The requirements (requested speeds) for the flight paths
+        change_dir: bool, default=False
+            If true, change the working directory of this process to the run's artifacts directory
+        write_to_output_csv: bool, default=False
+            If true, append the metrics to the session's results file (output.csv, unless
+            another results_format is used)
+        isolated: bool, default=False
+            If true, every FDM invocation runs in a private directory (passed as cwd to the FDM process),
+            leaving the working directory of this process untouched. Safe to use concurrently.
+        concurrent_paths: bool, default=False
+            If true, run the four flight paths at once (implies isolated)
+        early_exit: bool, default=False
+            If true, run the rise and hover path (4) first. If it scores zero, the design
+            cannot hover and the other paths are skipped (recorded in SkippedPaths)
+
+        Returns
+        -------
+        dict
+            The metrics for this run
+        """
+        isolated = isolated or concurrent_paths
+        if change_dir and isolated:
+            raise ValueError("change_dir and isolated runs are mutually exclusive")
 
         parameters = self._validate_dict(parameters, "parameters")
         requirements = self._validate_dict(requirements, "requirements")
 
+        self._prepare_design(self.design, parameters)
+
+        run_guid = str(uuid4())
+        try:
+            metrics = self._evaluate(
+                self.design,
+                requirements,
+                run_guid,
+                change_dir=change_dir,
+                isolated=isolated,
+                concurrent_paths=concurrent_paths,
+                early_exit=early_exit,
+            )
+        except Exception as e:
+            # The failed runs are archived and indexed too, like in run_for_many
+            self._record_run(
+                self.design,
+                requirements,
+                {"GUID": run_guid, "AnalysisError": True},
+                error=e,
+            )
+            raise e
+
+        self._record_run(self.design, requirements, metrics)
+
+        if write_to_output_csv:
+            self.write_results(metrics)
+
+        return metrics
+
+    def run_for_many(
+        self,
+        parameters_list,
+        requirements=None,
+        workers=None,
+        callback=None,
+        write_to_output_csv=True,
+        concurrent_paths=False,
+        early_exit=False,
+    ):
+        """Run the flight dynamics for a batch of parameters concurrently.
+
+        Every parameters dictionary is applied to its own copy of the design, leaving
+        `self.design` untouched, and all the FDM invocations are isolated (see `run_for`).
+        This is a generator, the batch runs while it is iterated upon.
+
+        Parameters
+        ----------
+        parameters_list: iterable of dict
+            The design variables for every run
+        requirements: dict, default=None
+            The requirements (requested speeds) for all the runs
+        workers: int, default=None
+            The number of designs to evaluate at once (If None, the executor's max_workers)
+        callback: callable, default=None
+            If provided, called with the metrics of every run as soon as it completes
+        write_to_output_csv: bool, default=True
+            If true, write the metrics of all the completed runs to the session's results file at once,
+            when the iteration ends (with the runs in flight, if it is stopped early)
+        concurrent_paths: bool, default=False
+            If true, also run the four flight paths of every design at once
+        early_exit: bool, default=False
+            If true, skip the other flight paths for designs which fail to hover (see `run_for`)
+
+        Yields
+        ------
+        dict
+            The metrics of every run, in the order of completion. For the runs which
+            failed, only GUID and AnalysisError (True) are available
+        """
+        parameters_list = [
+            self._validate_dict(parameters, "parameters")
+            for parameters in parameters_list
+        ]
+        requirements = self._validate_dict(requirements, "requirements")
+
+        all_metrics, futures, collected = [], [], set()
+        pool = ThreadPoolExecutor(
+            max_workers=workers or self.executor.max_workers,
+            thread_name_prefix="run_for_many",
+        )
+        try:
+            futures = [
+                pool.submit(
+                    self._evaluate_copy,
+                    parameters,
+                    requirements,
+                    concurrent_paths,
+                    early_exit,
+                )
+                for parameters in parameters_list
+            ]
+
+            for future in as_completed(futures):
+                metrics = future.result()
+                all_metrics.append(metrics)
+                collected.add(future)
+                if callback is not None:
+                    callback(metrics)
+                yield metrics
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+            # The runs in flight when the iteration stops are archived and indexed,
+            # they are written to the results as well
+            all_metrics.extend(
+                future.result()
+                for future in futures
+                if future not in collected
+                and not future.cancelled()
+                and future.exception() is None
+            )
+            if write_to_output_csv and all_metrics:
+                self.write_results(all_metrics)
+
+    def _evaluate_copy(self, parameters, requirements, concurrent_paths, early_exit):
+        design = self.design.copy(deep=True)
+        self._prepare_design(design, parameters)
+        run_guid = str(uuid4())
+
+        try:
+            metrics = self._evaluate(
+                design,
+                requirements,
+                run_guid,
+                isolated=True,
+                concurrent_paths=concurrent_paths,
+                early_exit=early_exit,
+            )
+        except Exception as e:
+            self.logger.error(f"The run {run_guid} failed: {e}")
+            metrics = {"GUID": run_guid, "AnalysisError": True}
+            self._record_run(design, requirements, metrics, error=e)
+            return metrics
+
+        self._record_run(design, requirements, metrics)
+        return metrics
+
+    def _record_run(self, design, requirements, metrics, error=None):
+        """Archive the artifacts of a run and add it to the results index, if enabled"""
+        artifacts = self.results_dir / "artifacts" / metrics["GUID"]
+        if self.artifact_archive is not None and artifacts.exists():
+            artifacts = self.artifact_archive.add_run(metrics["GUID"], artifacts)
+
+        self._index_run(design, requirements, metrics, artifacts, error=error)
+
+    def _index_run(self, design, requirements, metrics, artifacts, error=None):
+        """Add a run to the results index, if enabled (with the error of a failed run)"""
+        if self.results_index is None:
+            return
+
+        if error is not None:
+            metrics = {**metrics, "Error": f"{error.__class__.__name__}: {error}"}
+
+        self.results_index.add_run(
+            metrics["GUID"],
+            design=design.__class__.__name__,
+            session_id=self.session_id,
+            parameters=design.dict(include=design.__design_vars__),
+            requirements=requirements,
+            metrics=metrics,
+            components=design.components(by_alias=True),
+            artifacts=artifacts,
+        )
+
+    def _prepare_design(self, design, parameters):
+        """Set up the design of a run (in run_for and run_for_many) with its parameters"""
+        self._set_parameters(design, parameters)
+
+    def _set_parameters(self, design, parameters):
         for key, value in parameters.items():
             if key in self.valid_parameters:
-                setattr(self.design, key, value)
+                setattr(design, key, value)
 
+    def _evaluate(
+        self,
+        design,
+        requirements,
+        run_guid,
+        change_dir=False,
+        isolated=False,
+        concurrent_paths=False,
+        early_exit=False,
+    ):
+        """Run the flight dynamics for all the flight paths of a design"""
         self.logger.info(
-            f"About to execute FDM on {self.design.__class__.__name__}, "
-            f"parameters: {self.design.parameters()}, "
+            f"About to execute FDM on {design.__class__.__name__}, "
+            f"parameters: {design.parameters()}, "
             f"requirements: {requirements}"
         )
 
-        run_guid = str(uuid4())
-
         fd_files_base_path = self.results_dir / "artifacts" / run_guid
         os.makedirs(fd_files_base_path, exist_ok=True)
 
-        if self.design.swap_list != dict():
-            self._customize_components(fd_files_base_path)
+        if design.swap_list != dict():
+            self._customize_components(fd_files_base_path, design=design)
 
         metrics = {"GUID": run_guid, "AnalysisError": None}
         try:
@@ -184,50 +445,37 @@ class FlightDynamicsExperiment:
             if change_dir:
                 os.chdir(fd_files_base_path)
 
-            for i in [1, 3, 4, 5]:
-                fd_input_path = f"FlightDyn_Path{i}.inp"
-                fd_output_path = f"FlightDynReport_Path{i}.out"
-
-                self.design.to_fd_input(
-                    testbench_path_or_formulae=self.formulae,
-                    requested_vertical_speed=0
-                    if i != 4
-                    else requirements.get("requested_vertical_speed", -2),
-                    requested_lateral_speed=0
-                    if i == 4
-                    else int(requirements.get("requested_lateral_speed", 10)),
-                    flight_path=i,
-                    propellers_data_path=relative_path(
-                        os.getcwd(), self.propellers_data
-                    )
-                    + os.sep,
-                    filename=fd_input_path,
-                )
+            # The inputs of all the paths share the mass properties, estimate them once
+            vertical_speeds, lateral_speeds = flight_path_speeds(
+                requirements.get("requested_vertical_speed", -2),
+                requirements.get("requested_lateral_speed", 10),
+            )
+            propellers_data_path = run_dirs_relative_path(
+                self.propellers_data, fd_files_base_path if isolated else None
+            )
+            fd_inputs = design.to_fd_inputs(
+                testbench_path_or_formulae=self.formulae,
+                propellers_data_path=propellers_data_path + os.sep,
+                requested_vertical_speed=vertical_speeds,
+                requested_lateral_speed=lateral_speeds,
+            )
 
-                input_metrics, flight_metrics, path_metrics = self.executor.execute(
-                    str(fd_input_path), str(fd_output_path)
+            metrics.update(
+                run_flight_paths(
+                    partial(
+                        self._run_path,
+                        design=design,
+                        fd_inputs=fd_inputs,
+                        fd_files_base_path=fd_files_base_path,
+                    ),
+                    run_dirs_parent=fd_files_base_path if isolated else None,
+                    concurrent=concurrent_paths,
+                    early_exit=early_exit,
                 )
+            )
 
-                # Input Metrics
-                metrics.update(input_metrics.to_csv_dict())
-                other_metrics = self.design.parameters()
-                for key in other_metrics:
-                    if key.startswith("Length"):
-                        metrics[key] = other_metrics[key]
-
-                # Get the FlightPath metrics
-                metrics.update(flight_metrics.to_csv_dict())
-                metrics.update(path_metrics.to_csv_dict())
-
-                # Move input and output files to necessary locations
-                if not change_dir:
-                    move(fd_input_path, fd_files_base_path)
-                    move(fd_output_path, fd_files_base_path)
-
-                move("./metrics.out", fd_files_base_path / f"metrics_Path{i}.out")
-
-                # Remove metrics.out, score.out namemap.out
-                cleanup_score_files()
+            # Wait for the input and output files to be saved
+            self.executor.flush(fd_files_base_path)
 
             # Update the total score
             update_total_score(metrics)
@@ -240,12 +488,99 @@ class FlightDynamicsExperiment:
             metrics["AnalysisError"] = True
             raise e
 
-        if write_to_output_csv:
-            write_output_csv(output_dir=self.results_dir, metrics=metrics)
+        finally:
+            if metrics["AnalysisError"]:
+                self._flush_failed_run(fd_files_base_path)
 
         return metrics
 
+    def _flush_failed_run(self, fd_files_base_path):
+        """Wait for the saves of a failed run, without hiding the error of the run"""
+        try:
+            self.executor.flush(fd_files_base_path)
+        except Exception as e:
+            self.logger.error(f"Couldn't save the files in {fd_files_base_path}: {e}")
+
+    def _run_path(self, flight_path, run_dir, design, fd_inputs, fd_files_base_path):
+        """Run the flight dynamics for a single flight path.
+
+        If run_dir is None, the FDM runs in the current working directory. The input
+        is piped to the FDM, the input and output files are saved in the background.
+        """
+        metrics_path = Path(run_dir or ".") / "metrics.out"
+
+        input_metrics, flight_metrics, path_metrics = self.executor.execute_input(
+            render_fd_input(fd_inputs[flight_path]),
+            run_dir=run_dir,
+            input_file=fd_files_base_path / f"FlightDyn_Path{flight_path}.inp",
+            output_file=fd_files_base_path / f"FlightDynReport_Path{flight_path}.out",
+        )
+
+        # Input Metrics
+        metrics = input_metrics.to_csv_dict()
+        other_metrics = design.parameters()
+        for key in other_metrics:
+            if key.startswith("Length"):
+                metrics[key] = other_metrics[key]
+
+        # Get the FlightPath metrics
+        metrics.update(flight_metrics.to_csv_dict())
+        metrics.update(path_metrics.to_csv_dict())
+
+        move(str(metrics_path), fd_files_base_path / f"metrics_Path{flight_path}.out")
+
+        # Remove metrics.out, score.out namemap.out (the private run directory is removed as whole)
+        if run_dir is None:
+            cleanup_score_files()
+
+        return metrics
+
+    def write_results(self, metrics):
+        """Write the metrics of a run (or a list thereof) to the session's results file"""
+        if self.results_format == "csv":
+            write_output_csv(output_dir=self.results_dir, metrics=metrics)
+            return
+
+        if self._results_store is None:
+            self._results_store = ColumnarResultsStore(
+                self.results_dir / f"output{RESULTS_FORMATS[self.results_format]}",
+                results_format=self.results_format,
+                schema=self._results_schema(),
+            )
+        self._results_store.append(metrics)
+
+    def _results_schema(self):
+        """The schema of the results file, with the columns of complete runs.
+
+        The schema isn't inferred from the first runs, those could all be failed runs
+        (with only GUID and AnalysisError) which would reject the metrics of the others.
+        """
+        column_types = {"GUID": str, "AnalysisError": bool}
+        for key in self.design.parameters():
+            if key.startswith("Length"):
+                column_types[key] = float
+
+        for flight_path in (1, 3, 4, 5):
+            column_types.update(dict.fromkeys(metrics_csv_keys(flight_path), float))
+
+        column_types.update({"SkippedPaths": str, "TotalPathScore": float})
+        return results_schema(column_types)
+
+    def close(self):
+        """Complete the session's results file (and write the archived and indexed runs)"""
+        if self._results_store is not None:
+            self._results_store.close()
+            self._results_store = None
+
+        if self.artifact_archive is not None:
+            self.artifact_archive.close()
+            self.artifact_archive = None
+
+        if self.results_index is not None:
+            self.results_index.commit()
+
     def start_new_session(self):
+        self.close()
         self.session_id = f"e-{datetime.now().isoformat()}".replace(":", "-")
         self.results_dir = Path(
             f"results/{self.design.__class__.__name__}/{self.session_id}"
@@ -276,12 +611,14 @@ class FlightDynamicsExperiment:
         assert (
             propellers_data.resolve().exists()
         ), "The propellers data path doesn't exist"
-        tb = TestbenchData()
-        try:
-            for d in testbenches:
-                tb.load(str(d))
-        except:
+        # The testbench data is only loaded to fit the mass formulae, unless they are cached
+        if not all(zipfile.is_zipfile(testbench) for testbench in testbenches):
             raise TypeError("The testbench data provided is not valid")
+        with zipfile.ZipFile(testbenches[0]) as testbench_zip:
+            if not TESTBENCH_MAPS.issubset(testbench_zip.namelist()):
+                raise TypeError(
+                    f"The testbench data {testbenches[0]} is missing {sorted(TESTBENCH_MAPS)}"
+                )
 
         return testbenches, propellers_data
 
@@ -297,6 +634,19 @@ class QuadCopterVariableBatteryPropExperiment(FlightDynamicsExperiment):
         The propellers data path
     fdm_path: str, pathlib.Path
         The location of the fdm executable, if None, its assumed to be in PATH
+    cache: symbench_athens_client.fdm_cache.FDMResultsCache, optional, default=None
+        The cache to look up the FDM results in, before running the FDM
+    validate_metrics: bool, optional, default=True
+        If False, skip the validation of the metrics of every run (see `FDMExecutor`)
+    results_format: str, optional, default="csv"
+        The format of the session's results file, "csv" (output.csv) or, to buffer the
+        results and write them in row groups with a fixed schema, "parquet" (output.parquet)
+        or "arrow" (output.arrow). The latter two require pyarrow
+    results_index: str, pathlib.Path or symbench_athens_client.results_index.ResultsIndex, optional, default=None
+        If provided, the SQLite index (or its path) to add every run to, for queries across sessions
+    archive_artifacts: bool, optional, default=False
+        If true, pack the artifacts of every run into rolling zip shards in results/artifacts
+        and remove its directory (see symbench_athens_client.artifact_archive.ArtifactArchive)
     """
 
     def __init__(
@@ -304,6 +654,11 @@ class QuadCopterVariableBatteryPropExperiment(FlightDynamicsExperiment):
         testbenches,
         propellers_data,
         fdm_path=None,
+        cache=None,
+        validate_metrics=True,
+        results_format="csv",
+        results_index=None,
+        archive_artifacts=False,
     ):
         design = QuadCopter()
         valid_parameters = design.__design_vars__
@@ -316,8 +671,12 @@ class QuadCopterVariableBatteryPropExperiment(FlightDynamicsExperiment):
             valid_requirements,
             fdm_path=fdm_path,
             estimator=quad_copter_batt_prop,
+            cache=cache,
+            validate_metrics=validate_metrics,
+            results_format=results_format,
+            results_index=results_index,
+            archive_artifacts=archive_artifacts,
         )
-        self._run_tester = self.design.copy(deep=True)
         self._available_propellers = None
 
     @property
@@ -345,9 +704,7 @@ class QuadCopterVariableBatteryPropExperiment(FlightDynamicsExperiment):
     @property
     def available_propellers(self):
         if self._available_propellers is None:
-            self._available_propellers = list(
-                filter(lambda p: self.can_run_for(p), Propellers.all)
-            )
+            self._available_propellers = list(filter(self.can_run_for, Propellers.all))
         return self._available_propellers
 
     def run_for(
@@ -358,36 +715,57 @@ class QuadCopterVariableBatteryPropExperiment(FlightDynamicsExperiment):
         requirements=None,
         change_dir=False,
         write_to_output_csv=False,
+        isolated=False,
+        concurrent_paths=False,
+        early_exit=False,
     ):
-        if isinstance(battery, str):
-            assert battery in self.available_batteries, "Battery name is not valid"
-            battery = Batteries[battery]
-
+        parameters = self._validate_dict(parameters, "parameters")
         if battery is not None:
-            self._assign_battery(self.design, battery)
-
+            parameters = {**parameters, "battery": battery}
         if propeller is not None:
-            assign_propellers_quadcopter(self.design, propeller)
-
-        self.design.motor_0 = Motors.t_motor_MN5208KV340
-        self.design.motor_1 = Motors.t_motor_MN5208KV340
-        self.design.motor_2 = Motors.t_motor_MN5208KV340
-        self.design.motor_3 = Motors.t_motor_MN5208KV340
+            parameters = {**parameters, "propeller": propeller}
 
         return super().run_for(
             parameters=parameters,
             requirements=requirements,
             change_dir=change_dir,
             write_to_output_csv=write_to_output_csv,
+            isolated=isolated,
+            concurrent_paths=concurrent_paths,
+            early_exit=early_exit,
         )
 
+    def _prepare_design(self, design, parameters):
+        """Assign the battery and propeller parameters (if any) and the motors of the design
+
+        In run_for_many, every parameters dictionary can have a battery and a propeller
+        (components or their names), like the arguments of `run_for`.
+        """
+        parameters = dict(parameters)
+        battery = parameters.pop("battery", None)
+        propeller = parameters.pop("propeller", None)
+
+        if isinstance(battery, str):
+            assert battery in self.available_batteries, "Battery name is not valid"
+            battery = Batteries[battery]
+
+        if battery is not None:
+            self._assign_battery(design, battery)
+
+        if propeller is not None:
+            assign_propellers_quadcopter(design, propeller)
+
+        design.motor_0 = Motors.t_motor_MN5208KV340
+        design.motor_1 = Motors.t_motor_MN5208KV340
+        design.motor_2 = Motors.t_motor_MN5208KV340
+        design.motor_3 = Motors.t_motor_MN5208KV340
+
+        super()._prepare_design(design, parameters)
+
     def can_run_for(self, propeller):
         """Given a propeller, find if the design will fly based on components available."""
-        try:
-            assign_propellers_quadcopter(self._run_tester, propeller)
-            return True
-        except PropellerAssignmentError:
-            return False
+        name = propeller if isinstance(propeller, str) else propeller.name
+        return name in Propellers.with_counter_rotating
 
     @staticmethod
     def _assign_battery(design, battery):
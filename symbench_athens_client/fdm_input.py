@@ -0,0 +1,160 @@
+import threading
+from operator import itemgetter
+
+__all__ = ["FDMInputTemplate", "render_fd_input", "write_fd_input"]
+
+
+class FDMInputTemplate:
+    """A precompiled template of the flight dynamics input file (the &aircraft_data namelist).
+
+    The layout of an input file (the namelist entries, the comments and the blank lines) only
+    depends on the structure of its parameters i.e. the keys of the aircraft, propellers,
+    battery and controls dictionaries, which is fixed for a design class. A template lays it
+    out once, with a slot for every value, so that rendering an input file only fills the slots.
+
+    Parameters
+    ----------
+    structure: tuple
+        The structure of the parameters, from `FDMInputTemplate.structure_of`
+    """
+
+    _templates = {}
+    _lock = threading.Lock()
+
+    def __init__(self, structure):
+        self.structure = structure
+        aircraft, propellers, battery, controls = structure
+
+        self._template = self._compile(structure)
+        self._aircraft_getter = _values_getter(key for key, _ in aircraft)
+        self._aircraft_lists = [
+            (position, key)
+            for position, (key, length) in enumerate(aircraft)
+            if length is not None
+        ]
+        self._propellers_getters = [
+            _values_getter(key for key in keys if key != "for")
+            for _, keys in propellers
+        ]
+        self._battery_getter = _values_getter(battery)
+        self._controls_getter = _values_getter(controls)
+
+    @classmethod
+    def for_params(cls, fd_params):
+        """Get the (cached) template for the structure of fd_params"""
+        structure = cls.structure_of(fd_params)
+        template = cls._templates.get(structure)
+        if template is None:
+            with cls._lock:
+                template = cls._templates.setdefault(structure, cls(structure))
+        return template
+
+    @staticmethod
+    def structure_of(fd_params):
+        """Get the structure of the flight dynamics parameters (see `QuadCopter.to_fd_input`)"""
+        aircraft = fd_params["aircraft"]
+        return (
+            tuple(
+                [
+                    (key, len(value) if type(value) is list else None)
+                    for key, value in aircraft.items()
+                ]
+            ),
+            tuple(
+                [
+                    (propeller["for"], tuple(propeller))
+                    for propeller in fd_params["propellers"]
+                ]
+            ),
+            tuple(fd_params["battery"]),
+            tuple(fd_params["controls"]),
+        )
+
+    def render(self, fd_params):
+        """Render the flight dynamics input file for fd_params"""
+        aircraft = fd_params["aircraft"]
+        values = list(self._aircraft_getter(aircraft))
+        # The first value of a list is in its place, the rest at the end of the aircraft data
+        for position, key in self._aircraft_lists:
+            values[position] = aircraft[key][0]
+            values.extend(aircraft[key][1:])
+
+        for getter, propeller in zip(self._propellers_getters, fd_params["propellers"]):
+            values.extend(getter(propeller))
+
+        values.extend(self._battery_getter(fd_params["battery"]))
+        values.extend(self._controls_getter(fd_params["controls"]))
+
+        return self._template % tuple(values)
+
+    def write(self, fd_params, file):
+        """Write the flight dynamics input file for fd_params to file
+
+        Parameters
+        ----------
+        fd_params: dict
+            The flight dynamics parameters (see `QuadCopter.to_fd_input`)
+        file: str, pathlib.Path, int or file-like
+            The path or the file descriptor of the input file, or a text stream to write to
+        """
+        if hasattr(file, "write"):
+            file.write(self.render(fd_params))
+        else:
+            with open(file, "w", closefd=not isinstance(file, int)) as fd_inp:
+                fd_inp.write(self.render(fd_params))
+
+    @staticmethod
+    def _compile(structure):
+        aircraft, propellers, battery, controls = structure
+
+        lines = ["&aircraft_data"]
+        duplicate_lines = []
+        for key, length in aircraft:
+            lines.append(f"   aircraft%%{key}     = %s")
+            for _ in range(1, length or 0):
+                duplicate_lines.append(f"   aircraft%%{key}     = %s")
+        lines.extend(duplicate_lines)
+
+        lines.append("\n")
+
+        for for_components, keys in propellers:
+            lines.append(
+                f"!   Propeller({for_components+1}) uses components named Prop_{for_components}, "
+                f"Motor_{for_components}, ESC_{for_components}"
+            )
+            for key in keys:
+                if key != "for":
+                    lines.append(f"   propeller({for_components+1})%%{key}   = %s")
+
+            lines.append("\n")
+
+        lines.append("!\t Battery(1) is component named: Battery_0")
+        for key in battery:
+            lines.append(f"   battery(1)%%{key}    = %s")
+
+        lines.append("\n")
+
+        lines.append("!\t Controls")
+        for key in controls:
+            lines.append(f"   control%%{key} = %s")
+        lines.append("/\n\n")
+
+        return "\n".join(lines)
+
+
+def _values_getter(keys):
+    """Get a function returning the tuple of the values of keys in a dictionary"""
+    keys = tuple(keys)
+    if len(keys) == 1:
+        return lambda values: (values[keys[0]],)
+    return itemgetter(*keys) if keys else lambda values: ()
+
+
+def render_fd_input(fd_params):
+    """Render the flight dynamics input file for fd_params (see `QuadCopter.to_fd_input`)"""
+    return FDMInputTemplate.for_params(fd_params).render(fd_params)
+
+
+def write_fd_input(fd_params, file):
+    """Write the flight dynamics input file for fd_params to file (see `FDMInputTemplate.write`)"""
+    FDMInputTemplate.for_params(fd_params).write(fd_params, file)
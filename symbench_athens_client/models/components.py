@@ -1,9 +1,21 @@
 import csv
+import hashlib
 import json
+import pickle
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache, partial
 from typing import Any, Dict, Optional, Tuple, Union
 
+import pydantic
 from pydantic import BaseModel, Field, root_validator, validator
 
+from symbench_athens_client.cache import (
+    file_hash,
+    get_cache_file,
+    read_cache_file,
+    write_cache_file,
+)
 from symbench_athens_client.utils import (
     get_data_file_path,
     inject_none_for_missing_fields,
@@ -890,20 +902,73 @@ class CarbonFiberPlate(Component):
     z5_offset: float = Field(..., description="Z5_OFFSET", alias="Z5_OFFSET")
 
 
+# The lookups of ComponentsBuilder.where, to their numpy comparisons
+WHERE_LOOKUPS = {
+    "gt": "greater",
+    "lt": "less",
+    "ge": "greater_equal",
+    "le": "less_equal",
+    "eq": "equal",
+    "ne": "not_equal",
+}
+
+
 class ComponentsBuilder:
-    """The components repository builder class"""
+    """The components repository builder class
+
+    The components are parsed lazily, the first time they are looked up by name.
+
+    With a cache_name, once all the components are parsed (e.g. on iteration or with
+    `where`), they are pickled in the persistent cache directory (see
+    `symbench_athens_client.cache.get_cache_dir`), keyed by the components' data and
+    models. Then, other processes load them without validating them again.
+
+    Parameters
+    ----------
+    creator: type
+        The Component class of the components
+    components: iterable of dict or callable
+        The components' dictionaries (with their names), or a function returning them
+        (called on first access)
+    cache_name: str, default=None
+        The name of the library in the persistent cache (If None, it isn't cached)
+    """
 
-    def __init__(self, creator, components):
+    def __init__(self, creator, components, cache_name=None):
         self.creator = creator
-        self.components = self._initialize_components(components)
+        self.cache_name = cache_name
+        self._source = components
+        self._component_dicts = None
+        self._components = {}
+        self._cache_file = None
+        self._positions = None
+        self._indexes = {}
+        self._sorted_indexes = {}
+        self._columns = {}
+        self._lock = threading.RLock()
+
+    @property
+    def components(self):
+        """The dictionary of the components, by name (parses all the components)"""
+        component_dicts = self._get_component_dicts()
+        if len(self._components) < len(component_dicts):
+            with self._lock:
+                self._components = {
+                    name: self._get_component(name) for name in component_dicts
+                }
+                self._write_cache()
+        return self._components
 
     @property
     def all(self):
-        return list(self.components.keys())
+        return list(self._get_component_dicts())
 
     def __getattr__(self, item):
-        if item in self.components:
-            return self.components[item]
+        if item.startswith("_"):
+            raise AttributeError(item)
+
+        if item in self._get_component_dicts():
+            return self._get_component(item)
         else:
             raise AttributeError(
                 f"{self.creator.__name__} {item} is missing from the repository"
@@ -911,26 +976,142 @@ class ComponentsBuilder:
 
     def __getitem__(self, item):
         if isinstance(item, int):
-            components = list(self.components.values())
-            return components[item]
+            return self._get_positions()[item]
         else:
-            component_names = {
-                component.name: component for component in self.components.values()
-            }
-
-            if item in component_names:
-                return component_names[item]
+            if item in self._get_component_dicts():
+                return self._get_component(item)
             else:
                 raise KeyError(
                     f"{self.creator.__name__} {item} is missing from the repository"
                 )
 
     def __iter__(self):
-        for component in self.components.values():
+        for component in self._get_positions():
             yield component
 
     def __len__(self):
-        return len(self.components)
+        return len(self._get_component_dicts())
+
+    def find_by(self, attribute, value):
+        """Find the components whose attribute equals value.
+
+        The first lookup on an attribute builds an index (value to components) on it,
+        later lookups are constant time.
+
+        Parameters
+        ----------
+        attribute: str
+            The attribute (field name) of the components, e.g. performance_file
+        value: Any
+            The value to look for
+
+        Returns
+        -------
+        list
+            The matching components, in the order of the library
+        """
+        index = self._indexes.get(attribute)
+        if index is None:
+            with self._lock:
+                index = {}
+                for component in self:
+                    index.setdefault(getattr(component, attribute), []).append(
+                        component
+                    )
+                self._indexes[attribute] = index
+
+        return list(index.get(value, ()))
+
+    def sorted_by(self, attribute, reverse=False):
+        """The components sorted by attribute (those with a None or NaN attribute are left out)"""
+        _, components = self._get_sorted_index(attribute)
+        return list(components[::-1] if reverse else components)
+
+    def in_range(self, attribute, low=None, high=None):
+        """The components with attribute in [low, high], sorted by attribute.
+
+        Parameters
+        ----------
+        attribute: str
+            The attribute (field name) of the components, e.g. kv
+        low: Any, default=None
+            The lower bound (If None, unbounded)
+        high: Any, default=None
+            The upper bound (If None, unbounded)
+
+        Returns
+        -------
+        list
+            The components in range, found by bisecting the sorted index on attribute
+        """
+        values, components = self._get_sorted_index(attribute)
+        start = 0 if low is None else bisect_left(values, low)
+        stop = len(values) if high is None else bisect_right(values, high)
+        return list(components[start:stop])
+
+    def column(self, attribute):
+        """The values of attribute for all the components, as a (read-only) numpy array.
+
+        Numeric attributes are float arrays (None is NaN), the others are object arrays.
+        """
+        column = self._columns.get(attribute)
+        if column is None:
+            import numpy as np
+
+            with self._lock:
+                values = [getattr(component, attribute) for component in self]
+                field = self.creator.__fields__.get(attribute)
+                if field is not None and field.type_ in (int, float):
+                    column = np.array(
+                        [np.nan if value is None else value for value in values],
+                        dtype=float,
+                    )
+                else:
+                    column = np.empty(len(values), dtype=object)
+                    column[:] = values
+                column.setflags(write=False)
+                self._columns[attribute] = column
+
+        return column
+
+    def where(self, **conditions):
+        """Find the components matching all the conditions, with vectorized masks over their columns.
+
+        A condition is attribute=value, attribute=(low, high) for an inclusive range (either
+        bound can be None) or attribute__lookup=value with a lookup in gt, lt, ge, le, eq or ne.
+
+        Examples
+        --------
+        >>> Motors.where(kv=(300, 500), max_power__gt=800)
+        >>> Propellers.where(diameter=(200, 400), direction=1)
+
+        Returns
+        -------
+        list
+            The matching components, in the order of the library
+        """
+        import numpy as np
+
+        mask = np.ones(len(self), dtype=bool)
+        for key, condition in conditions.items():
+            attribute, _, lookup = key.rpartition("__")
+            if lookup not in WHERE_LOOKUPS:
+                attribute, lookup = key, None
+
+            column = self.column(attribute)
+            if lookup is not None:
+                mask &= getattr(np, WHERE_LOOKUPS[lookup])(column, condition)
+            elif isinstance(condition, tuple):
+                low, high = condition
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            else:
+                mask &= column == condition
+
+        positions = self._get_positions()
+        return [positions[position] for position in np.flatnonzero(mask)]
 
     def to_csv(self, filename):
         """Write these components to a csv_file"""
@@ -941,15 +1122,78 @@ class ComponentsBuilder:
             for component in self.components.values():
                 dict_writer.writerow(component.dict(by_alias=True))
 
-    def _initialize_components(self, components):
-        component_instances = {}
-
-        for component_dict in components:
-            object_dict = self._fix_parametric_properties(component_dict)
-            component_instance = self.creator.parse_obj(object_dict)
-            component_instances[component_instance.name] = component_instance
-
-        return component_instances
+    def _get_positions(self):
+        if self._positions is None:
+            with self._lock:
+                self._positions = tuple(self.components.values())
+        return self._positions
+
+    def _get_sorted_index(self, attribute):
+        sorted_index = self._sorted_indexes.get(attribute)
+        if sorted_index is None:
+            with self._lock:
+                pairs = []
+                for position, component in enumerate(self):
+                    value = getattr(component, attribute)
+                    # None and NaN values can't be ordered
+                    if value is not None and value == value:
+                        pairs.append((value, position))
+                pairs.sort()
+
+                positions = self._get_positions()
+                sorted_index = (
+                    [value for value, _ in pairs],
+                    tuple(positions[position] for _, position in pairs),
+                )
+                self._sorted_indexes[attribute] = sorted_index
+        return sorted_index
+
+    def _get_component_dicts(self):
+        if self._component_dicts is None:
+            with self._lock:
+                if self._component_dicts is None:
+                    self._load()
+        return self._component_dicts
+
+    def _load(self):
+        cache_file = _catalog_cache_file(self.cache_name) if self.cache_name else None
+        cached = read_cache_file(cache_file)
+        if cached is not None:
+            try:
+                self._components = pickle.loads(cached)
+                # Every component is parsed already, their dictionaries aren't needed
+                self._component_dicts = dict.fromkeys(self._components)
+                return
+            except Exception:  # Stale or corrupt entry, parse the components again
+                self._components = {}
+
+        components = self._source
+        if callable(components):
+            components = components()
+        self._component_dicts = {
+            component_dict["Name"]: component_dict for component_dict in components
+        }
+        # The components are pickled once all of them are parsed
+        self._cache_file = cache_file
+
+    def _write_cache(self):
+        if self._cache_file is not None:
+            write_cache_file(self._cache_file, pickle.dumps(self._components))
+            self._cache_file = None
+
+    def _get_component(self, name):
+        component = self._components.get(name)
+        if component is None:
+            with self._lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = self._initialize_component(self._component_dicts[name])
+                    self._components[name] = component
+        return component
+
+    def _initialize_component(self, component_dict):
+        object_dict = self._fix_parametric_properties(component_dict)
+        return self.creator.parse_obj(object_dict)
 
     def _fix_parametric_properties(self, component_dict):
         parametric_properties = {}
@@ -981,40 +1225,130 @@ class ComponentsBuilder:
         return f"<{self.creator.__name__} Library, Count: {self.__len__()}>"
 
 
-all_comps = get_data_file_path("all_components.json")
-with open(all_comps) as json_file:
-    all_comps = json.load(json_file)
+class PropellersBuilder(ComponentsBuilder):
+    """The propellers repository, with an index of the counter-rotating propellers
+
+    The propellers with the same performance file and opposite directions (spins) are
+    counter-rotating pairs. The pairs are indexed once, on first lookup.
+    """
+
+    def __init__(self, components, cache_name=None):
+        super().__init__(Propeller, components, cache_name=cache_name)
+        self._spin_pairs = None
+        self._with_counter_rotating = None
+
+    def counter_rotating(self, propeller):
+        """The propeller with the same performance file and the opposite spin (None if missing)
+
+        Parameters
+        ----------
+        propeller: str, Propeller
+            The propeller (or its name)
+
+        Returns
+        -------
+        Propeller or None
+            The counter-rotating propeller
+        """
+        if isinstance(propeller, str):
+            propeller = self[propeller]
+        return self._get_spin_pairs().get(
+            (propeller.performance_file, -1 * propeller.direction)
+        )
+
+    @property
+    def with_counter_rotating(self):
+        """The names of the propellers which have a counter-rotating propeller"""
+        if self._with_counter_rotating is None:
+            spin_pairs = self._get_spin_pairs()
+            self._with_counter_rotating = frozenset(
+                propeller.name
+                for propeller in self
+                if (propeller.performance_file, -1 * propeller.direction) in spin_pairs
+            )
+        return self._with_counter_rotating
+
+    def _get_spin_pairs(self):
+        if self._spin_pairs is None:
+            with self._lock:
+                # The last propeller of the library wins when several have the same spin
+                self._spin_pairs = {
+                    (propeller.performance_file, propeller.direction): propeller
+                    for propeller in self
+                }
+        return self._spin_pairs
+
+
+@lru_cache(maxsize=None)
+def _load_all_components():
+    with open(get_data_file_path("all_components.json")) as json_file:
+        return json.load(json_file)
+
+
+def __getattr__(name):
+    # The components' JSON is only loaded when used
+    if name == "all_comps":
+        return _load_all_components()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def _catalog_key():
+    key_hash = hashlib.sha256()
+    # The parsed components depend on their data and on the models (in this file)
+    for path in (get_data_file_path("all_components.json"), __file__):
+        key_hash.update(file_hash(path).encode("utf-8"))
+    key_hash.update(pydantic.VERSION.encode("utf-8"))
+    return key_hash.hexdigest()
+
+
+def _catalog_cache_file(cache_name):
+    cache_file = get_cache_file("components")
+    return cache_file / _catalog_key() / f"{cache_name}.pkl" if cache_file else None
 
 
 def get_all_components_of_class(cls):
-    for key, value in all_comps.items():
+    for key, value in _load_all_components().items():
         if value["Classification"] == cls.__name__:
             value["Name"] = key
             yield value
 
 
 def _build_components(cls):
-    return ComponentsBuilder(creator=cls, components=get_all_components_of_class(cls))
+    return ComponentsBuilder(
+        creator=cls,
+        components=partial(get_all_components_of_class, cls),
+        cache_name=cls.__name__,
+    )
+
+
+def _parametric_components(cls, names):
+    all_comps = _load_all_components()
+    return (
+        {"Name": comp_name, **all_comps[comp_name], "Classification": cls.__name__}
+        for comp_name in names
+    )
 
 
 def _build_parametric_components(cls, names):
     return ComponentsBuilder(
         creator=cls,
-        components=(
-            {"Name": comp_name, **all_comps[comp_name], "Classification": cls.__name__}
-            for comp_name in names
-        ),
+        components=partial(_parametric_components, cls, names),
+        cache_name=cls.__name__,
     )
 
 
-def _build_tubes(names):
-    for tube_name in names:
-        if tube_name == "0281OD_para_tube":
-            all_comps[tube_name]["para_Length_[]AssignedValue"] = all_comps[
-                tube_name
-            ].pop("LENGTH")
+def _tube_components(names):
+    for component in _parametric_components(Tube, names):
+        if component["Name"] == "0281OD_para_tube":
+            component["para_Length_[]AssignedValue"] = component.pop("LENGTH")
+        yield component
 
-    return _build_parametric_components(Tube, names)
+
+def _build_tubes(names):
+    return ComponentsBuilder(
+        creator=Tube, components=partial(_tube_components, names), cache_name="Tube"
+    )
 
 
 ALL_FLANGES = ["0394_para_flange"]
@@ -1030,7 +1364,10 @@ ALL_ORIENTS = ["Orient"]
 ALL_CFPS = ["para_cf_fplate"]
 
 Batteries = _build_components(Battery)
-Propellers = _build_components(Propeller)
+Propellers = PropellersBuilder(
+    components=partial(get_all_components_of_class, Propeller),
+    cache_name=Propeller.__name__,
+)
 Motors = _build_components(Motor)
 ESCs = _build_components(ESC)
 Instrument_Batteries = _build_components(Instrument_Battery)
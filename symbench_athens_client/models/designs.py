@@ -2,6 +2,7 @@ from typing import ClassVar, Dict, List, Tuple, Union
 
 from pydantic import BaseModel, Field, validator
 
+from symbench_athens_client.fdm_input import render_fd_input, write_fd_input
 from symbench_athens_client.models.components import (
     ESC,
     Batteries,
@@ -321,6 +322,58 @@ class QuadCopter(SeedDesign):
             if filename is None, this method will return a dictionary containing all the parameters
             otherwise the file will be saved as filename
         """
+        fd_params = self.to_fd_inputs(
+            testbench_path_or_formulae,
+            flight_paths=(flight_path,),
+            propellers_data_path=propellers_data_path,
+            analysis_type=analysis_type,
+            requested_vertical_speed=requested_vertical_speed,
+            requested_lateral_speed=requested_lateral_speed,
+        )[flight_path]
+
+        if filename is not None:
+            self.write_fd_input(fd_params, filename)
+        else:
+            return fd_params
+
+    def to_fd_inputs(
+        self,
+        testbench_path_or_formulae,
+        flight_paths=(1, 3, 4, 5),
+        propellers_data_path=None,
+        filenames=None,
+        analysis_type=3,
+        requested_vertical_speed=10.0,
+        requested_lateral_speed=1,
+    ):
+        """Get SWRi's flight dynamics model's input files for many flight paths of this design
+
+        The mass properties, aircraft, propellers and battery data are computed once for all the
+        flight paths, only the controls differ between them.
+
+        Parameters
+        ----------
+        testbench_path_or_formulae: str, pathlib.Path, dict
+            The location of the testbench data to use by uav_analysis.testbench_data.TestBenchData or a dictionary of formulas
+        flight_paths: iterable of int, default=(1, 3, 4, 5)
+            The flight paths to get the input files for
+        propellers_data_path: str, pathlib.Path
+            The base directory for propellers data
+        filenames: dict, default=None
+            The paths of the input files (with .inp extensions) by flight path
+        analysis_type: int, default=3
+            The analysis type for these input files (3=flight path analysis, 2=Trim Steady, 1=Initial Conditions)
+        requested_vertical_speed: float or dict, default=10.0
+            The requested vertical speed for the FD software, or a dictionary of it by flight path
+        requested_lateral_speed: int or dict, default=1
+            The requested lateral speed for the FD software, or a dictionary of it by flight path
+
+        Returns
+        -------
+        dict or None
+            if filenames is None, this method will return a dictionary containing all the parameters
+            (see `to_fd_input`) by flight path, otherwise the files will be saved as filenames
+        """
         masses = self._get_mass_properties(testbench_path_or_formulae)
         propeller_1 = self.propeller_0.to_fd_inp(propellers_data_path)
         propeller_1["for"] = 0
@@ -374,29 +427,55 @@ class QuadCopter(SeedDesign):
 
         aircraft_data.update(masses["aircraft"])
 
-        fd_params = {
-            "aircraft": aircraft_data,
-            "propellers": [propeller_1, propeller_2, propeller_3, propeller_4],
-            "battery": self.battery_0.to_fd_inp(),
-            "controls": {
-                "i_flight_path": flight_path,
-                "requested_lateral_speed": int(requested_lateral_speed),
-                "requested_vertical_speed": requested_vertical_speed,
-                "iaileron": 5,
-                "iflap": 6,
-                "Q_position": self.q_position,
-                "Q_velocity": self.q_velocity,
-                "Q_angular_velocity": self.q_angular_velocity,
-                "Q_angles": self.q_angles,
-                "R": self.r,
-            },
-        }
-
-        if filename is not None:
-            with open(filename, "w") as fd_inp:
-                fd_inp.write(self._to_fd_inp(fd_params))
+        battery = self.battery_0.to_fd_inp()
+        propellers = [propeller_1, propeller_2, propeller_3, propeller_4]
+
+        fd_inputs = {}
+        for flight_path in flight_paths:
+            vertical_speed = requested_vertical_speed
+            if isinstance(vertical_speed, dict):
+                vertical_speed = vertical_speed[flight_path]
+
+            lateral_speed = requested_lateral_speed
+            if isinstance(lateral_speed, dict):
+                lateral_speed = lateral_speed[flight_path]
+
+            # Shallow copies, so that the inputs of the flight paths are independent
+            fd_inputs[flight_path] = {
+                "aircraft": dict(aircraft_data),
+                "propellers": [dict(propeller) for propeller in propellers],
+                "battery": dict(battery),
+                "controls": {
+                    "i_flight_path": flight_path,
+                    "requested_lateral_speed": int(lateral_speed),
+                    "requested_vertical_speed": vertical_speed,
+                    "iaileron": 5,
+                    "iflap": 6,
+                    "Q_position": self.q_position,
+                    "Q_velocity": self.q_velocity,
+                    "Q_angular_velocity": self.q_angular_velocity,
+                    "Q_angles": self.q_angles,
+                    "R": self.r,
+                },
+            }
+
+        if filenames is not None:
+            for flight_path, filename in filenames.items():
+                self.write_fd_input(fd_inputs[flight_path], filename)
         else:
-            return fd_params
+            return fd_inputs
+
+    def write_fd_input(self, fd_params, filename):
+        """Write the flight dynamics input file from the parameters of `to_fd_input`
+
+        Parameters
+        ----------
+        fd_params: dict
+            The flight dynamics parameters from `to_fd_input` or `to_fd_inputs`
+        filename: str, pathlib.Path, int or file-like
+            The path or the file descriptor of the input file, or a text stream to write it to
+        """
+        write_fd_input(fd_params, filename)
 
     def _get_mass_properties(self, testbench_path_or_formulae):
         """Get estimated mass properties for the quadcopter(works only for single parameters for now)"""
@@ -451,44 +530,8 @@ class QuadCopter(SeedDesign):
 
     @staticmethod
     def _to_fd_inp(input_dict):
-        """Write the flight dynamics input file (Clean refactorable implementation)"""
-        inp_lines = ["&aircraft_data"]
-        duplicate_entries = []
-        for key, value in input_dict["aircraft"].items():
-            if isinstance(value, list):
-                for j in range(1, len(value)):
-                    duplicate_entries.append(f"   aircraft%{key}     = {value[j]}")
-                inp_lines.append(f"   aircraft%{key}     = {value[0]}")
-            else:
-                inp_lines.append(f"   aircraft%{key}     = {value}")
-
-        for entry in duplicate_entries:
-            inp_lines.append(entry)
-
-        inp_lines.append("\n")
-
-        for propeller_dict in input_dict["propellers"]:
-            for_components = propeller_dict.pop("for")
-            comment_line = f"!   Propeller({for_components+1}) uses components named Prop_{for_components}, Motor_{for_components}, ESC_{for_components}"
-            inp_lines.append(comment_line)
-            for key, value in propeller_dict.items():
-                inp_lines.append(
-                    f"   propeller({for_components+1})%{key}   = {str(value)}"
-                )
-
-            inp_lines.append("\n")
-
-        inp_lines.append("!\t Battery(1) is component named: Battery_0")
-        for key, value in input_dict["battery"].items():
-            inp_lines.append(f"   battery(1)%{key}    = {value}")
-
-        inp_lines.append("\n")
-
-        inp_lines.append("!\t Controls")
-        for key, value in input_dict["controls"].items():
-            inp_lines.append(f"   control%{key} = {value}")
-        inp_lines.append("/\n\n")
-        return "\n".join(inp_lines)
+        """Render the flight dynamics input file (see symbench_athens_client.fdm_input)"""
+        return render_fd_input(input_dict)
 
     def validate_propellers_directions(self):
         assert (
@@ -1,7 +1,19 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import ClassVar, Set
+
 from pydantic import BaseModel, Field
 
 
 class FDMInputMetric(BaseModel):
+    __path_independent_keys__: ClassVar[Set[str]] = {
+        "Ixx",
+        "iyy",
+        "Izz",
+        "MassEstimate",
+        "Interferences",
+    }
+
     flight_path: int = Field(..., description="The Flight path", alias="Flight_Path")
 
     i_xx: float = Field(..., description="Ixx value", alias="Ixx")
@@ -44,14 +56,38 @@ class FDMInputMetric(BaseModel):
         self_dict = self.dict(by_alias=True, exclude={"flight_path"})
         csv_dict = {}
         for key, value in self_dict.items():
-            if key not in {"Ixx", "iyy", "Izz", "MassEstimate", "Interferences"}:
+            if key not in self.__path_independent_keys__:
                 csv_dict[f"{key}_{self.flight_path}"] = value
             else:
                 csv_dict[key] = value
         return csv_dict
 
+    @classmethod
+    def path_csv_keys(cls, flight_path):
+        """The keys of the CSV dictionary which are specific to a flight path"""
+        return [
+            f"{field.alias}_{flight_path}"
+            for name, field in cls.__fields__.items()
+            if name != "flight_path"
+            and field.alias not in cls.__path_independent_keys__
+        ]
+
     @classmethod
     def from_fd_input(cls, input_file):
+        with open(input_file) as fd_input_file:
+            return cls.from_fd_input_text(fd_input_file.read())
+
+    @classmethod
+    def from_fd_input_text(cls, fd_input, validate=True):
+        """Return an instance of input metrics from the contents of an input file
+
+        Parameters
+        ----------
+        fd_input: str
+            The contents of the input file for the flight dynamics software
+        validate: bool, default=True
+            If False, return an (unvalidated) FDMInputRecord instead of the model
+        """
         fields = {
             "aircraft%Ixx": "Ixx",
             "aircraft%Iyy": "iyy",
@@ -68,17 +104,18 @@ class FDMInputMetric(BaseModel):
         }
         input_metrics = dict()
 
-        with open(input_file) as fd_input_file:
-            lines = fd_input_file.readlines()
-            for line in lines:
-                splitted_line = line.strip().split("=")
-                if splitted_line[0].strip() in fields:
-                    input_metrics[fields[splitted_line[0].strip()]] = float(
-                        splitted_line[1].strip()
-                    )
+        for line in fd_input.splitlines():
+            splitted_line = line.strip().split("=")
+            if splitted_line[0].strip() in fields:
+                input_metrics[fields[splitted_line[0].strip()]] = float(
+                    splitted_line[1].strip()
+                )
 
         input_metrics["Interferences"] = 0
 
+        if not validate:
+            return FDMInputRecord.from_values(input_metrics)
+
         return cls(**input_metrics)
 
     class Config:
@@ -150,35 +187,7 @@ class FDMFlightMetric(BaseModel):
 
     @classmethod
     def from_fd_metrics(cls, metrics_file):
-        fields = {
-            "Battery_amps_to_max_amps_ratio_at_Max_Flight_Distance": "batt_amps_ratio_mfd",
-            "Battery_amps_to_max_amps_ratio_at_Max_Speed": "batt_amps_ratio_max_speed",
-            "Distance_at_Max_Speed_(m)": "distance_max_speed",
-            "Max_Flight_Distance_(m)": "max_flight_distance",
-            "Max_Hover_Time_(s)": "max_hover_time",
-            "Max_Lateral_Speed_(m/s)": "max_lateral_speed",
-            "Max_uc_at_Max_Flight_Distance": "max_uc_at_mfd",
-            "Motor_amps_to_max_amps_ratio_at_Max_Flight_Distance": "motor_amps_ratio_mfd",
-            "Motor_amps_to_max_amps_ratio_at_Max_Speed": "motor_amps_ratio_max_speed",
-            "Motor_power_to_max_power_ratio_at_Max_Flight_Distance": "mot_power_ratio_mfd",
-            "Power_at_Max_Flight_Distance_(W)": "power_at_mfd",
-            "Power_at_Max_Speed_(W)": "power_max_speed",
-            "Speed_at_Max_Flight_Distance_(m/s)": "speed_at_mfd",
-            "Motor_power_to_max_power_ratio_at_Max_Speed": "motor_power_ratio_max_speed",
-        }
-        flight_metrics_dict = {}
-        with open(metrics_file) as metrics_fp:
-            lines = metrics_fp.readlines()
-            for line in lines:
-                line_splited = line.strip().split()
-                if line.strip().startswith("No trim conditions were found"):
-                    flight_metrics_dict = {entry: 0.0 for entry in fields.values()}
-                    break
-                if line_splited and line_splited[0] in fields:
-                    flight_metrics_dict[
-                        fields[line_splited[0]]
-                    ] = cls.get_float_from_line(line)
-
+        flight_metrics_dict, _ = read_fd_metrics(metrics_file)
         return cls(**flight_metrics_dict)
 
     @staticmethod
@@ -223,36 +232,20 @@ class FDMFlightPathMetric(BaseModel):
             csv_dict[f"{key}_Path{self.flight_path}"] = value
         return csv_dict
 
+    @classmethod
+    def path_csv_keys(cls, flight_path):
+        """The keys of the CSV dictionary for a flight path"""
+        return [
+            f"{field.alias}_Path{flight_path}"
+            for name, field in cls.__fields__.items()
+            if name != "flight_path"
+        ]
+
     @classmethod
     def from_fd_metrics(cls, metrics_file):
         """Return an instance of path metrics from this metrics file"""
-        with open(metrics_file) as metrics_fp:
-            lines = metrics_fp.readlines()
-            for line in lines:
-                if line.strip().startswith("Path performance"):
-                    flight_path = int(line.strip().split()[-1])
-                if line.strip().startswith("Flight_distance"):
-                    flight_distance = cls.get_float_from_line(line)
-                if line.strip().startswith("Time_to_traverse_path"):
-                    time = cls.get_float_from_line(line)
-                if line.strip().startswith("Average_speed_to_traverse_path"):
-                    average_speed = cls.get_float_from_line(line)
-                if line.strip().startswith("Maximimum_error_distance_during_flight"):
-                    maximum_error_distance_during_flight = cls.get_float_from_line(line)
-                if line.strip().startswith("Spatial_average_distance_error"):
-                    average_error = cls.get_float_from_line(line)
-                if line.strip().startswith("Path_traverse_score_based_on_requirements"):
-                    path_score = cls.get_float_from_line(line)
-
-        return cls(
-            flight_path=flight_path,
-            flight_distance=flight_distance,
-            time_to_traverse_path=time,
-            maximum_error_distance_during_flight=maximum_error_distance_during_flight,
-            average_error=average_error,
-            path_score=path_score,
-            average_speed=average_speed,
-        )
+        _, path_metrics_dict = read_fd_metrics(metrics_file)
+        return cls(**path_metrics_dict)
 
     @staticmethod
     def get_float_from_line(line):
@@ -261,3 +254,231 @@ class FDMFlightPathMetric(BaseModel):
     class Config:
         allow_mutation = False
         allow_population_by_field_name = True
+
+
+# The first word of a metrics.out line to the (FDMFlightMetric or FDMFlightPathMetric) field it holds
+FLIGHT_METRICS_KEYS = {
+    "Battery_amps_to_max_amps_ratio_at_Max_Flight_Distance": "batt_amps_ratio_mfd",
+    "Battery_amps_to_max_amps_ratio_at_Max_Speed": "batt_amps_ratio_max_speed",
+    "Distance_at_Max_Speed_(m)": "distance_max_speed",
+    "Max_Flight_Distance_(m)": "max_flight_distance",
+    "Max_Hover_Time_(s)": "max_hover_time",
+    "Max_Lateral_Speed_(m/s)": "max_lateral_speed",
+    "Max_uc_at_Max_Flight_Distance": "max_uc_at_mfd",
+    "Motor_amps_to_max_amps_ratio_at_Max_Flight_Distance": "motor_amps_ratio_mfd",
+    "Motor_amps_to_max_amps_ratio_at_Max_Speed": "motor_amps_ratio_max_speed",
+    "Motor_power_to_max_power_ratio_at_Max_Flight_Distance": "mot_power_ratio_mfd",
+    "Power_at_Max_Flight_Distance_(W)": "power_at_mfd",
+    "Power_at_Max_Speed_(W)": "power_max_speed",
+    "Speed_at_Max_Flight_Distance_(m/s)": "speed_at_mfd",
+    "Motor_power_to_max_power_ratio_at_Max_Speed": "motor_power_ratio_max_speed",
+}
+
+PATH_METRICS_KEYS = {
+    "Flight_distance": "flight_distance",
+    "Time_to_traverse_path": "time_to_traverse_path",
+    "Average_speed_to_traverse_path": "average_speed",
+    "Maximimum_error_distance_during_flight": "maximum_error_distance_during_flight",
+    "Spatial_average_distance_error": "average_error",
+    "Path_traverse_score_based_on_requirements": "path_score",
+}
+
+_METRICS_KEYS = {
+    **{key: (0, field) for key, field in FLIGHT_METRICS_KEYS.items()},
+    **{key: (1, field) for key, field in PATH_METRICS_KEYS.items()},
+}
+
+
+def read_fd_metrics(metrics_file):
+    """Read the flight and the flight path metrics from a metrics.out file, in a single pass.
+
+    If no trim conditions were found, all the flight metrics are zero.
+
+    Parameters
+    ----------
+    metrics_file: str, pathlib.Path
+        The metrics.out file written by the flight dynamics software
+
+    Returns
+    -------
+    tuple of dict
+        The FDMFlightMetric and the FDMFlightPathMetric fields (by name)
+    """
+    metrics = ({}, {})
+    no_trim = False
+
+    with open(metrics_file) as metrics_fp:
+        for line in metrics_fp:
+            words = line.split()
+            if not words:
+                continue
+
+            key = _METRICS_KEYS.get(words[0])
+            if key is not None:
+                if not (no_trim and key[0] == 0):
+                    metrics[key[0]][key[1]] = float(words[-1])
+            elif words[0] == "Path" and line.lstrip().startswith("Path performance"):
+                metrics[1]["flight_path"] = int(words[-1])
+            elif line.lstrip().startswith("No trim conditions were found"):
+                no_trim = True
+                metrics[0].update(dict.fromkeys(FLIGHT_METRICS_KEYS.values(), 0.0))
+
+    return metrics
+
+
+def parse_fd_metrics(metrics_file, flat=False, validate=True):
+    """Parse a metrics.out file (once) into the flight and the flight path metrics.
+
+    Parameters
+    ----------
+    metrics_file: str, pathlib.Path
+        The metrics.out file written by the flight dynamics software
+    flat: bool, default=False
+        If true, return a single dictionary keyed like the CSV dictionaries of the metrics,
+        without building the models
+    validate: bool, default=True
+        If False, return the (unvalidated) FDMFlightRecord and FDMFlightPathRecord instead
+        of the models
+
+    Returns
+    -------
+    tuple or dict
+        The (FDMFlightMetric, FDMFlightPathMetric) pair, or a dictionary if flat
+    """
+    flight_metrics, path_metrics = read_fd_metrics(metrics_file)
+    if not flat:
+        if not validate:
+            return (
+                FDMFlightRecord.from_values(flight_metrics),
+                FDMFlightPathRecord.from_values(path_metrics),
+            )
+        return FDMFlightMetric(**flight_metrics), FDMFlightPathMetric(**path_metrics)
+
+    flight_path = path_metrics.get("flight_path", 0)
+    metrics_dict = {
+        field.alias: flight_metrics[name]
+        for name, field in FDMFlightMetric.__fields__.items()
+        if name in flight_metrics
+    }
+    metrics_dict.update(
+        (f"{field.alias}_Path{flight_path}", path_metrics[name])
+        for name, field in FDMFlightPathMetric.__fields__.items()
+        if name != "flight_path" and name in path_metrics
+    )
+    return metrics_dict
+
+
+class _MetricRecord:
+    """The base of the lightweight, unvalidated counterparts of the metric models.
+
+    A record is a named tuple of the fields of its model, in the same order, which
+    converts its values to the field types but skips the validation. Its CSV dictionary
+    is keyed like the model's, with the keys computed once per flight path.
+    """
+
+    __slots__ = ()
+    __model__ = None
+
+    def __init_subclass__(cls, model=None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if model is None:
+            return
+
+        cls.__model__ = model
+        cls._aliases = tuple(field.alias for field in model.__fields__.values())
+        cls._names = {field.alias: name for name, field in model.__fields__.items()}
+        cls._types = {
+            name: field.outer_type_ if field.outer_type_ in (int, float) else None
+            for name, field in model.__fields__.items()
+        }
+        cls._defaults = {
+            name: field.default
+            for name, field in model.__fields__.items()
+            if not field.required
+        }
+
+    @classmethod
+    def from_values(cls, values):
+        """Create a record from a dictionary of field values (by name or by alias)"""
+        fields = dict(cls._defaults)
+        for key, value in values.items():
+            name = cls._names.get(key, key)
+            if name in cls._types:
+                field_type = cls._types[name]
+                fields[name] = field_type(value) if field_type else value
+        return cls(**fields)
+
+    def dict(self, by_alias=False):
+        """The fields of this record, like the model's dict"""
+        return dict(zip(self._aliases if by_alias else self._fields, self))
+
+    def to_model(self):
+        """Validate this record into its model"""
+        return self.__model__(**self.dict())
+
+
+@lru_cache(maxsize=None)
+def _csv_keys(model, flight_path):
+    """The CSV dictionary keys of the fields of model after the flight path"""
+    if model is FDMInputMetric:
+        return tuple(
+            (
+                field.alias
+                if field.alias in model.__path_independent_keys__
+                else f"{field.alias}_{flight_path}"
+            )
+            for name, field in model.__fields__.items()
+            if name != "flight_path"
+        )
+    return tuple(model.path_csv_keys(flight_path))
+
+
+def metrics_csv_keys(flight_path):
+    """The keys of the CSV dictionaries of the input, flight and path metrics of a flight path"""
+    return (
+        *_csv_keys(FDMInputMetric, flight_path),
+        *(field.alias for field in FDMFlightMetric.__fields__.values()),
+        *_csv_keys(FDMFlightPathMetric, flight_path),
+    )
+
+
+class FDMInputRecord(
+    _MetricRecord,
+    namedtuple("FDMInputRecord", list(FDMInputMetric.__fields__)),
+    model=FDMInputMetric,
+):
+    """The lightweight counterpart of FDMInputMetric"""
+
+    __slots__ = ()
+
+    def to_csv_dict(self):
+        """Convert metrics to a CSV dictionary (see `FDMInputMetric.to_csv_dict`)"""
+        return dict(zip(_csv_keys(FDMInputMetric, self.flight_path), self[1:]))
+
+
+class FDMFlightRecord(
+    _MetricRecord,
+    namedtuple("FDMFlightRecord", list(FDMFlightMetric.__fields__)),
+    model=FDMFlightMetric,
+):
+    """The lightweight counterpart of FDMFlightMetric"""
+
+    __slots__ = ()
+
+    def to_csv_dict(self):
+        """Convert metrics to a CSV dictionary (see `FDMFlightMetric.to_csv_dict`)"""
+        return dict(zip(self._aliases, self))
+
+
+class FDMFlightPathRecord(
+    _MetricRecord,
+    namedtuple("FDMFlightPathRecord", list(FDMFlightPathMetric.__fields__)),
+    model=FDMFlightPathMetric,
+):
+    """The lightweight counterpart of FDMFlightPathMetric"""
+
+    __slots__ = ()
+
+    def to_csv_dict(self):
+        """Convert metrics to a CSV dictionary (see `FDMFlightPathMetric.to_csv_dict`)"""
+        return dict(zip(_csv_keys(FDMFlightPathMetric, self.flight_path), self[1:]))
@@ -0,0 +1,461 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from symbench_athens_client.cache import write_atomic
+from symbench_athens_client.utils import get_logger
+
+__all__ = [
+    "PER3_FIELDS",
+    "PER3_DTYPE",
+    "PropellerTables",
+    "convert_propeller_tables",
+    "estimate_static_hover",
+    "parse_per3",
+]
+
+PER3_FIELDS = ("RPM", "V", "J", "Pe", "Ct", "Cp", "PWR", "Torque", "Thrust")
+
+PER3_DTYPE = np.dtype([(field, "<f8") for field in PER3_FIELDS])
+
+INDEX_SUFFIX = ".index.json"
+
+LBF_TO_N = 4.4482216152605
+
+IN_LBF_TO_NM = 0.1129848290276167
+
+GRAVITY = 9.80665
+
+logger = get_logger(__name__)
+
+
+def parse_per3(path):
+    """Parse a PER3 propeller performance file into a structured array.
+
+    A PER3 file is a fixed-width table (V, J, Pe, Ct, Cp, PWR, Torque, Thrust, in
+    mph, -, -, -, -, Hp, In-Lbf and Lbf) for every `PROP RPM =` block. Some files have
+    the SI units of PWR, Torque and Thrust in additional columns, which are ignored.
+
+    Parameters
+    ----------
+    path: str, pathlib.Path
+        The path of the PER3 file
+
+    Returns
+    -------
+    numpy.ndarray
+        A row (with dtype PER3_DTYPE) for every (RPM, advance ratio), in file order
+    """
+    rows = []
+    rpm = None
+    with open(path) as per3_file:
+        for line in per3_file:
+            tokens = line.split()
+            if len(tokens) < 8:
+                if tokens[:2] == ["PROP", "RPM"]:
+                    rpm = float(tokens[-1])
+                continue
+            try:
+                values = [float(token) for token in tokens[:8]]
+            except ValueError:  # The column names and units
+                continue
+            if rpm is None:
+                raise ValueError(f"{path} has performance data before any PROP RPM")
+            rows.append((rpm, *values))
+
+    return np.array(rows, dtype=PER3_DTYPE)
+
+
+def _bracket(keys, values, span, starts, ends, groups, x):
+    """The rows around x in the sorted values of every group [starts, ends).
+
+    keys are group * span + (values - min(values)), sorted, hence the rows of every
+    (group, x) are found by a single searchsorted call.
+    """
+    start, end = starts[groups], ends[groups]
+    # An empty group (e.g. an empty PER3 file) is clipped to a valid row, but never valid
+    first = np.minimum(start, len(values) - 1)
+    last = np.clip(end - 1, first, len(values) - 1)
+
+    search = groups * span + (x - values.min())
+    low = np.searchsorted(keys, search, side="right") - 1
+    low = np.clip(low, first, np.maximum(last - 1, first))
+    high = np.minimum(low + 1, last)
+
+    width = values[high] - values[low]
+    weight = np.divide(x - values[low], width, out=np.zeros(x.shape), where=width > 0)
+    valid = (end > start) & (x >= values[first]) & (x <= values[last])
+    return low, high, np.clip(weight, 0.0, 1.0), valid
+
+
+def convert_propeller_tables(propellers_dir, output_path, pattern="PER3_*.dat"):
+    """Parse the PER3 files of a directory into a single binary table.
+
+    The rows of every file are stored contiguously in the `.npy` file at output_path,
+    and a JSON index (at output_path with the `.index.json` suffix) maps every filename
+    to its [start, stop) rows. Load them with `PropellerTables`.
+
+    Parameters
+    ----------
+    propellers_dir: str, pathlib.Path
+        The directory of the PER3 files (e.g. the propellers data of the FDM)
+    output_path: str, pathlib.Path
+        The path of the `.npy` file
+    pattern: str, default="PER3_*.dat"
+        The glob pattern of the PER3 files in propellers_dir
+
+    Returns
+    -------
+    PropellerTables
+        The converted tables
+    """
+    output_path = Path(output_path).with_suffix(".npy")
+    tables, index, start = [], {}, 0
+    for path in sorted(Path(propellers_dir).glob(pattern)):
+        table = parse_per3(path)
+        tables.append(table)
+        index[path.name] = [start, start + len(table)]
+        start += len(table)
+
+    if not tables:
+        raise FileNotFoundError(f"No {pattern} files in {propellers_dir}")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # The files are replaced once written, for the processes reading them meanwhile
+    write_atomic(output_path, lambda fp: np.save(fp, np.concatenate(tables)))
+    write_atomic(
+        output_path.with_suffix(INDEX_SUFFIX),
+        json.dumps(index, indent=2).encode("utf-8"),
+    )
+
+    logger.info(
+        f"Converted {len(index)} propeller tables ({start} rows) to {output_path}"
+    )
+    return PropellerTables(output_path)
+
+
+class PropellerTables:
+    """The propeller performance tables converted by `convert_propeller_tables`.
+
+    The table is memory-mapped, the rows of a propeller are a read-only view into it
+    (no parsing or copying), e.g. `tables["PER3_11x10.dat"]["Thrust"]`.
+
+    Parameters
+    ----------
+    path: str, pathlib.Path
+        The path of the `.npy` file (its index is next to it)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).with_suffix(".npy").resolve()
+        self.table = np.load(self.path, mmap_mode="r")
+        with self.path.with_suffix(INDEX_SUFFIX).open() as index_file:
+            self.index = {
+                name: slice(start, stop)
+                for name, (start, stop) in json.load(index_file).items()
+            }
+        self._positions = {name: position for position, name in enumerate(self.index)}
+        self._grid = None
+
+    def get(self, propeller):
+        """The rows of a propeller, in the order of the PER3 file (RPM blocks of advance ratios)
+
+        Parameters
+        ----------
+        propeller: str, Propeller
+            The PER3 filename or a Propeller component (its performance_file)
+
+        Returns
+        -------
+        numpy.ndarray
+            The read-only structured array (dtype PER3_DTYPE) of the propeller
+        """
+        name = getattr(propeller, "performance_file", propeller)
+        try:
+            return self.table[self.index[name]]
+        except KeyError:
+            raise KeyError(f"{name} is not in the propeller tables {self.path}")
+
+    def rpms(self, propeller):
+        """The RPMs of the tables of a propeller"""
+        return np.unique(self.get(propeller)["RPM"])
+
+    def interpolate(
+        self, propellers, rpm, advance_ratio=0.0, fields=("Thrust", "PWR", "Torque")
+    ):
+        """Interpolate the performance of propellers, bilinearly in RPM and advance ratio.
+
+        propellers, rpm and advance_ratio are broadcast together, so that many propellers
+        are interpolated at once (e.g. n propellers and rpm of shape (m, 1) give (m, n)
+        values).
+        The values outside the RPMs of a propeller, or outside the advance ratios of its
+        RPM tables, are NaN.
+
+        Parameters
+        ----------
+        propellers: str, Propeller or sequence of them
+            The PER3 filenames or Propeller components (their performance_file)
+        rpm: float, array_like
+            The RPMs
+        advance_ratio: float, array_like, default=0.0
+            The advance ratios (J), 0 is static thrust
+        fields: tuple of str, default=("Thrust", "PWR", "Torque")
+            The fields to interpolate, in the units of the PER3 files (Lbf, Hp, In-Lbf)
+
+        Returns
+        -------
+        dict
+            The interpolated array of every field
+        """
+        return self._interpolate(
+            self._positions_of(propellers), rpm, advance_ratio, fields
+        )
+
+    def _positions_of(self, propellers):
+        if isinstance(propellers, str) or hasattr(propellers, "performance_file"):
+            return self._position_of(propellers)
+        return np.array([self._position_of(p) for p in propellers], dtype=np.intp)
+
+    def _position_of(self, propeller):
+        name = getattr(propeller, "performance_file", propeller)
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"{name} is not in the propeller tables {self.path}")
+
+    def _interpolate(self, positions, rpm, advance_ratio, fields):
+        positions, rpm, advance_ratio = np.broadcast_arrays(
+            positions, np.asarray(rpm, dtype=float), np.asarray(advance_ratio, float)
+        )
+        grid = self._get_grid()
+
+        low_block, high_block, rpm_weight, valid = _bracket(
+            grid["block_keys"],
+            grid["block_rpms"],
+            grid["rpm_span"],
+            grid["propeller_starts"],
+            grid["propeller_ends"],
+            positions,
+            rpm,
+        )
+        rows = []
+        # A block is only needed (and valid) if its weight isn't 0
+        for block, unused in ((low_block, 1.0), (high_block, 0.0)):
+            *block_rows, block_valid = _bracket(
+                grid["row_keys"],
+                grid["j"],
+                grid["j_span"],
+                grid["block_starts"],
+                grid["block_ends"],
+                block,
+                advance_ratio,
+            )
+            rows.append(block_rows)
+            valid &= block_valid | (rpm_weight == unused)
+
+        values = {}
+        for field in fields:
+            column = grid["columns"][field]
+            low, high = (
+                column[low_row] * (1 - j_weight) + column[high_row] * j_weight
+                for low_row, high_row, j_weight in rows
+            )
+            values[field] = np.where(
+                valid, low * (1 - rpm_weight) + high * rpm_weight, np.nan
+            )
+        return values
+
+    def _get_grid(self):
+        """The rows sorted by (propeller, RPM, advance ratio), with search keys.
+
+        The rows of an RPM table (block) are searched by (block, advance ratio) and the
+        blocks of a propeller by (propeller, RPM), with single searchsorted calls.
+        """
+        if self._grid is not None:
+            return self._grid
+
+        propeller_ids = np.empty(len(self.table), dtype=np.intp)
+        for position, rows in enumerate(self.index.values()):
+            propeller_ids[rows] = position
+        rpm, j = np.asarray(self.table["RPM"]), np.asarray(self.table["J"])
+        order = np.lexsort((j, rpm, propeller_ids))
+        # The converted tables are sorted already, then the columns aren't copied
+        in_order = bool(np.all(order[1:] > order[:-1]))
+        if not in_order:
+            propeller_ids, rpm, j = propeller_ids[order], rpm[order], j[order]
+
+        new_block = np.r_[True, (np.diff(propeller_ids) != 0) | (np.diff(rpm) != 0)]
+        block_starts = np.flatnonzero(new_block)
+        block_ids = np.cumsum(new_block) - 1
+        block_propellers = propeller_ids[block_starts]
+        block_rpms = rpm[block_starts]
+        propeller_starts, propeller_ends = (
+            np.searchsorted(block_propellers, np.arange(len(self.index)), side=side)
+            for side in ("left", "right")
+        )
+
+        j_span = j.max() - j.min() + 1.0
+        rpm_span = block_rpms.max() - block_rpms.min() + 1.0
+        self._grid = {
+            "j": j,
+            "j_span": j_span,
+            "row_keys": block_ids * j_span + (j - j.min()),
+            "block_starts": block_starts,
+            "block_ends": np.r_[block_starts[1:], len(j)],
+            "block_rpms": block_rpms,
+            "rpm_span": rpm_span,
+            "block_keys": block_propellers * rpm_span + (block_rpms - block_rpms.min()),
+            "propeller_starts": propeller_starts,
+            "propeller_ends": propeller_ends,
+            "columns": {
+                field: self.table[field] if in_order else self.table[field][order]
+                for field in PER3_FIELDS
+            },
+        }
+        return self._grid
+
+    def __getitem__(self, propeller):
+        return self.get(propeller)
+
+    def __contains__(self, propeller):
+        return getattr(propeller, "performance_file", propeller) in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.path}, Propellers: {len(self)}>"
+
+
+def _component_values(components, *attributes):
+    if isinstance(components, (list, tuple)):
+        return [
+            np.array([float(getattr(component, attribute)) for component in components])
+            for attribute in attributes
+        ]
+    return [np.array(float(getattr(components, attribute))) for attribute in attributes]
+
+
+def estimate_static_hover(
+    tables, propellers, motors, batteries, mass, num_propellers=4, num_rpms=128
+):
+    """Estimate if combinations of propellers, motors and batteries can hover a mass.
+
+    This is a static (J=0) estimate, to discard the combinations which can't lift a
+    design before running the FDM. For every combination, the RPMs up to the no-load
+    RPM of the motor (KV times the battery voltage) are scanned, and an RPM is
+    reachable if the current (propeller torque / KT plus the idle current), the voltage
+    (back EMF plus the resistive drop) and the electrical power are within the limits
+    of the motor, the battery voltage and the continuous current of the battery (shared
+    by num_propellers motors).
+
+    propellers, motors, batteries and mass are broadcast together, as components or
+    sequences of components for many combinations.
+
+    Parameters
+    ----------
+    tables: PropellerTables
+        The propeller performance tables
+    propellers: Propeller or sequence of Propeller
+        The propellers
+    motors: Motor or sequence of Motor
+        The motors
+    batteries: Battery or sequence of Battery
+        The batteries
+    mass: float, array_like
+        The mass of the designs, in kg
+    num_propellers: int, default=4
+        The number of propeller/motor pairs of the designs
+    num_rpms: int, default=128
+        The number of RPMs to scan
+
+    Returns
+    -------
+    dict
+        For every combination, the maximum thrust (N) of all the propellers, the lowest
+        scanned hover RPM and its total current (A), NaN if it can't hover, and
+        whether it can hover
+
+    Examples
+    --------
+    >>> tables = PropellerTables("propellers.npy")
+    >>> motors = Motors.where(kv=(1000, 3000))
+    >>> hover = estimate_static_hover(
+    ...     tables, Propellers.apc_propellers_6x4E, motors, battery, mass=0.8
+    ... )
+    >>> candidates = [motor for motor, ok in zip(motors, hover["can_hover"]) if ok]
+    """
+    kv, kt, max_current, idle_current, max_power, resistance = _component_values(
+        motors,
+        "kv",
+        "kt",
+        "max_current",
+        "io_idle_current_at_10V",
+        "max_power",
+        "internal_resistance",
+    )
+    voltage, capacity, discharge_rate = _component_values(
+        batteries, "voltage", "capacity", "cont_discharge_rate"
+    )
+    (
+        positions,
+        kv,
+        kt,
+        max_current,
+        idle_current,
+        max_power,
+        resistance,
+        voltage,
+        battery_current,
+        weight,
+    ) = np.broadcast_arrays(
+        tables._positions_of(propellers),
+        kv,
+        kt,
+        max_current,
+        idle_current,
+        max_power,
+        resistance,
+        voltage,
+        capacity / 1000.0 * discharge_rate,
+        np.asarray(mass, dtype=float) * GRAVITY,
+    )
+
+    column = (..., np.newaxis)
+    rpm = np.linspace(0.0, 1.0, num_rpms + 1)[1:] * (kv * voltage)[column]
+    performance = tables._interpolate(
+        positions[column], rpm, 0.0, fields=("Thrust", "Torque")
+    )
+    thrust = performance["Thrust"] * LBF_TO_N
+    current = performance["Torque"] * IN_LBF_TO_NM / kt[column] + idle_current[column]
+    # The internal resistance of the motors is in milliohms
+    required_voltage = rpm / kv[column] + current * resistance[column] / 1000.0
+
+    # NaN (beyond the RPMs of the propeller) is never reachable
+    reachable = (
+        (current <= max_current[column])
+        & (current * required_voltage <= max_power[column])
+        & (required_voltage <= voltage[column])
+        & (current * num_propellers <= battery_current[column])
+    )
+    total_thrust = np.where(reachable, thrust * num_propellers, 0.0)
+    hovers = reachable & (total_thrust >= weight[column])
+    hover_index = np.argmax(hovers, axis=-1)[column]
+    can_hover = hovers.any(axis=-1)
+
+    return {
+        "max_thrust": total_thrust.max(axis=-1),
+        "hover_rpm": np.where(
+            can_hover, np.take_along_axis(rpm, hover_index, -1)[..., 0], np.nan
+        ),
+        "hover_current": np.where(
+            can_hover,
+            np.take_along_axis(current, hover_index, -1)[..., 0] * num_propellers,
+            np.nan,
+        ),
+        "can_hover": can_hover,
+    }
@@ -0,0 +1,341 @@
+import sqlite3
+import threading
+import time
+import weakref
+from numbers import Real
+from pathlib import Path
+
+from symbench_athens_client.utils import get_logger
+
+__all__ = ["ResultsIndex"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    guid TEXT PRIMARY KEY,
+    design TEXT,
+    session_id TEXT,
+    created REAL,
+    analysis_error INTEGER,
+    total_score REAL,
+    artifacts TEXT
+);
+CREATE TABLE IF NOT EXISTS run_values (
+    guid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS run_values_by_value ON run_values (kind, name, value);
+CREATE INDEX IF NOT EXISTS run_values_by_text ON run_values (kind, name, text);
+CREATE INDEX IF NOT EXISTS run_values_by_guid ON run_values (guid);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (total_score);
+CREATE INDEX IF NOT EXISTS runs_by_session ON runs (session_id, design);
+"""
+
+RUN_COLUMNS = (
+    "guid",
+    "design",
+    "session_id",
+    "created",
+    "analysis_error",
+    "total_score",
+    "artifacts",
+)
+
+VALUE_KINDS = {
+    "parameters": "parameter",
+    "requirements": "requirement",
+    "metrics": "metric",
+    "components": "component",
+}
+
+
+def _value_columns(value):
+    """The (value, text) columns of a run value"""
+    if isinstance(value, Real):
+        return float(value), None
+    return None, (str(value) if value is not None else None)
+
+
+def _commit_pending(connection, pending, lock):
+    with lock:
+        if not pending:
+            return
+        # A run added twice in a batch is replaced by the latest one
+        batch_size = len(pending)
+        runs, values = zip(*{run[0]: (run, values) for run, values in pending}.values())
+        with connection:
+            guids = [(run[0],) for run in runs]
+            connection.executemany("DELETE FROM run_values WHERE guid = ?", guids)
+            connection.executemany(
+                f"INSERT OR REPLACE INTO runs VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+                runs,
+            )
+            connection.executemany(
+                "INSERT INTO run_values VALUES (?, ?, ?, ?, ?)",
+                (row for run_values in values for row in run_values),
+            )
+        # A failed transaction is rolled back, its runs are kept for the next commit
+        del pending[:batch_size]
+
+
+def _close(connection, pending, lock):
+    try:
+        _commit_pending(connection, pending, lock)
+    finally:
+        connection.close()
+
+
+class ResultsIndex:
+    """A queryable SQLite index of experiment runs, across sessions.
+
+    Every run is a row in the runs table (its design, session, total score and the
+    location of its artifacts), while its parameters, requirements, metrics and
+    components are (kind, name, value) rows in the run_values table, indexed by value.
+    Hence, finding the runs with some design variables or scores in a range doesn't
+    scan the results of every session.
+
+    The runs are buffered and written in a single transaction every batch_size runs,
+    on `commit` and before every query.
+
+    Parameters
+    ----------
+    db_path: str, pathlib.Path
+        The path of the SQLite database (created if missing)
+    batch_size: int, default=64
+        The number of runs to buffer before writing them
+
+    Examples
+    --------
+    >>> index = ResultsIndex("results/index.db")
+    >>> runs = index.find_runs(
+    ...     parameters={"arm_length": (300, 400)},
+    ...     metrics={"TotalPathScore": (1000, None)},
+    ... )
+    """
+
+    def __init__(self, db_path, batch_size=64):
+        self.db_path = Path(db_path).resolve()
+        self.batch_size = batch_size
+        self.logger = get_logger(self.__class__.__name__)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+        self._pending = []
+        self._lock = threading.RLock()
+        # The buffered runs are written when this index is garbage collected or at the exit
+        self._finalizer = weakref.finalize(
+            self, _close, self._connection, self._pending, self._lock
+        )
+
+    def add_run(
+        self,
+        guid,
+        design=None,
+        session_id=None,
+        parameters=None,
+        requirements=None,
+        metrics=None,
+        components=None,
+        artifacts=None,
+    ):
+        """Add (or replace) a run in the index.
+
+        Parameters
+        ----------
+        guid: str
+            The GUID of the run
+        design: str, default=None
+            The name of the design class
+        session_id: str, default=None
+            The experiment session of the run
+        parameters: dict, default=None
+            The design variables of the run
+        requirements: dict, default=None
+            The requirements of the run
+        metrics: dict, default=None
+            The metrics of the run (AnalysisError and TotalPathScore are also run columns)
+        components: dict, default=None
+            The library components used by the design (instance name to component name)
+        artifacts: str, pathlib.Path, default=None
+            The location of the artifacts of the run
+        """
+        metrics = metrics or {}
+        analysis_error = metrics.get("AnalysisError")
+        run = (
+            guid,
+            design,
+            session_id,
+            time.time(),
+            int(analysis_error) if analysis_error is not None else None,
+            metrics.get("TotalPathScore"),
+            str(artifacts) if artifacts is not None else None,
+        )
+
+        values = []
+        for kind, kind_values in zip(
+            VALUE_KINDS.values(), (parameters, requirements, metrics, components)
+        ):
+            for name, value in (kind_values or {}).items():
+                values.append((guid, kind, name, *_value_columns(value)))
+
+        with self._lock:
+            self._pending.append((run, values))
+            if len(self._pending) >= self.batch_size:
+                self.commit()
+
+    def commit(self):
+        """Write the buffered runs in a single transaction"""
+        _commit_pending(self._connection, self._pending, self._lock)
+
+    def find_runs(
+        self,
+        design=None,
+        session_id=None,
+        parameters=None,
+        requirements=None,
+        metrics=None,
+        components=None,
+        analysis_error=None,
+        order_by_score=False,
+        limit=None,
+    ):
+        """Find the runs matching all the conditions.
+
+        The conditions on parameters, requirements, metrics and components are dictionaries
+        from a name to a value, or to a (low, high) range for numbers, where either bound
+        can be None (inclusive).
+
+        Parameters
+        ----------
+        design: str, default=None
+            The name of the design class
+        session_id: str, default=None
+            The experiment session of the runs
+        parameters: dict, default=None
+            The conditions on the design variables
+        requirements: dict, default=None
+            The conditions on the requirements
+        metrics: dict, default=None
+            The conditions on the metrics
+        components: dict, default=None
+            The conditions on the library components
+        analysis_error: bool, default=None
+            If provided, only the runs which failed (or didn't)
+        order_by_score: bool, default=False
+            If true, order the runs by their total score, highest first
+        limit: int, default=None
+            The maximum number of runs to return
+
+        Returns
+        -------
+        list of dict
+            The guid, design, session_id, created, analysis_error, total_score and
+            artifacts of every matching run
+        """
+        clauses, args = [], []
+        for column, value in (
+            ("design", design),
+            ("session_id", session_id),
+            ("analysis_error", analysis_error),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(int(value) if column == "analysis_error" else value)
+
+        for kind, conditions in zip(
+            VALUE_KINDS.values(), (parameters, requirements, metrics, components)
+        ):
+            for name, condition in (conditions or {}).items():
+                value_clause, value_args = self._value_clause(condition)
+                clauses.append(
+                    "guid IN (SELECT guid FROM run_values "
+                    f"WHERE kind = ? AND name = ? AND {value_clause})"
+                )
+                args.extend((kind, name, *value_args))
+
+        query = "SELECT * FROM runs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if order_by_score:
+            query += " ORDER BY total_score DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+
+        self.commit()
+        with self._lock:
+            rows = self._connection.execute(query, args).fetchall()
+        return [self._run_dict(row) for row in rows]
+
+    def get_run(self, guid):
+        """Get a run, with its parameters, requirements, metrics and components (None if missing)"""
+        self.commit()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM runs WHERE guid = ?", (guid,)
+            ).fetchone()
+            if row is None:
+                return None
+            values = self._connection.execute(
+                "SELECT kind, name, value, text FROM run_values WHERE guid = ? ORDER BY rowid",
+                (guid,),
+            ).fetchall()
+
+        run = self._run_dict(row)
+        kinds = {kind: plural for plural, kind in VALUE_KINDS.items()}
+        for plural in VALUE_KINDS:
+            run[plural] = {}
+        for kind, name, value, text in values:
+            run[kinds[kind]][name] = value if value is not None else text
+
+        return run
+
+    def close(self):
+        """Write the buffered runs and close the database"""
+        self._finalizer()
+
+    @staticmethod
+    def _value_clause(condition):
+        if isinstance(condition, (tuple, list)):
+            low, high = condition
+            clauses, args = [], []
+            if low is not None:
+                clauses.append("value >= ?")
+                args.append(low)
+            if high is not None:
+                clauses.append("value <= ?")
+                args.append(high)
+            return " AND ".join(clauses) or "value IS NOT NULL", args
+
+        value, text = _value_columns(condition)
+        if value is not None:
+            return "value = ?", [value]
+        return "text = ?", [text]
+
+    @staticmethod
+    def _run_dict(row):
+        run = dict(zip(RUN_COLUMNS, row))
+        if run["analysis_error"] is not None:
+            run["analysis_error"] = bool(run["analysis_error"])
+        return run
+
+    def __len__(self):
+        self.commit()
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.db_path}>"
@@ -0,0 +1,290 @@
+import os
+import threading
+import weakref
+from numbers import Real
+from pathlib import Path
+
+from symbench_athens_client.utils import get_logger
+
+__all__ = [
+    "ColumnarResultsStore",
+    "infer_results_schema",
+    "read_results",
+    "results_schema",
+]
+
+RESULTS_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "The columnar results store requires pyarrow, install it with `pip install pyarrow`"
+        ) from e
+    return pyarrow
+
+
+def _format_of(path, results_format=None):
+    results_format = results_format or Path(path).suffix.lstrip(".")
+    if results_format not in RESULTS_FORMATS:
+        raise ValueError(
+            f"Unknown results format {results_format}, "
+            f"expecting one of {list(RESULTS_FORMATS)}"
+        )
+    return results_format
+
+
+def infer_results_schema(rows):
+    """Infer the arrow schema for the metrics of experiment runs.
+
+    The columns are in the order of their first appearance in rows. The numeric metrics
+    are float64 (the same metric can be an int or a float in different runs), booleans
+    are bool and the rest are strings.
+
+    Parameters
+    ----------
+    rows: list of dict
+        The metrics of experiment runs
+
+    Returns
+    -------
+    pyarrow.Schema
+        The schema for the rows
+    """
+    pa = _import_pyarrow()
+    kinds = {}
+    for row in rows:
+        for key, value in row.items():
+            kind = _value_kind(value)
+            if _KIND_RANKS[kind] > _KIND_RANKS[kinds.setdefault(key, kind)]:
+                kinds[key] = kind
+
+    arrow_types = {None: pa.float64(), bool: pa.bool_(), float: pa.float64()}
+    return pa.schema(
+        [(key, arrow_types.get(kind, pa.string())) for key, kind in kinds.items()]
+    )
+
+
+# A column with values of different kinds takes the highest ranked one
+_KIND_RANKS = {None: 0, bool: 1, float: 2, str: 3}
+
+
+def _value_kind(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return bool
+    return float if isinstance(value, Real) else str
+
+
+def results_schema(column_types):
+    """The arrow schema for columns of python types.
+
+    Parameters
+    ----------
+    column_types: dict
+        The type (bool, float or str) of every column, in order
+
+    Returns
+    -------
+    pyarrow.Schema
+        The schema for the columns (all of them nullable)
+    """
+    pa = _import_pyarrow()
+    arrow_types = {bool: pa.bool_(), float: pa.float64(), int: pa.float64()}
+    return pa.schema(
+        [
+            (name, arrow_types.get(column_type, pa.string()))
+            for name, column_type in column_types.items()
+        ]
+    )
+
+
+class _ResultsWriter:
+    """The buffered rows and the writer of a results file.
+
+    This is shared by a ColumnarResultsStore and its finalizer, which writes the
+    buffered rows and completes the file if the store isn't closed.
+    """
+
+    def __init__(self, path, results_format, schema, logger):
+        self.path = path
+        self.results_format = results_format
+        self.schema = schema
+        self.logger = logger
+        self.rows = []
+        self.num_rows = 0
+        self.lock = threading.Lock()
+        self.writer = None
+
+    def validate(self, rows):
+        if self.schema is None:
+            return
+
+        names = set(self.schema.names)
+        for row in rows:
+            unknown_columns = row.keys() - names
+            if unknown_columns:
+                raise ValueError(
+                    f"The columns {sorted(unknown_columns)} are not in the schema of {self.path}"
+                )
+
+    def write_row_group(self):
+        if not self.rows:
+            return
+
+        pa = _import_pyarrow()
+        schema = self.schema or infer_results_schema(self.rows)
+        self.validate(self.rows)
+        columns = {name: [row.get(name) for row in self.rows] for name in schema.names}
+        table = pa.Table.from_pydict(columns, schema=schema)
+        self.schema = schema
+        self._get_writer().write_table(table)
+
+        self.num_rows += len(self.rows)
+        self.logger.debug(f"Wrote {len(self.rows)} rows to {self.path}")
+        self.rows = []
+
+    def close(self):
+        with self.lock:
+            try:
+                self.write_row_group()
+                if self.writer is None and self.schema is not None:
+                    self._get_writer()
+            finally:
+                if self.writer is not None:
+                    self.writer.close()
+
+    def _get_writer(self):
+        if self.writer is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            if self.results_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self.writer = pq.ParquetWriter(str(self.path), self.schema)
+            else:
+                pa = _import_pyarrow()
+                self.writer = pa.ipc.new_file(str(self.path), self.schema)
+
+        return self.writer
+
+
+class ColumnarResultsStore:
+    """A columnar (Parquet or Arrow IPC) file for the metrics of experiment runs.
+
+    The metrics are buffered and written in row groups of row_group_size rows, with a fixed
+    schema. Unless provided, the schema is inferred from the first row group and a later run
+    with a column outside of it is an error, rather than a silently misaligned table. Reading
+    the results back (see `read_results`) is a memory mapped read.
+
+    The file is complete once the store is closed (on `close`, at the exit of a with block or
+    when the store is garbage collected or at the interpreter exit, with the buffered rows).
+
+    Parameters
+    ----------
+    path: str, pathlib.Path
+        The path of the results file, it shouldn't exist
+    results_format: str, default=None
+        Either "parquet" or "arrow" (If None, from the suffix of path)
+    schema: pyarrow.Schema, default=None
+        The schema of the results (If None, inferred from the first row group)
+    row_group_size: int, default=1024
+        The number of rows to buffer before writing a row group
+
+    Notes
+    -----
+    This requires pyarrow, which is an optional dependency of this package.
+    """
+
+    def __init__(self, path, results_format=None, schema=None, row_group_size=1024):
+        self.path = Path(path).resolve()
+        self.results_format = _format_of(self.path, results_format)
+        if self.path.exists():
+            raise FileExistsError(f"The results file {self.path} already exists")
+
+        self.row_group_size = row_group_size
+        self.logger = get_logger(self.__class__.__name__)
+        self._writer = _ResultsWriter(
+            self.path, self.results_format, schema, self.logger
+        )
+        # The buffered rows are written when this store is garbage collected or at the exit
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    @property
+    def schema(self):
+        """The schema of the results (None until the first row group, unless provided)"""
+        return self._writer.schema
+
+    @property
+    def num_rows(self):
+        """The number of rows written to the results file"""
+        return self._writer.num_rows
+
+    def append(self, metrics):
+        """Append the metrics of a run (or a list thereof) to the results.
+
+        Rows with a column outside the schema are rejected before any of them is buffered.
+        """
+        rows = [metrics] if isinstance(metrics, dict) else list(metrics)
+        with self._writer.lock:
+            self._check_open()
+            self._writer.validate(rows)
+            self._writer.rows.extend(rows)
+            if len(self._writer.rows) >= self.row_group_size:
+                self._writer.write_row_group()
+
+    def flush(self):
+        """Write the buffered rows as a row group"""
+        with self._writer.lock:
+            self._check_open()
+            self._writer.write_row_group()
+
+    def close(self):
+        """Write the buffered rows and complete the results file"""
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError(f"The results store for {self.path} is closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.path}, Rows: {self.num_rows}>"
+
+
+def read_results(path, columns=None, results_format=None):
+    """Read the results written by a ColumnarResultsStore, memory mapping the file.
+
+    Parameters
+    ----------
+    path: str, pathlib.Path
+        The path of the results file
+    columns: list of str, default=None
+        The columns to read (If None, all of them)
+    results_format: str, default=None
+        Either "parquet" or "arrow" (If None, from the suffix of path)
+
+    Returns
+    -------
+    pyarrow.Table
+        The results table
+    """
+    pa = _import_pyarrow()
+    if _format_of(path, results_format) == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(str(path), columns=columns, memory_map=True)
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.select(columns) if columns is not None else table
@@ -0,0 +1,28 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+CACHE_DIR_VARIABLE = "SYMBENCH_ATHENS_CLIENT_CACHE_DIR"
+
+
+def pytest_configure(config):
+    # The test modules look up components when they are imported, before any fixture
+    config._symbench_cache_dir = tempfile.mkdtemp(prefix="symbench_cache_")
+    config._symbench_old_cache_dir = os.environ.get(CACHE_DIR_VARIABLE)
+    os.environ[CACHE_DIR_VARIABLE] = config._symbench_cache_dir
+
+
+def pytest_unconfigure(config):
+    if config._symbench_old_cache_dir is None:
+        os.environ.pop(CACHE_DIR_VARIABLE, None)
+    else:
+        os.environ[CACHE_DIR_VARIABLE] = config._symbench_old_cache_dir
+    shutil.rmtree(config._symbench_cache_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the persistent caches of the tests out of the home directory"""
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path / "cache"))
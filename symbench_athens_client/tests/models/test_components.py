@@ -6,7 +6,9 @@ import pytest
 from symbench_athens_client.models.components import (
     Autopilots,
     Batteries,
+    Battery,
     CFPs,
+    ComponentsBuilder,
     ESCs,
     Flanges,
     GPSes,
@@ -20,6 +22,7 @@ from symbench_athens_client.models.components import (
     Servos,
     Tubes,
     Wings,
+    get_all_components_of_class,
 )
 from symbench_athens_client.utils import get_data_file_path
 
@@ -141,3 +144,117 @@ class TestComponents:
 
     def test_repr(self):
         assert repr(Batteries["TurnigyGraphene1600mAh4S75C"])
+
+    def test_lazy_components(self):
+        loads = []
+
+        def load_batteries():
+            loads.append(True)
+            return get_all_components_of_class(Battery)
+
+        batteries = ComponentsBuilder(Battery, load_batteries)
+        assert loads == []
+        assert batteries.TurnigyGraphene1600mAh4S75C.voltage == 14.8
+        assert len(batteries._components) == 1
+        assert len(batteries) == 34
+        assert [battery.name for battery in batteries] == Batteries.all
+        assert batteries[0] == Batteries[0]
+        assert loads == [True]
+
+    def test_parametric_tubes(self):
+        from symbench_athens_client.models.components import all_comps
+
+        assert Tubes["0281OD_para_tube"].length > 0
+        # The fix for the tube's length doesn't modify the components' data
+        assert "LENGTH" in all_comps["0281OD_para_tube"]
+
+    def test_cached_components(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SYMBENCH_ATHENS_CLIENT_CACHE_DIR", str(tmp_path))
+        loads = []
+
+        def load_batteries():
+            loads.append(True)
+            return get_all_components_of_class(Battery)
+
+        batteries = ComponentsBuilder(Battery, load_batteries, cache_name="Battery")
+        assert len(batteries) == 34
+        assert batteries.TurnigyGraphene1600mAh4S75C.name in batteries.all
+        # The components are parsed lazily until all of them are needed
+        assert len(batteries._components) == 1
+        assert not list(tmp_path.glob("components/*/Battery.pkl"))
+        assert len(list(batteries)) == 34
+        assert len(list(tmp_path.glob("components/*/Battery.pkl"))) == 1
+
+        cached = ComponentsBuilder(Battery, load_batteries, cache_name="Battery")
+        assert cached.all == batteries.all
+        battery = cached.TurnigyGraphene1600mAh4S75C
+        assert battery == batteries.TurnigyGraphene1600mAh4S75C
+        assert loads == [True]
+
+    def test_find_by(self):
+        performance_file = Propellers.apc_propellers_6x4E.performance_file
+        propellers = Propellers.find_by("performance_file", performance_file)
+        assert Propellers.apc_propellers_6x4E in propellers
+        assert propellers == [
+            propeller
+            for propeller in Propellers
+            if propeller.performance_file == performance_file
+        ]
+        assert Propellers.find_by("performance_file", "missing.dat") == []
+        assert Batteries[3] is list(Batteries)[3]
+
+    def test_sorted_by_and_in_range(self):
+        motors = Motors.sorted_by("kv")
+        kvs = [motor.kv for motor in motors]
+        assert kvs == sorted(kvs)
+        assert Motors.sorted_by("kv", reverse=True) == motors[::-1]
+
+        in_range = Motors.in_range("kv", 300, 500)
+        assert in_range == [motor for motor in motors if 300 <= motor.kv <= 500]
+        assert Batteries.in_range("voltage", low=22.2) == [
+            battery
+            for battery in Batteries.sorted_by("voltage")
+            if battery.voltage >= 22.2
+        ]
+
+    def test_where(self):
+        motors = Motors.where(kv=(300, 500), max_power__gt=800)
+        assert motors
+        assert motors == [
+            motor
+            for motor in Motors
+            if 300 <= motor.kv <= 500 and motor.max_power > 800
+        ]
+
+        propellers = Propellers.where(diameter=(200, None), direction__ne=1)
+        assert propellers == [
+            propeller
+            for propeller in Propellers
+            if propeller.diameter >= 200 and propeller.direction != 1
+        ]
+
+        assert Batteries.where(chemistry_type="LiPo", voltage__le=7.4) == [
+            battery
+            for battery in Batteries
+            if battery.chemistry_type == "LiPo" and battery.voltage <= 7.4
+        ]
+        assert Motors.column("kv").dtype.kind == "f"
+        assert len(Motors.where()) == len(Motors)
+
+    def test_counter_rotating_propellers(self):
+        prop_neg = Propellers.apc_propellers_6x4EP
+        prop_pos = Propellers.apc_propellers_6x4E
+        assert Propellers.counter_rotating(prop_neg) == prop_pos
+        assert Propellers.counter_rotating("apc_propellers_6x4E") == prop_neg
+        assert Propellers.counter_rotating("apc_propellers_17x10N") is None
+
+        assert Propellers.with_counter_rotating == {
+            propeller.name
+            for propeller in Propellers
+            if any(
+                other.performance_file == propeller.performance_file
+                and other.direction == -propeller.direction
+                for other in Propellers
+            )
+        }
+        assert "apc_propellers_17x10N" not in Propellers.with_counter_rotating
@@ -1,4 +1,5 @@
 import pytest
+import sympy
 from pydantic import ValidationError
 
 from symbench_athens_client.models.components import (
@@ -35,6 +36,25 @@ class TestDesigns:
     def h_copter(self):
         return HCopter()
 
+    @pytest.fixture(scope="session")
+    def qd_copter_formulae(self):
+        arm, support, battery_weight = sympy.symbols(
+            "Length_0 Length_1 Battery_0_Weight"
+        )
+        formulae = {
+            f"aircraft.{key}": 0.0
+            for key in ["x_cm", "y_cm", "z_cm", "Ixy", "Ixz", "Iyz"]
+        }
+        formulae["aircraft.mass"] = battery_weight + 0.001 * (arm + support)
+        formulae["aircraft.Ixx"] = battery_weight * arm ** 2
+        formulae["aircraft.Iyy"] = battery_weight * arm ** 2
+        formulae["aircraft.Izz"] = 2 * battery_weight * arm ** 2
+        for i, (x, y) in enumerate([(1, 1), (-1, 1), (-1, -1), (1, -1)]):
+            formulae[f"Prop_{i}_x"] = x * (arm + support)
+            formulae[f"Prop_{i}_y"] = y * (arm + support)
+            formulae[f"Prop_{i}_z"] = -support
+        return formulae
+
     def test_quadcopter_jenkins_params(self, qd_copter):
         params = qd_copter.to_jenkins_parameters()
         assert (
@@ -126,3 +146,43 @@ class TestDesigns:
     def test_hplane_wings(self, h_plane):
         assert h_plane.left_wing == Wings["left_NACA_0006"]
         assert h_plane.right_wing == Wings["right_NACA_0006"]
+
+    def test_quadcopter_fd_inputs(self, qd_copter_formulae, tmp_path, monkeypatch):
+        design = QuadCopter(arm_length=250.0)
+        vertical_speeds = {1: 0, 3: 0, 4: -2.0, 5: 0}
+        lateral_speeds = {1: 10, 3: 10, 4: 0, 5: 10}
+
+        expected = {}
+        for flight_path in vertical_speeds:
+            filename = tmp_path / f"expected_{flight_path}.inp"
+            design.to_fd_input(
+                qd_copter_formulae,
+                propellers_data_path="../propellers/",
+                filename=filename,
+                flight_path=flight_path,
+                requested_vertical_speed=vertical_speeds[flight_path],
+                requested_lateral_speed=lateral_speeds[flight_path],
+            )
+            expected[flight_path] = filename.read_text()
+
+        mass_properties_calls = []
+        get_mass_properties = QuadCopter._get_mass_properties
+
+        def _get_mass_properties(self, formulae):
+            mass_properties_calls.append(formulae)
+            return get_mass_properties(self, formulae)
+
+        monkeypatch.setattr(QuadCopter, "_get_mass_properties", _get_mass_properties)
+        filenames = {path: tmp_path / f"Path_{path}.inp" for path in vertical_speeds}
+        design.to_fd_inputs(
+            qd_copter_formulae,
+            propellers_data_path="../propellers/",
+            filenames=filenames,
+            requested_vertical_speed=vertical_speeds,
+            requested_lateral_speed=lateral_speeds,
+        )
+
+        assert len(mass_properties_calls) == 1
+        for flight_path, filename in filenames.items():
+            assert filename.read_text() == expected[flight_path]
+            assert f"control%i_flight_path = {flight_path}" in expected[flight_path]
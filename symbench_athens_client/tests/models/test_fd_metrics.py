@@ -1,4 +1,12 @@
-from symbench_athens_client.models.fd_metrics import FDMFlightMetric
+from symbench_athens_client.models.fd_metrics import (
+    FDMFlightMetric,
+    FDMFlightPathMetric,
+    FDMFlightPathRecord,
+    FDMFlightRecord,
+    FDMInputMetric,
+    FDMInputRecord,
+    parse_fd_metrics,
+)
 from symbench_athens_client.tests.utils import get_test_file_path
 
 
@@ -8,3 +16,66 @@ class TestFDMetrics:
         fdm_flight_metric = FDMFlightMetric.from_fd_metrics(non_existent_file_loc)
         fdm_flight_metric_dict = fdm_flight_metric.dict()
         assert all(val == 0.0 for val in fdm_flight_metric_dict.values())
+
+    def test_path_csv_keys(self):
+        input_metric = FDMInputMetric.from_fd_input(
+            get_test_file_path("FlightDyn_Path1.inp")
+        )
+        path_metric = FDMFlightPathMetric.from_fd_metrics(
+            get_test_file_path("metrics.out")
+        )
+        input_keys = set(FDMInputMetric.path_csv_keys(1))
+        assert input_keys == set(input_metric.to_csv_dict()) - {
+            "Ixx",
+            "iyy",
+            "Izz",
+            "MassEstimate",
+            "Interferences",
+        }
+        assert FDMFlightPathMetric.path_csv_keys(1) == list(path_metric.to_csv_dict())
+
+    def test_parse_fd_metrics(self):
+        metrics_file = get_test_file_path("metrics.out")
+        flight_metric, path_metric = parse_fd_metrics(metrics_file)
+        assert flight_metric == FDMFlightMetric.from_fd_metrics(metrics_file)
+        assert path_metric == FDMFlightPathMetric.from_fd_metrics(metrics_file)
+        assert flight_metric.max_hover_time == 351.0
+        assert path_metric.flight_path == 1
+        assert path_metric.path_score == 391.0
+
+        flat_metrics = parse_fd_metrics(metrics_file, flat=True)
+        expected = flight_metric.to_csv_dict()
+        expected.update(path_metric.to_csv_dict())
+        assert flat_metrics == expected
+        assert list(flat_metrics) == list(expected)
+
+    def test_parse_fd_metrics_no_trim_state(self):
+        flight_metric, path_metric = parse_fd_metrics(
+            get_test_file_path("no_trim_state_metrics.out")
+        )
+        assert all(value == 0.0 for value in flight_metric.dict().values())
+        assert path_metric.flight_path == 1
+        assert path_metric.maximum_error_distance_during_flight == 200.0
+
+    def test_metric_records(self):
+        with open(get_test_file_path("FlightDyn_Path1.inp")) as fd_input_file:
+            fd_input = fd_input_file.read()
+        metrics_file = get_test_file_path("metrics.out")
+
+        input_metric = FDMInputMetric.from_fd_input_text(fd_input)
+        input_record = FDMInputMetric.from_fd_input_text(fd_input, validate=False)
+        assert isinstance(input_record, FDMInputRecord)
+        assert input_record.flight_path == 1
+        assert input_record.to_csv_dict() == input_metric.to_csv_dict()
+        assert list(input_record.to_csv_dict()) == list(input_metric.to_csv_dict())
+        assert input_record.to_model() == input_metric
+
+        flight_record, path_record = parse_fd_metrics(metrics_file, validate=False)
+        flight_metric, path_metric = parse_fd_metrics(metrics_file)
+        assert isinstance(flight_record, FDMFlightRecord)
+        assert isinstance(path_record, FDMFlightPathRecord)
+        assert flight_record.to_csv_dict() == flight_metric.to_csv_dict()
+        assert path_record.to_csv_dict() == path_metric.to_csv_dict()
+        assert list(path_record.to_csv_dict()) == list(path_metric.to_csv_dict())
+        assert path_record.dict(by_alias=True) == path_metric.dict(by_alias=True)
+        assert flight_record.to_model() == flight_metric
@@ -0,0 +1,79 @@
+import pytest
+
+from symbench_athens_client.artifact_archive import ArtifactArchive
+
+
+def make_run_dir(path, guid):
+    run_dir = path / guid
+    run_dir.mkdir(parents=True)
+    for flight_path in (1, 3, 4, 5):
+        (run_dir / f"FlightDyn_Path{flight_path}.inp").write_text(
+            f"{guid} input {flight_path}\n" * 50
+        )
+        (run_dir / f"metrics_Path{flight_path}.out").write_text(f"{guid} metrics")
+    return run_dir
+
+
+class TestArtifactArchive:
+    def test_add_and_read(self, tmp_path):
+        with ArtifactArchive(tmp_path / "archive", flush_every=2) as archive:
+            run_dirs = [
+                make_run_dir(tmp_path / "runs", f"run-{index}") for index in range(3)
+            ]
+            for index, run_dir in enumerate(run_dirs):
+                archive.add_run(f"run-{index}", run_dir)
+            # The directories are removed once their shard is complete
+            assert [run_dir.exists() for run_dir in run_dirs] == [False, False, True]
+
+            assert len(archive) == 3
+            assert "run-2" in archive
+            assert len(archive.names("run-1")) == 8
+            assert archive.read("run-2", "metrics_Path4.out") == b"run-2 metrics"
+
+            extracted = archive.extract("run-0", tmp_path / "extracted")
+            assert (extracted / "FlightDyn_Path1.inp").read_text().startswith("run-0")
+
+            with pytest.raises(ValueError):
+                archive.add_run("run-0", make_run_dir(tmp_path / "again", "run-0"))
+            with pytest.raises(KeyError):
+                archive.get("missing")
+
+        reopened = ArtifactArchive(tmp_path / "archive")
+        assert set(reopened.get("run-1")) == set(archive.names("run-1"))
+        reopened.close()
+
+    def test_rolling_shards(self, tmp_path):
+        with ArtifactArchive(tmp_path / "archive", shard_size=1) as archive:
+            shards = [
+                archive.add_run(f"run-{index}", make_run_dir(tmp_path, f"run-{index}"))
+                for index in range(3)
+            ]
+            assert [shard.name for shard in shards] == [
+                "artifacts-00000.zip",
+                "artifacts-00001.zip",
+                "artifacts-00002.zip",
+            ]
+            assert archive.shard_of("run-1") == shards[1]
+            assert archive.read("run-1", "metrics_Path1.out") == b"run-1 metrics"
+
+    def test_recovery(self, tmp_path):
+        archive = ArtifactArchive(tmp_path / "archive", flush_every=2)
+        for index in range(3):
+            archive.add_run(f"run-{index}", make_run_dir(tmp_path, f"run-{index}"))
+        # A crash before indexing the runs of the first shard (and while writing the second)
+        (tmp_path / "archive" / ArtifactArchive.INDEX_FILE).write_text("run-0 artif")
+        archive._finalizer.detach()
+
+        recovered = ArtifactArchive(tmp_path / "archive")
+        assert len(recovered) == 2
+        assert recovered.read("run-1", "metrics_Path1.out") == b"run-1 metrics"
+        assert (tmp_path / "run-2").exists()
+
+        assert (
+            recovered.add_run("run-2", tmp_path / "run-2").name == "artifacts-00002.zip"
+        )
+        del recovered
+        assert not (tmp_path / "run-2").exists()
+        reopened = ArtifactArchive(tmp_path / "archive")
+        assert len(reopened) == 3 and "run-2" in reopened
+        assert (tmp_path / "archive" / "artifacts-00001.zip.incomplete").exists()
@@ -0,0 +1,39 @@
+import hashlib
+
+import pytest
+
+from symbench_athens_client.cache import (
+    file_hash,
+    get_cache_file,
+    read_cache_file,
+    write_atomic,
+    write_cache_file,
+)
+
+
+class TestCache:
+    def test_cache_files(self, monkeypatch):
+        cache_file = get_cache_file("formulae", "entry.pkl")
+        assert read_cache_file(cache_file) is None
+        write_cache_file(cache_file, b"cached")
+        assert read_cache_file(cache_file) == b"cached"
+        assert file_hash(cache_file) == hashlib.sha256(b"cached").hexdigest()
+
+        monkeypatch.setenv("SYMBENCH_ATHENS_CLIENT_CACHE_DIR", "")
+        assert get_cache_file("formulae", "entry.pkl") is None
+        write_cache_file(None, b"ignored")
+        assert read_cache_file(None) is None
+
+    def test_write_atomic(self, tmp_path):
+        path = tmp_path / "table.bin"
+        write_atomic(path, lambda binary_file: binary_file.write(b"table"))
+        assert path.read_bytes() == b"table"
+
+        def _fail(binary_file):
+            binary_file.write(b"partial")
+            raise ValueError("Failed to write")
+
+        with pytest.raises(ValueError):
+            write_atomic(path, _fail)
+        assert path.read_bytes() == b"table"
+        assert [child.name for child in tmp_path.iterdir()] == ["table.bin"]
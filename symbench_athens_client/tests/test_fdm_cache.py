@@ -0,0 +1,97 @@
+import shutil
+
+import pytest
+
+from symbench_athens_client.fdm_cache import FDMResultsCache
+from symbench_athens_client.fdm_executor import FDMExecutor
+from symbench_athens_client.models.fd_metrics import FDMInputRecord
+from symbench_athens_client.tests.utils import get_test_file_path, make_fake_fdm
+
+
+class TestFDMResultsCache:
+    @pytest.fixture(scope="function")
+    def run_dir(self, tmp_path):
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+        shutil.copy(get_test_file_path("FlightDyn_Path1.inp"), run_dir)
+        return run_dir
+
+    @pytest.fixture(scope="function")
+    def fdm_path(self, tmp_path):
+        return make_fake_fdm(tmp_path)
+
+    def test_executor_cache_hit(self, tmp_path, run_dir, fdm_path):
+        cache = FDMResultsCache(tmp_path / "cache")
+        executor = FDMExecutor(fdm_path=fdm_path, cache=cache)
+        input_file = run_dir / "FlightDyn_Path1.inp"
+        output_file = run_dir / "FlightDynReport_Path1.out"
+
+        first = executor.execute(input_file, output_file, run_dir=run_dir)
+        assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+
+        output_file.unlink()
+        (run_dir / "metrics.out").unlink()
+
+        second = executor.execute(input_file, output_file, run_dir=run_dir)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first == second
+        assert output_file.exists()
+        assert (run_dir / "metrics.out").exists()
+
+        # A new process sees the same entries
+        assert len(FDMResultsCache(tmp_path / "cache")) == 1
+
+    def test_executor_cache_hit_records(self, tmp_path, run_dir, fdm_path):
+        cache = FDMResultsCache(tmp_path / "cache")
+        input_file = run_dir / "FlightDyn_Path1.inp"
+        output_file = run_dir / "FlightDynReport_Path1.out"
+
+        validated = FDMExecutor(fdm_path=fdm_path).execute(
+            input_file, output_file, run_dir=run_dir
+        )
+        executor = FDMExecutor(fdm_path=fdm_path, cache=cache, validate=False)
+        first = executor.execute(input_file, output_file, run_dir=run_dir)
+        second = executor.execute(input_file, output_file, run_dir=run_dir)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert isinstance(second[0], FDMInputRecord)
+        assert first == second
+        assert [record.to_model() for record in second] == list(validated)
+
+    def test_key_uses_propeller_contents(self, tmp_path, run_dir, fdm_path):
+        cache = FDMResultsCache(tmp_path / "cache")
+        input_file = run_dir / "FlightDyn_Path1.inp"
+        key = cache.key_for(input_file, fdm_path, run_dir=run_dir)
+        assert key == cache.key_for(input_file, fdm_path, run_dir=run_dir)
+
+        propellers_dir = tmp_path / "propellers"
+        propellers_dir.mkdir()
+        (propellers_dir / "PER3_6x4E.dat").write_text("PROP RPM = 1000")
+        key_with_propeller = cache.key_for(input_file, fdm_path, run_dir=run_dir)
+        assert key_with_propeller != key
+
+        (propellers_dir / "PER3_6x4E.dat").write_text("PROP RPM = 2000")
+        assert cache.key_for(input_file, fdm_path, run_dir=run_dir) not in {
+            key,
+            key_with_propeller,
+        }
+
+    def test_lru_eviction(self, tmp_path, run_dir, fdm_path):
+        executor = FDMExecutor(fdm_path=fdm_path)
+        results = executor.execute(
+            run_dir / "FlightDyn_Path1.inp",
+            run_dir / "FlightDynReport_Path1.out",
+            run_dir=run_dir,
+        )
+        cache = FDMResultsCache(tmp_path / "cache")
+        for key in ("aa", "bb", "cc"):
+            cache.put(key, *results, "output", "metrics")
+        entry_size = cache.size // 3
+
+        cache.get("aa")
+        cache.max_size = 3 * entry_size
+        cache.put("dd", *results, "output", "metrics")
+
+        assert len(cache) == 3
+        assert cache.get("bb") is None
+        assert cache.get("aa") is not None
+        assert cache.size <= cache.max_size
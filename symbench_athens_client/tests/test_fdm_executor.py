@@ -0,0 +1,214 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from symbench_athens_client.exceptions import FDMFailedException
+from symbench_athens_client.fdm_executor import (
+    AsyncFDMExecutor,
+    FDMExecutor,
+    absolute_propeller_paths,
+    isolated_run_dir,
+    run_flight_paths,
+    skipped_path_metrics,
+    update_total_score,
+)
+from symbench_athens_client.tests.utils import get_test_file_path, make_fake_fdm
+
+
+class TestFDMExecutor:
+    @pytest.fixture(scope="function")
+    def executor(self, tmp_path):
+        with FDMExecutor(fdm_path=make_fake_fdm(tmp_path), max_workers=4) as executor:
+            yield executor
+
+    def test_execute_in_run_dir(self, executor, tmp_path):
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+        input_metrics, flight_metrics, path_metrics = executor.execute(
+            get_test_file_path("FlightDyn_Path1.inp"),
+            run_dir / "FlightDynReport_Path1.out",
+            run_dir=run_dir,
+        )
+        assert input_metrics.flight_path == 1
+        assert flight_metrics.max_hover_time == 351.0
+        assert path_metrics.path_score == 391.0
+        assert (run_dir / "metrics.out").exists()
+        assert not Path("metrics.out").exists()
+
+    def test_execute_input(self, executor, tmp_path):
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+        fd_input = Path(get_test_file_path("FlightDyn_Path1.inp")).read_text()
+        input_metrics, flight_metrics, path_metrics = executor.execute_input(
+            fd_input,
+            run_dir=run_dir,
+            input_file=tmp_path / "FlightDyn_Path1.inp",
+            output_file=tmp_path / "FlightDynReport_Path1.out",
+        )
+        assert input_metrics.flight_path == 1
+        assert path_metrics.path_score == 391.0
+        assert sorted(os.listdir(run_dir)) == [
+            "metrics.out",
+            "namelist.out",
+            "path.out",
+            "path2.out",
+            "score.out",
+        ]
+
+        executor.flush()
+        assert (tmp_path / "FlightDyn_Path1.inp").read_text() == fd_input
+        assert (tmp_path / "FlightDynReport_Path1.out").exists()
+
+    def test_execute_missing_fdm(self, tmp_path):
+        executor = FDMExecutor(fdm_path=tmp_path / "missing_fdm")
+        with pytest.raises(FDMFailedException):
+            executor.execute_input("", run_dir=tmp_path)
+
+    def test_submit(self, executor, tmp_path):
+        output_file = tmp_path / "FlightDynReport_Path1.out"
+        future = executor.submit(get_test_file_path("FlightDyn_Path1.inp"), output_file)
+        _, _, path_metrics = future.result()
+        assert path_metrics.flight_path == 1
+        assert output_file.exists()
+
+    def test_absolute_propeller_paths(self, tmp_path):
+        (tmp_path / "propellers").mkdir()
+        (tmp_path / "propellers" / "PER3_6x4E.dat").touch()
+        fd_input = Path(get_test_file_path("FlightDyn_Path1.inp")).read_text()
+
+        # ../propellers only exists from the second directory
+        absolute_input = absolute_propeller_paths(
+            fd_input, tmp_path / "inputs", tmp_path / "cwd"
+        )
+        prop_fname = f"'{tmp_path / 'propellers' / 'PER3_6x4E.dat'}'"
+        assert absolute_input.count(prop_fname) == 4
+        assert absolute_propeller_paths(absolute_input, tmp_path) == absolute_input
+
+    def test_map(self, executor):
+        results = list(executor.map([get_test_file_path("FlightDyn_Path1.inp")] * 8))
+        assert len(results) == 8
+        assert all(result[2].path_score == 391.0 for result in results)
+
+    def test_async_map(self, tmp_path):
+        executor = AsyncFDMExecutor(fdm_path=make_fake_fdm(tmp_path), max_concurrency=2)
+        input_files = [get_test_file_path("FlightDyn_Path1.inp")] * 6
+        output_files = [tmp_path / f"FlightDynReport_{i}.out" for i in range(6)]
+
+        results = asyncio.run(executor.map(input_files, output_files))
+        assert len(results) == 6
+        assert all(result[2].path_score == 391.0 for result in results)
+        assert all(output_file.exists() for output_file in output_files)
+
+    def test_async_scratch_dir_propeller_paths(self, tmp_path):
+        (tmp_path / "propellers").mkdir()
+        (tmp_path / "propellers" / "PER3_6x4E.dat").touch()
+        (tmp_path / "inputs").mkdir()
+        input_file = tmp_path / "inputs" / "FlightDyn_Path1.inp"
+        input_file.write_text(
+            Path(get_test_file_path("FlightDyn_Path1.inp")).read_text()
+        )
+        recording_fdm = tmp_path / "recording_fdm"
+        recording_fdm.write_text(
+            f"#!/bin/sh\ncat > {tmp_path / 'stdin.inp'}\n"
+            f"exec {make_fake_fdm(tmp_path)} < {tmp_path / 'stdin.inp'}\n"
+        )
+        recording_fdm.chmod(0o755)
+
+        executor = AsyncFDMExecutor(fdm_path=recording_fdm)
+        _, _, path_metrics = asyncio.run(executor.execute(input_file))
+        assert path_metrics.path_score == 391.0
+        prop_fname = f"'{tmp_path / 'propellers' / 'PER3_6x4E.dat'}'"
+        assert (tmp_path / "stdin.inp").read_text().count(prop_fname) == 4
+
+    def test_async_timeout_and_cancel(self, tmp_path):
+        slow_fdm = tmp_path / "slow_fdm"
+        slow_fdm.write_text("#!/bin/sh\necho $$ > pid\nexec sleep 30\n")
+        slow_fdm.chmod(0o755)
+        executor = AsyncFDMExecutor(fdm_path=slow_fdm)
+
+        with pytest.raises(FDMFailedException):
+            asyncio.run(executor.execute_input("", run_dir=tmp_path, timeout=0.5))
+        self._assert_killed(tmp_path / "pid")
+
+        async def cancel_run():
+            run = asyncio.ensure_future(executor.execute_input("", run_dir=tmp_path))
+            while not (tmp_path / "pid").exists():
+                await asyncio.sleep(0.05)
+            run.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run
+
+        (tmp_path / "pid").unlink()
+        start = time.monotonic()
+        asyncio.run(cancel_run())
+        assert time.monotonic() - start < 10
+        self._assert_killed(tmp_path / "pid")
+
+    @staticmethod
+    def _assert_killed(pid_file):
+        pid = int(pid_file.read_text())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_isolated_run_dir(self, tmp_path):
+        with isolated_run_dir(parent=tmp_path) as run_dir:
+            assert run_dir.parent == tmp_path
+            (run_dir / "metrics.out").touch()
+        assert not run_dir.exists()
+        assert os.listdir(tmp_path) == []
+
+    def test_run_flight_paths_concurrent(self, tmp_path):
+        run_dirs = {}
+
+        def run_path(flight_path, run_dir):
+            run_dirs[flight_path] = run_dir
+            return {
+                f"Path_score_Path{flight_path}": float(flight_path),
+                "Shared": flight_path,
+            }
+
+        metrics = run_flight_paths(run_path, run_dirs_parent=tmp_path, concurrent=True)
+        assert list(metrics) == [
+            "Path_score_Path1",
+            "Shared",
+            "Path_score_Path3",
+            "Path_score_Path4",
+            "Path_score_Path5",
+        ]
+        assert metrics["Shared"] == 5
+        assert len(set(run_dirs.values())) == 4
+        assert all(run_dir.parent == tmp_path for run_dir in run_dirs.values())
+
+    def test_run_flight_paths_concurrent_needs_run_dirs(self):
+        with pytest.raises(ValueError):
+            run_flight_paths(lambda flight_path, run_dir: {}, concurrent=True)
+
+    def test_run_flight_paths_early_exit(self):
+        ran = []
+
+        def run_path(flight_path, run_dir):
+            ran.append(flight_path)
+            return {f"Path_score_Path{flight_path}": 0.0}
+
+        metrics = run_flight_paths(run_path, early_exit=True)
+        assert ran == [4]
+        assert metrics["SkippedPaths"] == "1,3,5"
+        assert metrics["Path_score_Path1"] is None
+        assert set(skipped_path_metrics(5)).issubset(metrics)
+        update_total_score(metrics)
+        assert metrics["TotalPathScore"] == 0.0
+
+    def test_run_flight_paths_early_exit_hover(self):
+        ran = []
+
+        def run_path(flight_path, run_dir):
+            ran.append(flight_path)
+            return {f"Path_score_Path{flight_path}": 10.0}
+
+        metrics = run_flight_paths(run_path, early_exit=True)
+        assert ran == [4, 1, 3, 5]
+        assert metrics["SkippedPaths"] == ""
+        assert list(metrics)[:4] == [f"Path_score_Path{i}" for i in (1, 3, 4, 5)]
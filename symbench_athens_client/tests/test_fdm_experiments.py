@@ -72,6 +72,78 @@ class TestFDMExperiments:
 
         assert results["TotalPathScore"] == 1582
 
+    def test_on_quadcopter_5_isolated(self):
+        expr = get_experiments_by_name("ExperimentOnQuadCopter_5")
+        expr.start_new_session()
+        current_dir = os.getcwd()
+
+        results = expr.run_for(
+            parameters={
+                "arm_length": 324,
+                "support_length": 2.11,
+                "batt_mount_z_offset": 43.6842105263158,
+                "r": 360.0,
+            },
+            requirements={
+                "requested_vertical_speed": -2,
+                "requested_lateral_speed": 50,
+            },
+            isolated=True,
+        )
+
+        assert results["TotalPathScore"] == 1582
+        assert os.getcwd() == current_dir
+        assert not Path("metrics.out").exists()
+
+    def test_on_quadcopter_5_concurrent_paths(self):
+        expr = get_experiments_by_name("ExperimentOnQuadCopter_5")
+        expr.start_new_session()
+
+        results = expr.run_for(
+            parameters={
+                "arm_length": 324,
+                "support_length": 2.11,
+                "batt_mount_z_offset": 43.6842105263158,
+                "r": 360.0,
+            },
+            requirements={
+                "requested_vertical_speed": -2,
+                "requested_lateral_speed": 50,
+            },
+            concurrent_paths=True,
+        )
+
+        assert results["TotalPathScore"] == 1582
+
+    def test_on_quadcopter_5_run_for_many(self):
+        expr = get_experiments_by_name("ExperimentOnQuadCopter_5")
+        expr.start_new_session()
+        parameters = {
+            "arm_length": 324,
+            "support_length": 2.11,
+            "batt_mount_z_offset": 43.6842105263158,
+            "r": 360.0,
+        }
+        completed = []
+
+        results = list(
+            expr.run_for_many(
+                [parameters] * 4,
+                requirements={
+                    "requested_vertical_speed": -2,
+                    "requested_lateral_speed": 50,
+                },
+                workers=2,
+                callback=completed.append,
+            )
+        )
+
+        assert len(results) == len(completed) == 4
+        assert all(result["TotalPathScore"] == 1582 for result in results)
+        assert expr.design.arm_length != 324
+        with (expr.results_dir / "output.csv").open() as output_csv:
+            assert len(output_csv.readlines()) == 5
+
     def test_on_quadcopter_5_light(self):
         expr = get_experiments_by_name("ExperimentOnQuadCopter_5Light")
         expr.start_new_session()
@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+
+from symbench_athens_client.fdm_input import (
+    FDMInputTemplate,
+    render_fd_input,
+    write_fd_input,
+)
+
+EXPECTED_FD_INPUT = """&aircraft_data
+   aircraft%cname     = 'UAV_Test' ! M name of the aircraft
+   aircraft%uc_initial     = 0.4d0, 0.5d0
+   aircraft%mass     = 1.5
+   aircraft%uc_initial     = 0.5d0, 0.5d0
+
+
+!   Propeller(1) uses components named Prop_0, Motor_0, ESC_0
+   propeller(1)%prop_fname   = '../propellers/PER3_6x4E.dat'
+   propeller(1)%x   = 10.0
+
+
+!   Propeller(2) uses components named Prop_1, Motor_1, ESC_1
+   propeller(2)%prop_fname   = '../propellers/PER3_6x4EP.dat'
+   propeller(2)%x   = -10.0
+
+
+!\t Battery(1) is component named: Battery_0
+   battery(1)%voltage    = 7.4
+
+
+!\t Controls
+   control%i_flight_path = 4
+   control%requested_vertical_speed = -2.0
+/
+
+"""
+
+
+class TestFDMInput:
+    @pytest.fixture
+    def fd_params(self):
+        return {
+            "aircraft": {
+                "cname": "'UAV_Test' ! M name of the aircraft",
+                "uc_initial": ["0.4d0, 0.5d0", "0.5d0, 0.5d0"],
+                "mass": 1.5,
+            },
+            "propellers": [
+                {
+                    "prop_fname": "'../propellers/PER3_6x4E.dat'",
+                    "for": 0,
+                    "x": 10.0,
+                },
+                {
+                    "prop_fname": "'../propellers/PER3_6x4EP.dat'",
+                    "x": -10.0,
+                    "for": 1,
+                },
+            ],
+            "battery": {"voltage": 7.4},
+            "controls": {"i_flight_path": 4, "requested_vertical_speed": -2.0},
+        }
+
+    def test_render_fd_input(self, fd_params):
+        assert render_fd_input(fd_params) == EXPECTED_FD_INPUT
+        # The parameters are left intact, so they can be rendered again
+        assert fd_params["propellers"][0]["for"] == 0
+        assert render_fd_input(fd_params) == EXPECTED_FD_INPUT
+
+    def test_template_per_structure(self, fd_params):
+        template = FDMInputTemplate.for_params(fd_params)
+        fd_params["aircraft"]["mass"] = 2.0
+        assert FDMInputTemplate.for_params(fd_params) is template
+        assert "aircraft%mass     = 2.0\n" in template.render(fd_params)
+
+        fd_params["controls"]["iflap"] = 6
+        assert FDMInputTemplate.for_params(fd_params) is not template
+
+    def test_write_fd_input(self, fd_params, tmp_path):
+        write_fd_input(fd_params, tmp_path / "FlightDyn.inp")
+        assert (tmp_path / "FlightDyn.inp").read_text() == EXPECTED_FD_INPUT
+
+        buffer = io.StringIO()
+        write_fd_input(fd_params, buffer)
+        assert buffer.getvalue() == EXPECTED_FD_INPUT
+
+        fd = os.open(tmp_path / "FlightDyn_fd.inp", os.O_WRONLY | os.O_CREAT)
+        write_fd_input(fd_params, fd)
+        os.close(fd)
+        assert (tmp_path / "FlightDyn_fd.inp").read_text() == EXPECTED_FD_INPUT
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from symbench_athens_client.models.components import Batteries, Motors, Propellers
+from symbench_athens_client.propeller_tables import (
+    LBF_TO_N,
+    PER3_FIELDS,
+    PropellerTables,
+    convert_propeller_tables,
+    estimate_static_hover,
+    parse_per3,
+)
+
+PER3_HEADER = """         11x10                    (11x10.dat)                                  12/19/14
+
+         ====== PERFORMANCE DATA (versus advance ratio and MPH) ======
+
+         DEFINITIONS:
+         J=V/nD (advance ratio)
+         V  (model speed in MPH)
+"""
+
+PER3_BLOCK = """
+         PROP RPM =       {rpm}
+
+         V          J           Pe         Ct          Cp          PWR         Torque      Thrust{extra_names}
+       (mph)     (Adv Ratio)                                       (Hp)        (In-Lbf)     (Lbf)
+         0.0        0.00      0.0000      0.1154      0.0650       0.001       0.053       {thrust}{extra_values}
+         0.4        0.04      0.0693      0.1155      0.0664       0.001       0.054       0.054{extra_values}
+        12.0        1.16      0.0018      0.0000      0.0080       0.000       0.007       0.000{extra_values}
+
+"""
+
+
+def write_per3(path, rpms, si_columns=False):
+    extra = (
+        {
+            "extra_names": "      PWR   Torque   Thrust",
+            "extra_values": "   0.7  0.006  0.24",
+        }
+        if si_columns
+        else {"extra_names": "", "extra_values": ""}
+    )
+    path.write_text(
+        PER3_HEADER
+        + "".join(
+            PER3_BLOCK.format(rpm=rpm, thrust=rpm / 1000, **extra) for rpm in rpms
+        )
+    )
+    return path
+
+
+class TestPropellerTables:
+    @pytest.fixture(scope="function")
+    def tables(self, tmp_path):
+        propellers_dir = tmp_path / "propellers"
+        propellers_dir.mkdir()
+        write_per3(propellers_dir / "PER3_11x10.dat", [1000, 2000, 3000])
+        write_per3(propellers_dir / "PER3_6x4E.dat", range(1000, 6000, 1000))
+        return convert_propeller_tables(propellers_dir, tmp_path / "propellers.npy")
+
+    def test_parse_per3(self, tmp_path):
+        for si_columns in (False, True):
+            table = parse_per3(
+                write_per3(tmp_path / "PER3_11x10.dat", [1000, 2000], si_columns)
+            )
+            assert table.dtype.names == PER3_FIELDS
+            assert len(table) == 6
+            assert table["RPM"].tolist() == [1000.0] * 3 + [2000.0] * 3
+            assert table["J"][:3].tolist() == [0.0, 0.04, 1.16]
+            assert table["Thrust"][3] == 2.0
+
+    def test_convert_and_load(self, tmp_path):
+        propellers_dir = tmp_path / "propellers"
+        propellers_dir.mkdir()
+        write_per3(propellers_dir / "PER3_11x10.dat", [1000, 2000, 3000])
+        write_per3(propellers_dir / "PER3_6x4E.dat", [5000], si_columns=True)
+        (propellers_dir / "Prop_Fun.asv").write_text("not a table")
+
+        convert_propeller_tables(propellers_dir, tmp_path / "tables" / "propellers")
+        tables = PropellerTables(tmp_path / "tables" / "propellers.npy")
+        assert len(tables) == 2
+        assert "PER3_6x4E.dat" in tables
+
+        table = tables["PER3_11x10.dat"]
+        assert isinstance(tables.table, np.memmap)
+        assert np.shares_memory(table, tables.table)
+        assert not table.flags.writeable
+        assert tables.rpms("PER3_11x10.dat").tolist() == [1000.0, 2000.0, 3000.0]
+        assert tables["PER3_6x4E.dat"]["Thrust"][0] == 5.0
+
+        with pytest.raises(KeyError):
+            tables.get("PER3_missing.dat")
+        with pytest.raises(FileNotFoundError):
+            convert_propeller_tables(tmp_path / "tables", tmp_path / "empty.npy")
+
+    def test_interpolate(self, tables):
+        values = tables.interpolate("PER3_11x10.dat", [1000, 1500, 3000, 500], 0.0)
+        assert values["Thrust"][:3].tolist() == [1.0, 1.5, 3.0]
+        assert np.isnan(values["Thrust"][3])
+
+        values = tables.interpolate("PER3_11x10.dat", 1000, [0.02, 1.16, 1.2])
+        assert np.allclose(values["Thrust"][:2], [(1.0 + 0.054) / 2, 0.0])
+        assert values["Torque"][0] == pytest.approx(0.0535)
+        assert np.isnan(values["PWR"][2])
+
+        values = tables.interpolate(
+            ["PER3_11x10.dat", Propellers.apc_propellers_6x4E],
+            np.array([[2500], [5000]]),
+            fields=("Thrust",),
+        )
+        assert values["Thrust"].shape == (2, 2)
+        assert values["Thrust"][0].tolist() == [2.5, 2.5]
+        assert np.isnan(values["Thrust"][1, 0]) and values["Thrust"][1, 1] == 5.0
+
+        with pytest.raises(KeyError):
+            tables.interpolate("PER3_missing.dat", 1000)
+
+    def test_estimate_static_hover(self, tables):
+        hover = estimate_static_hover(
+            tables,
+            Propellers.apc_propellers_6x4E,
+            Motors.t_motor_AS2814KV2000,
+            Batteries.TurnigyGraphene1000mAh2S75C,
+            mass=[1.0, 10.0],
+        )
+        assert hover["can_hover"].tolist() == [True, False]
+        # The thrust of 4 propellers at the highest RPM of the table (5000)
+        assert 19 * LBF_TO_N < hover["max_thrust"][0] <= 20 * LBF_TO_N
+        # The lowest scanned RPM in the table (its thrust is more than the weight)
+        assert hover["hover_rpm"][0] == pytest.approx(14800 * 9 / 128)
+        assert hover["hover_current"][0] > 4 * 4.5
+        assert np.isnan(hover["hover_rpm"][1])
+
+        hover = estimate_static_hover(
+            tables,
+            [Propellers.apc_propellers_6x4E] * 2,
+            [Motors.t_motor_AS2814KV2000] * 2,
+            Batteries.TurnigyGraphene1000mAh2S75C,
+            mass=[1.0, 3.0],
+            num_propellers=1,
+        )
+        assert hover["can_hover"].tolist() == [True, False]
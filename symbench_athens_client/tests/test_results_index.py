@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from symbench_athens_client.results_index import ResultsIndex
+
+
+class TestResultsIndex:
+    @pytest.fixture(scope="function")
+    def index(self, tmp_path):
+        with ResultsIndex(tmp_path / "index.db", batch_size=4) as index:
+            for arm_length in range(200, 500, 50):
+                index.add_run(
+                    f"run-{arm_length}",
+                    design="QuadCopter",
+                    session_id="e-1" if arm_length < 350 else "e-2",
+                    parameters={"arm_length": arm_length, "support_length": 95.0},
+                    requirements={"requested_lateral_speed": 10},
+                    metrics={
+                        "GUID": f"run-{arm_length}",
+                        "AnalysisError": False,
+                        "TotalPathScore": float(arm_length * 2),
+                        "SkippedPaths": "",
+                    },
+                    components={"Battery_0": "TurnigyGraphene1000mAh2S75C"},
+                    artifacts=f"artifacts/run-{arm_length}",
+                )
+            yield index
+
+    def test_find_runs(self, index):
+        assert len(index) == 6
+
+        runs = index.find_runs(
+            parameters={"arm_length": (300, 400)},
+            metrics={"TotalPathScore": (700, None)},
+        )
+        assert sorted(run["guid"] for run in runs) == ["run-350", "run-400"]
+        assert runs[0]["artifacts"].startswith("artifacts/")
+        assert runs[0]["analysis_error"] is False
+
+        best = index.find_runs(session_id="e-1", order_by_score=True, limit=2)
+        assert [run["guid"] for run in best] == ["run-300", "run-250"]
+
+        assert len(index.find_runs(parameters={"arm_length": 250})) == 1
+        assert len(index.find_runs(components={"Battery_0": "Missing"})) == 0
+        assert len(index.find_runs(analysis_error=True)) == 0
+
+    def test_get_run(self, index):
+        run = index.get_run("run-200")
+        assert run["total_score"] == 400.0
+        assert run["parameters"] == {"arm_length": 200.0, "support_length": 95.0}
+        assert run["requirements"] == {"requested_lateral_speed": 10.0}
+        assert run["metrics"]["SkippedPaths"] == ""
+        assert run["components"]["Battery_0"] == "TurnigyGraphene1000mAh2S75C"
+        assert index.get_run("missing") is None
+
+    def test_replace_and_reopen(self, index, tmp_path):
+        index.add_run("run-200", metrics={"TotalPathScore": 1.0})
+        assert index.get_run("run-200")["metrics"] == {"TotalPathScore": 1.0}
+        index.add_run("run-600", parameters={"arm_length": 600})
+        index.close()
+
+        with ResultsIndex(tmp_path / "index.db") as reopened:
+            assert len(reopened) == 7
+            assert reopened.get_run("run-600")["parameters"] == {"arm_length": 600.0}
+
+    def test_failed_commit(self, index):
+        index.commit()
+        index._connection.execute(
+            "CREATE TRIGGER fail_insert BEFORE INSERT ON runs "
+            "BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+        )
+        index.add_run("run-600", parameters={"arm_length": 600})
+        with pytest.raises(sqlite3.DatabaseError):
+            index.commit()
+        assert len(index._pending) == 1
+
+        index._connection.execute("DROP TRIGGER fail_insert")
+        assert index.get_run("run-600")["parameters"] == {"arm_length": 600.0}
+        assert not index._pending
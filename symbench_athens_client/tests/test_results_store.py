@@ -0,0 +1,108 @@
+import gc
+
+import pytest
+
+from symbench_athens_client.results_store import (
+    ColumnarResultsStore,
+    infer_results_schema,
+    read_results,
+    results_schema,
+)
+
+pa = pytest.importorskip("pyarrow")
+
+
+def run_metrics(index, **extra):
+    return {
+        "GUID": f"run-{index}",
+        "AnalysisError": False,
+        "Length_0": 300 + index,
+        "Path_score_Path1": 10.5 * index,
+        **extra,
+    }
+
+
+class TestColumnarResultsStore:
+    def test_infer_results_schema(self):
+        schema = infer_results_schema(
+            [
+                {"GUID": "a", "AnalysisError": True},
+                run_metrics(1, SkippedPaths=""),
+                run_metrics(2, Path_score_Path1=None),
+            ]
+        )
+        assert schema.names == [
+            "GUID",
+            "AnalysisError",
+            "Length_0",
+            "Path_score_Path1",
+            "SkippedPaths",
+        ]
+        assert schema.field("AnalysisError").type == pa.bool_()
+        assert schema.field("Length_0").type == pa.float64()
+        assert schema.field("SkippedPaths").type == pa.string()
+
+    @pytest.mark.parametrize("results_format", ["parquet", "arrow"])
+    def test_row_groups(self, tmp_path, results_format):
+        path = tmp_path / f"output.{results_format}"
+        with ColumnarResultsStore(path, row_group_size=4) as store:
+            for index in range(10):
+                store.append(run_metrics(index))
+            assert store.num_rows == 8
+            store.append({"GUID": "failed", "AnalysisError": True})
+
+        assert store.closed
+        table = read_results(path)
+        assert table.num_rows == 11
+        assert table.column("GUID").to_pylist()[-1] == "failed"
+        assert table.column("Length_0").to_pylist()[:2] == [300.0, 301.0]
+        assert read_results(path, columns=["GUID"]).column_names == ["GUID"]
+
+        if results_format == "parquet":
+            import pyarrow.parquet as pq
+
+            assert pq.ParquetFile(str(path)).num_row_groups == 3
+
+    def test_fixed_schema(self, tmp_path):
+        store = ColumnarResultsStore(tmp_path / "output.parquet", row_group_size=1)
+        store.append(run_metrics(0))
+        with pytest.raises(ValueError):
+            store.append(run_metrics(1, SkippedPaths="1,3,5"))
+        store.close()
+
+        with pytest.raises(FileExistsError):
+            ColumnarResultsStore(tmp_path / "output.parquet")
+        with pytest.raises(ValueError):
+            ColumnarResultsStore(tmp_path / "output.csv")
+
+    def test_rejected_rows(self, tmp_path):
+        schema = results_schema(
+            {
+                "GUID": str,
+                "AnalysisError": bool,
+                "Length_0": float,
+                "Path_score_Path1": float,
+            }
+        )
+        path = tmp_path / "output.arrow"
+        with ColumnarResultsStore(path, schema=schema, row_group_size=4) as store:
+            store.append({"GUID": "failed", "AnalysisError": True})
+            store.append(run_metrics(0))
+            with pytest.raises(ValueError):
+                store.append([run_metrics(1), run_metrics(2, SkippedPaths="1,3,5")])
+            store.append(run_metrics(3))
+
+        table = read_results(path)
+        assert table.column("GUID").to_pylist() == ["failed", "run-0", "run-3"]
+        assert table.column("Length_0").to_pylist() == [None, 300.0, 303.0]
+
+    @pytest.mark.parametrize("results_format", ["parquet", "arrow"])
+    def test_finalizer(self, tmp_path, results_format):
+        path = tmp_path / f"output.{results_format}"
+        store = ColumnarResultsStore(path, row_group_size=4)
+        for index in range(6):
+            store.append(run_metrics(index))
+        del store
+        gc.collect()
+
+        assert read_results(path).num_rows == 6
@@ -1,12 +1,33 @@
+import numpy as np
 import pytest
+import sympy
 
+import symbench_athens_client.utils as utils
 from symbench_athens_client.exceptions import PropellerAssignmentError
 from symbench_athens_client.models.components import Propellers
 from symbench_athens_client.models.designs import QuadCopter
-from symbench_athens_client.utils import assign_propellers_quadcopter
+from symbench_athens_client.utils import (
+    assign_propellers_quadcopter,
+    estimate_mass_formulae,
+    get_mass_estimates_for_quadcopter,
+    get_mass_estimates_for_quadcopters,
+    lambdify_cached,
+    lambdify_fused,
+)
 
 
 class TestUtils:
+    @pytest.fixture(scope="session")
+    def formulae(self):
+        arm, support, battery_weight = sympy.symbols(
+            "Length_0 Length_1 Battery_0_Weight"
+        )
+        return {
+            "aircraft.mass": battery_weight + 0.001 * (arm + support),
+            "aircraft.Ixx": battery_weight * arm ** 2 + sympy.sqrt(support),
+            "aircraft.y_cm": 0.0,
+        }
+
     def test_design_assign_propellers_valid(self):
         design = QuadCopter()
         prop_neg = Propellers.apc_propellers_6x4EP
@@ -40,3 +61,96 @@ class TestUtils:
         assert (
             design.propeller_1.name == design.propeller_3.name == "apc_propellers_6x4E"
         )
+
+    def test_mass_estimates_batch(self, formulae):
+        design = QuadCopter()
+        arm_lengths = np.linspace(200.0, 400.0, 11)
+
+        estimates = get_mass_estimates_for_quadcopters(
+            formulae, design, {"arm_length": arm_lengths, "Length_1": 50.0}
+        )
+
+        assert set(estimates) == {"mass", "Ixx", "y_cm"}
+        assert all(values.shape == (11,) for values in estimates.values())
+        for i, arm_length in enumerate(arm_lengths):
+            single_design = QuadCopter(arm_length=arm_length, support_length=50.0)
+            single = get_mass_estimates_for_quadcopter(formulae, single_design)
+            for key, value in single.items():
+                assert np.isclose(estimates[key][i], value)
+
+    def test_mass_estimates_batch_invalid_variable(self, formulae):
+        with pytest.raises(KeyError):
+            get_mass_estimates_for_quadcopters(
+                formulae, QuadCopter(), {"wing_span": [1.0, 2.0]}
+            )
+
+    def test_lambdify_fused(self, formulae):
+        arm, support = sympy.symbols("Length_0 Length_1")
+        shared = sympy.sqrt(arm * support) + sympy.pi
+        fused_formulae = dict(formulae)
+        fused_formulae["aircraft.Iyy"] = shared ** 2 + arm
+        fused_formulae["aircraft.Izz"] = sympy.cos(shared) * support
+        params = ("Battery_0_Weight", "Length_0", "Length_1")
+
+        estimates = lambdify_fused(params, fused_formulae)(0.3, 220.0, 95.0)
+
+        assert list(estimates) == ["mass", "Ixx", "y_cm", "Iyy", "Izz"]
+        assert estimates["y_cm"] == 0.0
+        for key, value in fused_formulae.items():
+            expected = sympy.lambdify(params, value)(0.3, 220.0, 95.0)
+            assert np.isclose(estimates[key.replace("aircraft.", "")], expected)
+            assert np.isclose(
+                lambdify_cached(params, value)(0.3, 220.0, 95.0), expected
+            )
+
+    def test_lambdify_fused_disk_cache(self, formulae, monkeypatch):
+        params = ("Battery_0_Weight", "Length_0", "Length_1")
+        cache_dir = utils.get_cache_dir()
+        utils._lambdify_fused.cache_clear()
+        expected = lambdify_fused(params, formulae)(0.3, 220.0, 95.0)
+        assert len(list(cache_dir.glob("mass_formulae/*.py"))) == 1
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("The formulae should not be compiled again")
+
+        monkeypatch.setattr(utils, "_formulae_source", _fail)
+        utils._lambdify_fused.cache_clear()
+        assert lambdify_fused(params, formulae)(0.3, 220.0, 95.0) == expected
+
+        # The code generated for another numpy (or sympy) version isn't reused
+        monkeypatch.setattr(np, "__version__", "0.0.0")
+        utils._lambdify_fused.cache_clear()
+        with pytest.raises(AssertionError):
+            lambdify_fused(params, formulae)
+
+    def test_estimate_mass_formulae_disk_cache(self, formulae, tmp_path, monkeypatch):
+        loaded = []
+
+        class _TestbenchData:
+            def load(self, path):
+                loaded.append(path)
+
+        def estimator(tb_data):
+            return formulae
+
+        monkeypatch.setattr(utils, "TestbenchData", _TestbenchData)
+        testbench = tmp_path / "testbench.zip"
+        testbench.write_bytes(b"testbench data")
+
+        assert estimate_mass_formulae(str(testbench), estimator) == formulae
+        assert loaded == [str(testbench.resolve())]
+
+        estimate_mass_formulae.cache_clear()
+        assert estimate_mass_formulae(str(testbench), estimator) == formulae
+        assert len(loaded) == 1
+
+        testbench.write_bytes(b"updated testbench data")
+        estimate_mass_formulae.cache_clear()
+        estimate_mass_formulae(str(testbench), estimator)
+        assert len(loaded) == 2
+
+        # An edited estimator (e.g. in an editable uav_analysis checkout) is fitted again
+        monkeypatch.setattr(utils, "_source_hash", lambda function: "edited")
+        estimate_mass_formulae.cache_clear()
+        estimate_mass_formulae(str(testbench), estimator)
+        assert len(loaded) == 3
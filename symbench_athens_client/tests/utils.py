@@ -1,6 +1,43 @@
+import os
+import stat
+import sys
 from pathlib import Path
 
 
 def get_test_file_path(filename):
     """Given a filename prepend it with the correct test data location"""
     return str(Path(__file__).resolve().parent / "assets" / filename)
+
+
+FAKE_FDM_SCRIPT = """#!{python}
+import re
+import sys
+
+fd_input = sys.stdin.read()
+flight_path = re.search(r"control%i_flight_path\\s*=\\s*(\\d+)", fd_input).group(1)
+
+with open({metrics!r}) as metrics_file:
+    metrics = metrics_file.read()
+
+with open("metrics.out", "w") as metrics_file:
+    metrics_file.write(
+        metrics.replace("flight path            1", "flight path            " + flight_path)
+    )
+
+for score_file in ("path.out", "path2.out", "namelist.out", "score.out"):
+    open(score_file, "w").close()
+
+print("Flight dynamics report for flight path", flight_path)
+"""
+
+
+def make_fake_fdm(directory):
+    """Write an executable which mimics new_fdm's files, using the metrics.out asset"""
+    fdm_path = Path(directory) / "new_fdm"
+    fdm_path.write_text(
+        FAKE_FDM_SCRIPT.format(
+            python=sys.executable, metrics=get_test_file_path("metrics.out")
+        )
+    )
+    os.chmod(fdm_path, os.stat(fdm_path).st_mode | stat.S_IEXEC)
+    return str(fdm_path)
@@ -1,5 +1,8 @@
+import hashlib
+import inspect
 import logging
 import os
+import pickle
 import zipfile
 from functools import lru_cache
 from pathlib import Path
@@ -8,6 +11,13 @@ from typing import Iterable
 from uav_analysis.mass_properties import quad_copter_fixed_bemp2
 from uav_analysis.testbench_data import TestbenchData
 
+from symbench_athens_client.cache import (  # get_cache_dir is also public here
+    file_hash,
+    get_cache_dir,
+    get_cache_file,
+    read_cache_file,
+    write_cache_file,
+)
 from symbench_athens_client.exceptions import PropellerAssignmentError
 
 
@@ -56,21 +66,63 @@ def dict_to_design_vars(inp_dict, repeat_values=True):
 
 @lru_cache(maxsize=128)
 def estimate_mass_formulae(tb_data_locs, estimator=quad_copter_fixed_bemp2):
-    """Estimate mass properties of a design based on a fixed BEMP config testbench"""
+    """Estimate mass properties of a design based on a fixed BEMP config testbench
+
+    The formulae are also cached on disk (see `get_cache_dir`), keyed by the contents of
+    the testbench zip files and the estimator, so that a new process loads them instead
+    of fitting them again.
+    """
     if estimator is None:
         estimator = quad_copter_fixed_bemp2
-    tb_data_loc = list(tb_data_locs)
 
-    tb_data = TestbenchData()
-    if not isinstance(tb_data_loc, (list, set, tuple)):
-        tb_data_loc = [tb_data_loc]
+    if isinstance(tb_data_locs, (str, Path)):
+        tb_data_locs = [tb_data_locs]
 
-    tb_data_loc = [str(Path(data_loc).resolve()) for data_loc in tb_data_loc]
+    tb_data_loc = [str(Path(data_loc).resolve()) for data_loc in tb_data_locs]
+
+    cache_file = _mass_formulae_cache_file(tb_data_loc, estimator)
+    cached = read_cache_file(cache_file)
+    if cached is not None:
+        try:
+            return pickle.loads(cached)
+        except Exception:  # Stale or corrupt entry, fit the formulae again
+            pass
 
+    tb_data = TestbenchData()
     for data_path in tb_data_loc:
         tb_data.load(data_path)
 
-    return estimator(tb_data)
+    formulae = estimator(tb_data)
+    write_cache_file(cache_file, pickle.dumps(formulae))
+
+    return formulae
+
+
+def _mass_formulae_cache_file(tb_data_locs, estimator):
+    import sympy
+
+    key_hash = hashlib.sha256()
+    for tb_data_hash in sorted(file_hash(data_loc) for data_loc in tb_data_locs):
+        key_hash.update(tb_data_hash.encode("utf-8"))
+
+    estimator_id = f"{estimator.__module__}.{estimator.__qualname__}"
+    key_hash.update(f"{estimator_id}:{sympy.__version__}".encode("utf-8"))
+    # uav_analysis is usually an editable checkout, its version doesn't change with its code
+    key_hash.update(_source_hash(estimator).encode("utf-8"))
+
+    return get_cache_file("mass_formulae", f"{key_hash.hexdigest()}.pkl")
+
+
+def _source_hash(function):
+    """The hash of the module file of a function (its source, if the file is missing)"""
+    try:
+        return file_hash(inspect.getsourcefile(function))
+    except (OSError, TypeError):
+        pass
+    try:
+        return hashlib.sha256(inspect.getsource(function).encode("utf-8")).hexdigest()
+    except (OSError, TypeError):
+        return ""
 
 
 def get_mass_estimates_for_quadcopter(testbench_path_or_formulae, quad_copter):
@@ -88,6 +140,62 @@ def get_mass_estimates_for_quadcopter(testbench_path_or_formulae, quad_copter):
     dict
         The dictionary of mass properties estimates
     """
+    aircraft_parameters = _get_quadcopter_mass_parameters(quad_copter)
+    formulae = _get_formulae(testbench_path_or_formulae)
+
+    params = tuple(sorted(aircraft_parameters.keys()))
+    args = [aircraft_parameters[p] for p in params]
+
+    return lambdify_fused(params, formulae)(*args)
+
+
+def get_mass_estimates_for_quadcopters(
+    testbench_path_or_formulae, quad_copter, design_variables
+):
+    """Calculate the mass properties for a batch of quadcopter designs at once.
+
+    The formulae are evaluated once on arrays of the design variables, rather than
+    once per design. The components (battery, propellers) are the same for the whole batch.
+
+    Parameters
+    ----------
+    testbench_path_or_formulae: str, pathlib.Path, dict
+        The zip file location for the uav_analusis.testbench_data.TestBenchData or a dictionary of formulas
+    quad_copter: instance of symbench_athens_client.models.design.QuadCopter
+        The QuadCopter seed design to use the components and the design variables missing from design_variables of
+    design_variables: dict
+        The design variables (by name or alias e.g. arm_length or Length_0) to arrays of their values
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        The mass properties estimates, one array (with a value per design) for each of them
+    """
+    import numpy as np
+
+    aircraft_parameters = _get_quadcopter_mass_parameters(quad_copter)
+    for name, values in design_variables.items():
+        if name in quad_copter.__fields__:
+            name = quad_copter.__fields__[name].alias
+        if name not in aircraft_parameters:
+            raise KeyError(f"{name} is not a design variable of {quad_copter.name}")
+        aircraft_parameters[name] = np.asarray(values, dtype=float)
+
+    formulae = _get_formulae(testbench_path_or_formulae)
+
+    params = tuple(sorted(aircraft_parameters.keys()))
+    args = [aircraft_parameters[p] for p in params]
+    shape = np.broadcast(*args).shape
+
+    mass_properties = lambdify_fused(params, formulae)(*args)
+    for key, estimates in mass_properties.items():
+        estimates = np.broadcast_to(estimates, shape)
+        mass_properties[key] = estimates.astype(float)
+
+    return mass_properties
+
+
+def _get_quadcopter_mass_parameters(quad_copter):
     from symbench_athens_client.models.designs import QuadCopter
 
     assert isinstance(
@@ -111,29 +219,123 @@ def get_mass_estimates_for_quadcopter(testbench_path_or_formulae, quad_copter):
         }
     )
 
+    return aircraft_parameters
+
+
+def _get_formulae(testbench_path_or_formulae):
     if isinstance(testbench_path_or_formulae, (str, Path)):
-        formulae = estimate_mass_formulae(testbench_path_or_formulae)
+        return estimate_mass_formulae(testbench_path_or_formulae)
     else:
-        formulae = testbench_path_or_formulae
+        return testbench_path_or_formulae
 
-    params = tuple(sorted(aircraft_parameters.keys()))
-    args = [aircraft_parameters[p] for p in params]
 
-    mass_properties = {}
-    for key, value in formulae.items():
-        mass_estimates_key = key.replace("aircraft.", "")
-        try:
-            mass_properties[mass_estimates_key] = lambdify_cached(params, value)(*args)
-        except AttributeError:
-            mass_properties[mass_estimates_key] = value
+def lambdify_cached(params, expr):
+    """Compile a single formula (see `lambdify_fused`, which it shares the caches with)"""
+    fused = lambdify_fused(params, {"value": expr})
+    return lambda *args: fused(*args)["value"]
+
+
+def lambdify_fused(params, formulae):
+    """Compile all the formulae of a mass properties estimator into a single function.
+
+    The common subexpressions of the formulae (e.g. the products of the arm lengths)
+    are computed once per call, instead of once per formula. The values of the formulae
+    which are not sympy expressions (i.e. constants) are returned as is.
+
+    Parameters
+    ----------
+    params: tuple of str
+        The names of the arguments of the function
+    formulae: dict
+        The formulae (from e.g. uav_analysis.mass_properties.quad_copter_fixed_bemp2)
+
+    Returns
+    -------
+    callable
+        The function of params, which returns a dictionary of the mass properties
+        estimates keyed by the formulae names (without the "aircraft." prefix)
+    """
+    return _lambdify_fused(tuple(params), tuple(formulae.items()))
+
+
+@lru_cache(maxsize=128)
+def _lambdify_fused(params, formulae_items):
+    from sympy import Basic
+
+    keys = tuple(key.replace("aircraft.", "") for key, _ in formulae_items)
+    expressions = {
+        key: value
+        for key, (_, value) in zip(keys, formulae_items)
+        if isinstance(value, Basic)
+    }
+    constants = {
+        key: value
+        for key, (_, value) in zip(keys, formulae_items)
+        if key not in expressions
+    }
+
+    fused = _compile_formulae_source(
+        _cached_formulae_source(params, list(expressions.values()))
+    )
+    expression_keys = tuple(expressions)
+
+    def mass_properties(*args):
+        estimates = dict(zip(expression_keys, fused(*args)))
+        estimates.update(constants)
+        return {key: estimates[key] for key in keys}
 
     return mass_properties
 
 
-@lru_cache(maxsize=1024)
-def lambdify_cached(params, expr):
-    from sympy.utilities.lambdify import lambdify
-    return lambdify(params, expr)
+def _cached_formulae_source(params, expressions):
+    # Eliminating the common subexpressions is slow, share the code across processes
+    import numpy
+    import sympy
+    from sympy import srepr
+
+    # The generated code depends on the printer (sympy), numpy's names and _formulae_source
+    versions = f"{FORMULAE_SOURCE_VERSION}:{sympy.__version__}:{numpy.__version__}"
+    key_hash = hashlib.sha256(f"{versions}\n{','.join(params)}".encode("utf-8"))
+    for expression in expressions:
+        key_hash.update(f"\n{srepr(expression)}".encode("utf-8"))
+
+    cache_file = get_cache_file("mass_formulae", f"{key_hash.hexdigest()}.py")
+    source = read_cache_file(cache_file)
+    if source is not None:
+        return source.decode("utf-8")
+
+    source = _formulae_source(params, expressions)
+    write_cache_file(cache_file, source.encode("utf-8"))
+
+    return source
+
+
+# Bump when _formulae_source changes, to invalidate the cached code
+FORMULAE_SOURCE_VERSION = 1
+
+
+def _formulae_source(params, expressions, name="_mass_formulae"):
+    from sympy import cse, numbered_symbols
+    from sympy.printing.lambdarepr import NumPyPrinter
+
+    replacements, reduced = cse(expressions, symbols=numbered_symbols("_cse_"))
+    printer = NumPyPrinter()
+
+    lines = [f"def {name}({', '.join(params)}):"]
+    for symbol, expression in replacements:
+        lines.append(f"    {symbol} = {printer.doprint(expression)}")
+    returns = "".join(f"{printer.doprint(expression)}, " for expression in reduced)
+    lines.append(f"    return ({returns.rstrip()})")
+
+    return "\n".join(lines) + "\n"
+
+
+def _compile_formulae_source(source, name="_mass_formulae"):
+    import numpy
+
+    namespace = {"numpy": numpy}
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    return namespace[name]
 
 
 def extract_from_zip(zip_path, output_dir, files):
@@ -172,25 +374,14 @@ def assign_propellers_quadcopter(quad_design, propeller):
     if isinstance(propeller, str):
         propeller = Propellers[propeller]
 
-    propellers = list(
-        filter(lambda p: p.performance_file == propeller.performance_file, Propellers)
-    )
-    prop_0, prop_1, prop_2, prop_3 = (None,) * 4
+    counter_rotating = Propellers.counter_rotating(propeller)
 
     if propeller.direction == -1:
-        prop_0 = propeller
-        prop_2 = propeller
-        for prop in propellers:
-            if prop.direction == -1 * propeller.direction:
-                prop_1 = prop
-                prop_3 = prop
+        prop_0 = prop_2 = propeller
+        prop_1 = prop_3 = counter_rotating
     else:
-        prop_1 = propeller
-        prop_3 = propeller
-        for prop in propellers:
-            if prop.direction == -1 * propeller.direction:
-                prop_0 = prop
-                prop_2 = prop
+        prop_1 = prop_3 = propeller
+        prop_0 = prop_2 = counter_rotating
 
     if not all(isinstance(p, Propeller) for p in [prop_0, prop_1, prop_2, prop_3]):
         raise PropellerAssignmentError(